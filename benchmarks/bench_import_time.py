@@ -0,0 +1,92 @@
+"""
+Import-time benchmark of the SDK modules a short-lived worker loads. Each
+module is imported in a fresh interpreter and the cumulative import time
+reported by -X importtime is checked against IMPORT_BUDGET_MS. Also checks
+that none of the heavy dependencies are loaded at import.
+
+    python benchmarks/bench_import_time.py
+"""
+import ast
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')
+
+MODULES = [
+    "gmx_python_sdk.scripts.v2.gmx_utils",
+    "gmx_python_sdk.scripts.v2.keys",
+    "gmx_python_sdk.scripts.v2.get.get_markets",
+    "gmx_python_sdk.scripts.v2.get.get_open_interest"
+]
+
+# Loaded lazily by the functions that need them
+HEAVY_MODULES = ["web3", "eth_abi", "pandas", "yaml", "packaging"]
+
+IMPORT_BUDGET_MS = 300
+REPEAT = 5
+
+
+def measure_import(module: str):
+    """
+    Import a module in a fresh interpreter
+
+    Parameters
+    ----------
+    module : str
+        dotted module path.
+
+    Returns
+    -------
+    import_ms : float
+        cumulative import time of the module in milliseconds.
+    loaded_heavy_modules : list
+        heavy dependencies present in sys.modules after the import.
+
+    """
+    script = (
+        "import sys, {module}; "
+        "print([m for m in {heavy} if m in sys.modules])"
+    ).format(module=module, heavy=HEAVY_MODULES)
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    import_us = None
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            import_us = int(fields[1])
+
+    return import_us / 1000, ast.literal_eval(result.stdout)
+
+
+if __name__ == "__main__":
+    failures = []
+    for module in MODULES:
+        timings = []
+        for _ in range(REPEAT):
+            import_ms, loaded_heavy_modules = measure_import(module)
+            timings.append(import_ms)
+
+        best = min(timings)
+        print("{:<52}{:>8.1f} ms".format(module, best))
+
+        if best > IMPORT_BUDGET_MS:
+            failures.append(
+                "{} took {:.1f} ms".format(module, best)
+            )
+        if loaded_heavy_modules:
+            failures.append(
+                "{} loaded {}".format(module, loaded_heavy_modules)
+            )
+
+    assert not failures, "Import budget of {} ms exceeded:\n{}".format(
+        IMPORT_BUDGET_MS, "\n".join(failures)
+    )
+    print("All imports within {} ms".format(IMPORT_BUDGET_MS))
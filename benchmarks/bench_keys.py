@@ -0,0 +1,108 @@
+"""
+Micro-benchmark of datastore key derivation: generic create_hash against the
+memoized key functions and the fixed-layout get_market_keys bulk path.
+
+    python benchmarks/bench_keys.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../'))
+
+from gmx_python_sdk.scripts.v2.gmx_utils import create_hash  # noqa: E402
+from gmx_python_sdk.scripts.v2 import keys  # noqa: E402
+
+MARKET_COUNT = 100
+REPEAT = 5
+NUMBER = 20
+
+
+def make_markets(count: int):
+    return [
+        (
+            "0x{:040x}".format(3 * i + 1),
+            "0x{:040x}".format(3 * i + 2),
+            "0x{:040x}".format(3 * i + 3)
+        )
+        for i in range(count)
+    ]
+
+
+def derive_with_create_hash(markets: list):
+    for market, long_token, short_token in markets:
+        for token in (long_token, short_token):
+            create_hash(
+                ["bytes32", "address", "address"],
+                [keys.POOL_AMOUNT, market, token]
+            )
+            create_hash(
+                ["bytes32", "address", "address"],
+                [keys.CLAIMABLE_FEE_AMOUNT, market, token]
+            )
+        for is_long in (True, False):
+            for prefix in (
+                keys.RESERVE_FACTOR,
+                keys.OPEN_INTEREST_RESERVE_FACTOR,
+                keys.MAX_OPEN_INTEREST
+            ):
+                create_hash(
+                    ["bytes32", "address", "bool"],
+                    [prefix, market, is_long]
+                )
+
+
+def derive_with_key_functions(markets: list):
+    for market, long_token, short_token in markets:
+        for token in (long_token, short_token):
+            keys.pool_amount_key(market, token)
+            keys.claimable_fee_amount_key(market, token)
+        for is_long in (True, False):
+            keys.reserve_factor_key(market, is_long)
+            keys.open_interest_reserve_factor_key(market, is_long)
+            keys.max_open_interest_key(market, is_long)
+
+
+def derive_uncached(markets: list):
+    keys._hash_words.cache_clear()
+    derive_with_key_functions(markets)
+
+
+def derive_in_bulk(markets: list):
+    keys.get_market_keys(markets)
+
+
+def check_equal(markets: list):
+    bulk_keys = keys.get_market_keys(markets)
+    for market, long_token, short_token in markets:
+        expected = create_hash(
+            ["bytes32", "address", "address"],
+            [keys.POOL_AMOUNT, market, short_token]
+        )
+        assert bulk_keys[market]['short_pool_amount'] == expected
+        assert keys.pool_amount_key(market, short_token) == expected
+
+
+if __name__ == "__main__":
+    markets = make_markets(MARKET_COUNT)
+    check_equal(markets)
+
+    cases = [
+        ("create_hash", derive_with_create_hash),
+        ("key functions, cold memo", derive_uncached),
+        ("key functions, warm memo", derive_with_key_functions),
+        ("get_market_keys", derive_in_bulk)
+    ]
+
+    print("{} markets, 10 keys each, best of {}".format(MARKET_COUNT, REPEAT))
+    baseline = None
+    for name, function in cases:
+        best = min(
+            timeit.repeat(
+                lambda: function(markets), repeat=REPEAT, number=NUMBER
+            )
+        ) / NUMBER
+        baseline = baseline or best
+        print("{:<28}{:>10.3f} ms{:>8.1f}x".format(
+            name, best * 1000, baseline / best
+        ))
@@ -5,9 +5,7 @@ _set_paths()
 from web3 import Web3
 from gmx_python_sdk.scripts.v2.get.get_oracle_prices import OraclePrices
 from gmx_python_sdk.scripts.v2.get.get_markets import Markets
-from gmx_python_sdk.scripts.v2.order.order_argument_parser import (
-    OrderArgumentParser
-)
+from gmx_python_sdk.scripts.v2.token_registry import get_token_registry
 from gmx_python_sdk.scripts.v2.gmx_utils import (
     get_estimated_swap_output,
     contract_map,
@@ -62,15 +60,13 @@ class EstimateSwapOutput:
         """
 
         if in_token_address is None:
-            in_token_address = OrderArgumentParser(config=self.config).find_key_by_symbol(
-                self.tokens,
-                in_token_symbol
-            )
+            in_token_address = get_token_registry(
+                self.config.chain
+            ).get_address_by_symbol(in_token_symbol)
         if out_token_address is None:
-            out_token_address = OrderArgumentParser(config=self.config).find_key_by_symbol(
-                self.tokens,
-                out_token_symbol
-            )
+            out_token_address = get_token_registry(
+                self.config.chain
+            ).get_address_by_symbol(out_token_symbol)
         if token_amount_expanded is None:
             token_amount_expanded = (
                 token_amount * 10 ** self.tokens[in_token_address]['decimals']
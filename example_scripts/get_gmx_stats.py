@@ -13,6 +13,7 @@ from gmx_python_sdk.scripts.v2.get.get_contract_balance import (
 from gmx_python_sdk.scripts.v2.get.get_funding_apr import GetFundingFee
 from gmx_python_sdk.scripts.v2.get.get_gm_prices import GMPrices
 from gmx_python_sdk.scripts.v2.get.get_markets import Markets
+from gmx_python_sdk.scripts.v2.get.get_market_snapshot import MarketSnapshot
 from gmx_python_sdk.scripts.v2.get.get_open_interest import OpenInterest
 from gmx_python_sdk.scripts.v2.get.get_oracle_prices import OraclePrices
 from gmx_python_sdk.scripts.v2.get.get_pool_tvl import GetPoolTVL
@@ -23,42 +24,66 @@ from gmx_python_sdk.scripts.v2.gmx_utils import ConfigManager
 
 class GetGMXv2Stats:
 
-    def __init__(self, config, to_json, to_csv):
+    def __init__(
+        self, config, to_json, to_csv, snapshot=None, to_parquet=False,
+        to_sqlite=False
+    ):
         self.config = config
         self.to_json = to_json
         self.to_csv = to_csv
+        self.to_parquet = to_parquet
+        self.to_sqlite = to_sqlite
+
+        # Shared by every stat so a refresh reads the chain once
+        self.snapshot = snapshot
+
+    def collect_snapshot(self):
+
+        self.snapshot = MarketSnapshot(self.config).collect()
+
+        return self.snapshot
 
     def get_available_liquidity(self):
 
         return GetAvailableLiquidity(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_data(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_borrow_apr(self):
 
         return GetBorrowAPR(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_data(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_claimable_fees(self):
 
         return GetClaimableFees(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_data(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_contract_tvl(self):
 
         return ContractTVL(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_pool_balances(
             to_json=self.to_json
         )
@@ -66,19 +91,25 @@ class GetGMXv2Stats:
     def get_funding_apr(self):
 
         return GetFundingFee(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_data(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_gm_price(self):
 
         return GMPrices(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_price_traders(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_available_markets(self):
@@ -90,10 +121,13 @@ class GetGMXv2Stats:
     def get_open_interest(self):
 
         return OpenInterest(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_data(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_oracle_prices(self):
@@ -105,10 +139,13 @@ class GetGMXv2Stats:
     def get_pool_tvl(self):
 
         return GetPoolTVL(
-            self.config
+            self.config,
+            snapshot=self.snapshot
         ).get_pool_balances(
             to_csv=self.to_csv,
-            to_json=self.to_json
+            to_json=self.to_json,
+            to_parquet=self.to_parquet,
+            to_sqlite=self.to_sqlite
         )
 
     def get_glv_stats(self):
@@ -132,6 +169,8 @@ if __name__ == "__main__":
         to_csv=to_csv
     )
 
+    stats_object.collect_snapshot()
+
     markets = stats_object.get_available_markets()
     liquidity = stats_object.get_available_liquidity()
     borrow_apr = stats_object.get_borrow_apr()
@@ -0,0 +1,60 @@
+import asyncio
+
+from utils import _set_paths
+
+_set_paths()
+
+from gmx_python_sdk.scripts.v2.get.get_available_liquidity import (
+    AsyncGetAvailableLiquidity
+)
+from gmx_python_sdk.scripts.v2.get.get_borrow_apr import AsyncGetBorrowAPR
+from gmx_python_sdk.scripts.v2.get.get_funding_apr import AsyncGetFundingFee
+from gmx_python_sdk.scripts.v2.get.get_market_snapshot import (
+    AsyncMarketSnapshot
+)
+from gmx_python_sdk.scripts.v2.get.get_open_interest import AsyncOpenInterest
+from gmx_python_sdk.scripts.v2.rpc.async_rpc import async_session_pool
+
+from gmx_python_sdk.scripts.v2.gmx_utils import ConfigManager
+
+
+async def get_chain_stats(chain: str):
+
+    config = ConfigManager(chain=chain)
+    config.set_config()
+
+    # One snapshot shared by every fetcher of the chain
+    snapshot = await AsyncMarketSnapshot(config).collect()
+
+    open_interest, liquidity, borrow_apr, funding_apr = await asyncio.gather(
+        AsyncOpenInterest(config, snapshot=snapshot).get_data(),
+        AsyncGetAvailableLiquidity(config, snapshot=snapshot).get_data(),
+        AsyncGetBorrowAPR(config, snapshot=snapshot).get_data(),
+        AsyncGetFundingFee(config, snapshot=snapshot).get_data()
+    )
+
+    return {
+        "open_interest": open_interest,
+        "available_liquidity": liquidity,
+        "borrow_apr": borrow_apr,
+        "funding_apr": funding_apr
+    }
+
+
+async def main():
+
+    try:
+        arbitrum, avalanche = await asyncio.gather(
+            get_chain_stats("arbitrum"),
+            get_chain_stats("avalanche")
+        )
+    finally:
+        await async_session_pool.close()
+
+    print(arbitrum["open_interest"])
+    print(avalanche["open_interest"])
+
+
+if __name__ == "__main__":
+
+    asyncio.run(main())
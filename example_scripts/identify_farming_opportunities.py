@@ -2,7 +2,6 @@ from utils import _set_paths
 
 _set_paths()
 
-import time
 import numpy as np
 from numerize import numerize
 from gmx_python_sdk.scripts.v2.get.get_available_liquidity import (
@@ -28,11 +27,8 @@ def get_data(chain: str = 'arbitrum'):
         Tuple containing funding data, borrow data, available liquidity, and open interest data.
     """
     funding_data = GetFundingFee(chain=chain).get_data()
-    time.sleep(0.5)
     borrow_data = GetBorrowAPR(chain=chain).get_data()
-    time.sleep(0.5)
     available_liquidity = GetAvailableLiquidity(chain=chain).get_data()
-    time.sleep(0.5)
     open_interest_data = OpenInterest(chain=chain).get_data()
 
     return funding_data, borrow_data, available_liquidity, open_interest_data
@@ -1,11 +1,9 @@
-import json
 import os
 
-from web3 import Web3
-
 from .gmx_utils import (
-    create_connection, base_dir, convert_to_checksum_address
+    create_connection, convert_to_checksum_address, load_abi
 )
+from .rpc.connection_pool import connection_pool
 
 
 def check_if_approved(
@@ -55,15 +53,12 @@ def check_if_approved(
 
     token_checksum_address = convert_to_checksum_address(config, token_to_approve)
 
-    token_contract_abi = json.load(open(os.path.join(
-        base_dir,
-        'gmx_python_sdk',
-        'contracts',
-        'token_approval.json'
-    )))
-
-    token_contract_obj = connection.eth.contract(address=token_to_approve,
-                                                 abi=token_contract_abi)
+    token_contract_obj = connection_pool.get_contract(
+        connection,
+        token_to_approve,
+        os.path.join('contracts', 'token_approval.json'),
+        load_abi
+    )
 
     # TODO - for AVAX support this will need to incl WAVAX address
     if token_checksum_address == "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1":
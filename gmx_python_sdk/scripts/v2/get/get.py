@@ -1,21 +1,29 @@
+import asyncio
 import logging
 
 from .get_markets import Markets
 from .get_oracle_prices import OraclePrices
 from ..gmx_utils import (
     get_reader_contract, contract_map, save_json_file_to_datastore,
-    save_csv_to_datastore, make_timestamped_dataframe
+    append_csv_to_datastore, make_timestamped_row, save_parquet_to_datastore,
+    save_sqlite_to_datastore
 )
+from ..rpc.snapshot import get_pinned_block
 
 
 class GetData:
     def __init__(
         self, config: str, use_local_datastore: bool = False,
-        filter_swap_markets: bool = True
+        filter_swap_markets: bool = True, snapshot=None
     ):
         self.config = config
         self.use_local_datastore = use_local_datastore
         self.filter_swap_markets = filter_swap_markets
+        self.snapshot = snapshot
+
+        # Outputs only carry a block number when read at a known block, so
+        # files saved outside a snapshot keep their columns
+        self._snapshot_passed = snapshot is not None
 
         self.log = logging.getLogger(self.__class__.__name__)
         self.markets = Markets(config)
@@ -31,47 +39,120 @@ class GetData:
         self._long_token_address = None
         self._short_token_address = None
 
-    def get_data(self, to_json: bool = False, to_csv: bool = False):
+    def get_data(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
         if self.filter_swap_markets:
             self._filter_swap_markets()
 
         data = self._get_data_processing()
 
+        # When run inside a BlockSnapshot, or on a snapshot passed at init,
+        # record the block the data was read at
+        if get_pinned_block() is not None:
+            data['block_number'] = get_pinned_block()
+        elif self._snapshot_passed:
+            data['block_number'] = self.snapshot.block_number
+
+        self._save_data(
+            self.config.chain, data, to_json, to_csv, to_parquet, to_sqlite
+        )
+
+        return data
+
+    def _get_data_processing(self):
+        pass
+
+    @staticmethod
+    def _save_data(
+        chain: str, data: dict, to_json: bool, to_csv: bool,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
+        """
+        Save the output of a stat to the local datastore
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        data : dict
+            output of the stat, with its parameter name.
+        to_json : bool
+            pass True to save to a json file.
+        to_csv : bool
+            pass True to append to the csv files.
+        to_parquet : bool, optional
+            pass True to add to the Parquet store. The default is False.
+        to_sqlite : bool, optional
+            pass True to insert into the SQLite store. The default is False.
+
+        """
         if to_json:
             parameter = data['parameter']
             save_json_file_to_datastore(
-                "{}_{}_data.json".format(self.config.chain, parameter),
+                "{}_{}_data.json".format(chain, parameter),
                 data
             )
 
         if to_csv:
             try:
                 parameter = data['parameter']
-                dataframe = make_timestamped_dataframe(data['long'])
-                save_csv_to_datastore(
-                    "{}_long_{}_data.csv".format(self.config.chain, parameter),
-                    dataframe
+                append_csv_to_datastore(
+                    "{}_long_{}_data.csv".format(chain, parameter),
+                    make_timestamped_row(data['long'])
                 )
-                dataframe = make_timestamped_dataframe(data['short'])
-                save_csv_to_datastore(
-                    "{}_short_{}_data.csv".format(self.config.chain, parameter),
-                    dataframe
+                append_csv_to_datastore(
+                    "{}_short_{}_data.csv".format(chain, parameter),
+                    make_timestamped_row(data['short'])
                 )
             except KeyError as e:
 
-                dataframe = make_timestamped_dataframe(data)
-                save_csv_to_datastore(
-                    "{}_{}_data.csv".format(self.config.chain, parameter),
-                    dataframe
+                append_csv_to_datastore(
+                    "{}_{}_data.csv".format(chain, parameter),
+                    make_timestamped_row(data)
                 )
 
             except Exception as e:
                 logging.info(e)
 
-        return data
+        if to_parquet:
+            save_parquet_to_datastore(chain, data['parameter'], data)
 
-    def _get_data_processing(self):
-        pass
+        if to_sqlite:
+            save_sqlite_to_datastore(chain, data['parameter'], data)
+
+    def _get_snapshot(self, stat: str, pnl_factor_type: bytes = None):
+        """
+        Get the snapshot passed at init, raising if it lacks the inputs of
+        the stat, or collect a new one holding them
+
+        Parameters
+        ----------
+        stat : str
+            name of the stat, a key of STAT_INPUTS.
+        pnl_factor_type : bytes, optional
+            pnl factor gm prices are read with. The default is None.
+
+        Returns
+        -------
+        MarketSnapshot
+            collected snapshot.
+
+        """
+        from .get_market_snapshot import (
+            MarketSnapshot, STAT_INPUTS, check_snapshot
+        )
+
+        if self._snapshot_passed:
+            check_snapshot(self.snapshot, stat, pnl_factor_type)
+            return self.snapshot
+
+        return MarketSnapshot(
+            self.config,
+            inputs=STAT_INPUTS[stat],
+            pnl_factor_type=pnl_factor_type
+        ).collect()
 
     def _get_token_addresses(self, market_key: str):
         self._long_token_address = self.markets.get_long_token_address(
@@ -87,15 +168,7 @@ class GetData:
         )
 
     def _filter_swap_markets(self):
-        # TODO: Move to markets MAYBE
-        keys_to_remove = []
-        for market_key in self.markets.info:
-            market_symbol = self.markets.get_market_symbol(market_key)
-            if 'SWAP' in market_symbol:
-                # Remove swap markets from dict
-                keys_to_remove.append(market_key)
-
-        [self.markets.info.pop(k) for k in keys_to_remove]
+        self.markets.filter_swap_markets()
 
     def _get_pnl(
         self, market: list, prices_list: list, is_long: bool,
@@ -149,81 +222,12 @@ class GetData:
         """
         oracle_prices_dict = OraclePrices(self.config.chain).get_recent_prices()
 
-        try:
-            prices = (
-                (
-                    int(
-                        (
-                            oracle_prices_dict[index_token_address]
-                            ['minPriceFull']
-                        )
-                    ),
-                    int(
-                        (
-                            oracle_prices_dict[index_token_address]
-                            ['maxPriceFull']
-                        )
-                    )
-                ),
-                (
-                    int(
-                        (
-                            oracle_prices_dict[self._long_token_address]
-                            ['minPriceFull']
-                        )
-                    ),
-                    int(
-                        (
-                            oracle_prices_dict[self._long_token_address]
-                            ['maxPriceFull']
-                        )
-                    )
-                ),
-                (
-                    int(
-                        (
-                            oracle_prices_dict[self._short_token_address]
-                            ['minPriceFull']
-                        )
-                    ),
-                    int(
-                        (
-                            oracle_prices_dict[self._short_token_address]
-                            ['maxPriceFull']
-                        )
-                    )
-                ))
-
-        # TODO - this needs to be here until GMX add stables to signed price
-        # API
-        except KeyError:
-            prices = (
-                (
-                    int(
-                        oracle_prices_dict[index_token_address]['minPriceFull']
-                    ),
-                    int(
-                        oracle_prices_dict[index_token_address]['maxPriceFull']
-                    )
-                ),
-                (
-                    int(
-                        (
-                            oracle_prices_dict[self._long_token_address]
-                            ['minPriceFull']
-                        )
-                    ),
-                    int(
-                        (
-                            oracle_prices_dict[self._long_token_address]
-                            ['maxPriceFull']
-                        )
-                    )
-                ),
-                (
-                    int(1000000000000000000000000),
-                    int(1000000000000000000000000)
-                ))
+        prices = self._build_market_prices(
+            oracle_prices_dict,
+            index_token_address,
+            self._long_token_address,
+            self._short_token_address
+        )
 
         if return_tuple:
             return prices
@@ -234,6 +238,58 @@ class GetData:
             market_key
         )
 
+    @staticmethod
+    def _build_market_prices(
+        oracle_prices_dict: dict, index_token_address: str,
+        long_token_address: str, short_token_address: str
+    ):
+        """
+        Build the (min, max) price tuples of the index, long and short tokens
+        of a market in the form the reader contract expects
+
+        Parameters
+        ----------
+        oracle_prices_dict : dict
+            signed prices keyed by token address.
+        index_token_address : str
+            address of index token.
+        long_token_address : str
+            address of long collateral token.
+        short_token_address : str
+            address of short collateral token.
+
+        Returns
+        -------
+        tuple
+            index, long and short token prices. Raises KeyError if the index
+            or long token is not priced.
+
+        """
+        index_prices = (
+            int(oracle_prices_dict[index_token_address]['minPriceFull']),
+            int(oracle_prices_dict[index_token_address]['maxPriceFull'])
+        )
+        long_prices = (
+            int(oracle_prices_dict[long_token_address]['minPriceFull']),
+            int(oracle_prices_dict[long_token_address]['maxPriceFull'])
+        )
+
+        try:
+            short_prices = (
+                int(oracle_prices_dict[short_token_address]['minPriceFull']),
+                int(oracle_prices_dict[short_token_address]['maxPriceFull'])
+            )
+
+        # TODO - this needs to be here until GMX add stables to signed price
+        # API
+        except KeyError:
+            short_prices = (
+                int(1000000000000000000000000),
+                int(1000000000000000000000000)
+            )
+
+        return index_prices, long_prices, short_prices
+
     @staticmethod
     def _format_market_info_output(output):
         output = {
@@ -274,3 +330,87 @@ class GetData:
             "isDisabled": output[6],
         }
         return output
+
+
+class AsyncGetData:
+    """
+    Async counterpart of GetData, computing a stat from an
+    AsyncMarketSnapshot so it can run alongside other fetchers and chains
+    on one event loop:
+
+        data = await AsyncOpenInterest(config).get_data()
+
+    Pass the same snapshot to several fetchers to read the chain once.
+    Subclasses set stat and compute.
+    """
+
+    stat = None
+
+    def __init__(self, config, snapshot=None):
+        self.config = config
+        self.snapshot = snapshot
+
+        # As for GetData, see GetData.__init__
+        self._snapshot_passed = snapshot is not None
+
+        self.log = logging.getLogger(self.__class__.__name__)
+
+    async def get_data(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
+        snapshot = await self._get_snapshot(self.stat)
+        data = self._compute(snapshot)
+
+        if get_pinned_block() is not None:
+            data['block_number'] = get_pinned_block()
+        elif self._snapshot_passed:
+            data['block_number'] = snapshot.block_number
+
+        if to_json or to_csv or to_parquet or to_sqlite:
+            await asyncio.to_thread(
+                GetData._save_data,
+                self.config.chain,
+                data,
+                to_json,
+                to_csv,
+                to_parquet,
+                to_sqlite
+            )
+
+        return data
+
+    def _compute(self, snapshot):
+        pass
+
+    async def _get_snapshot(self, stat: str, pnl_factor_type: bytes = None):
+        """
+        Get the snapshot passed at init, raising if it lacks the inputs of
+        the stat, or collect a new one holding them
+
+        Parameters
+        ----------
+        stat : str
+            name of the stat, a key of STAT_INPUTS.
+        pnl_factor_type : bytes, optional
+            pnl factor gm prices are read with. The default is None.
+
+        Returns
+        -------
+        AsyncMarketSnapshot
+            collected snapshot.
+
+        """
+        from .get_market_snapshot import (
+            AsyncMarketSnapshot, STAT_INPUTS, check_snapshot
+        )
+
+        if self._snapshot_passed:
+            check_snapshot(self.snapshot, stat, pnl_factor_type)
+            return self.snapshot
+
+        return await AsyncMarketSnapshot(
+            self.config,
+            inputs=STAT_INPUTS[stat],
+            pnl_factor_type=pnl_factor_type
+        ).collect()
@@ -1,16 +1,28 @@
 import json
 import os
 
-from .get import GetData
-from .get_open_interest import OpenInterest
-from ..gmx_utils import (
-    get_funding_factor_per_period, base_dir, execute_threading,
-)
+from .get import AsyncGetData, GetData
+from .get_market_snapshot import compute_funding_apr
+from ..gmx_utils import base_dir
+
+
+def _load_local_open_interest(chain: str):
+    return json.load(
+        open(
+            os.path.join(
+                base_dir,
+                "data_store",
+                "{}_open_interest.json".format(chain)
+            )
+        )
+    )
 
 
 class GetFundingFee(GetData):
-    def __init__(self, config, use_local_datastore: bool = False):
-        super().__init__(config)
+    def __init__(
+        self, config, use_local_datastore: bool = False, snapshot=None
+    ):
+        super().__init__(config, snapshot=snapshot)
         self.config = config
         self.use_local_datastore = use_local_datastore
 
@@ -26,107 +38,40 @@ class GetFundingFee(GetData):
         """
 
         # If passing true will use local instance of open interest data
+        open_interest = None
         if self.use_local_datastore:
-            open_interest = json.load(
-                open(
-                    os.path.join(
-                        base_dir,
-                        "data_store",
-                        "{}_open_interest.json".format(self.config.chain)
-                    )
-                )
-            )
-        else:
-            open_interest = OpenInterest(
-                config=self.config
-            ).get_data(to_json=False)
-
-        print("\nGMX v2 Funding Rates (% per hour)")
-
-        # define empty lists to pass to zip iterater later on
-        mapper = []
-        output_list = []
-        long_interest_usd_list = []
-        short_interest_usd_list = []
-
-        # loop markets
-        for market_key in self.markets.info:
-            symbol = self.markets.get_market_symbol(market_key)
-            index_token_address = self.markets.get_index_token_address(
-                market_key
-            )
-            self._get_token_addresses(market_key)
+            open_interest = _load_local_open_interest(self.config.chain)
 
-            output = self._get_oracle_prices(
-                market_key,
-                index_token_address,
-            )
+        self.log.info("GMX v2 Funding Rates (% per hour)")
 
-            mapper.append(symbol)
-            output_list.append(output)
-            long_interest_usd_list = (
-                long_interest_usd_list +
-                [
-                    open_interest['long'][symbol] * 10 ** 30
-                ]
-            )
-            short_interest_usd_list = (
-                short_interest_usd_list +
-                [
-                    open_interest['short'][symbol] * 10 ** 30
-                ]
-            )
+        self.output = compute_funding_apr(
+            self._get_snapshot("funding_apr"),
+            open_interest
+        )
 
-        # Multithreaded call on contract
-        threaded_output = execute_threading(output_list)
-        for (
-            output,
-            long_interest_usd,
-            short_interest_usd,
-            symbol
-        ) in zip(
-            threaded_output,
-            long_interest_usd_list,
-            short_interest_usd_list,
-            mapper
-        ):
-            print("\n{}".format(symbol))
-
-            market_info_dict = {
-                "market_token": output[0][0],
-                "index_token": output[0][1],
-                "long_token": output[0][2],
-                "short_token": output[0][3],
-                "long_borrow_fee": output[1],
-                "short_borrow_fee": output[2],
-                "is_long_pays_short": output[4][0],
-                "funding_factor_per_second": output[4][1]
-            }
-
-            long_funding_fee = get_funding_factor_per_period(
-                market_info_dict,
-                True,
-                3600,
-                long_interest_usd,
-                short_interest_usd
-            )
-            print("Long funding hrly rate {:.4f}%".format(long_funding_fee))
-
-            short_funding_fee = get_funding_factor_per_period(
-                market_info_dict,
-                False,
-                3600,
-                long_interest_usd,
-                short_interest_usd
-            )
-            print("Short funding hrly rate {:.4f}%".format(short_funding_fee))
+        return self.output
 
-            self.output['long'][symbol] = long_funding_fee
-            self.output['short'][symbol] = short_funding_fee
 
-        self.output['parameter'] = "funding_apr"
+class AsyncGetFundingFee(AsyncGetData):
+    """
+    Async counterpart of GetFundingFee
+    """
 
-        return self.output
+    stat = "funding_apr"
+
+    def __init__(
+        self, config, use_local_datastore: bool = False, snapshot=None
+    ):
+        super().__init__(config, snapshot=snapshot)
+        self.use_local_datastore = use_local_datastore
+
+    def _compute(self, snapshot):
+        # If passing true will use local instance of open interest data
+        open_interest = None
+        if self.use_local_datastore:
+            open_interest = _load_local_open_interest(self.config.chain)
+
+        return compute_funding_apr(snapshot, open_interest)
 
 
 if __name__ == "__main__":
@@ -1,23 +1,56 @@
-from .get import GetData
+import asyncio
+
+from .get import AsyncGetData, GetData
+from .get_market_snapshot import compute_gm_prices
 from ..gmx_utils import (
-    get_reader_contract, contract_map, execute_threading,
-    save_json_file_to_datastore, make_timestamped_dataframe,
-    save_csv_to_datastore
+    save_json_file_to_datastore, make_timestamped_row,
+    append_csv_to_datastore, save_parquet_to_datastore,
+    save_sqlite_to_datastore
 )
+from ..rpc.snapshot import get_pinned_block
 from ..keys import (
     MAX_PNL_FACTOR_FOR_TRADERS, MAX_PNL_FACTOR_FOR_DEPOSITS,
     MAX_PNL_FACTOR_FOR_WITHDRAWALS
 )
 
 
+def _save_gm_prices(
+    chain: str, output: dict, to_json: bool, to_csv: bool,
+    to_parquet: bool = False, to_sqlite: bool = False
+):
+    if to_json:
+        filename = "{}_gm_prices.json".format(chain)
+        save_json_file_to_datastore(
+            filename,
+            output
+        )
+
+    if to_csv:
+        append_csv_to_datastore(
+            "{}_gm_prices.csv".format(chain),
+            make_timestamped_row(output)
+        )
+
+    if to_parquet:
+        save_parquet_to_datastore(chain, "gm_prices", output)
+
+    if to_sqlite:
+        save_sqlite_to_datastore(chain, "gm_prices", output)
+
+
 class GMPrices(GetData):
-    def __init__(self, config: str):
-        super().__init__(config)
+    def __init__(self, config: str, snapshot=None):
+        super().__init__(config, snapshot=snapshot)
         self.config = config
         self.to_json = None
         self.to_csv = None
+        self.to_parquet = None
+        self.to_sqlite = None
 
-    def get_price_withdraw(self, to_json: bool = False, to_csv: bool = False):
+    def get_price_withdraw(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
         """
         Get GM price if withdrawing from LP
 
@@ -27,6 +60,12 @@ class GMPrices(GetData):
             pass True to save price to json. The default is False.
         to_csv : bool, optional
             pass True to save price to json. The default is False.
+        to_parquet : bool, optional
+            pass True to add price to the Parquet store. The default is
+            False.
+        to_sqlite : bool, optional
+            pass True to insert price into the SQLite store. The default is
+            False.
 
         Returns
         -------
@@ -36,11 +75,16 @@ class GMPrices(GetData):
         """
         self.to_json = to_json
         self.to_csv = to_csv
+        self.to_parquet = to_parquet
+        self.to_sqlite = to_sqlite
         pnl_factor_type = MAX_PNL_FACTOR_FOR_WITHDRAWALS
 
         return self._get_data_processing(pnl_factor_type)
 
-    def get_price_deposit(self, to_json: bool = False, to_csv: bool = False):
+    def get_price_deposit(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
         """
         Get GM price if depositing to LP
 
@@ -50,6 +94,12 @@ class GMPrices(GetData):
             pass True to save price to json. The default is False.
         to_csv : bool, optional
             pass True to save price to json. The default is False.
+        to_parquet : bool, optional
+            pass True to add price to the Parquet store. The default is
+            False.
+        to_sqlite : bool, optional
+            pass True to insert price into the SQLite store. The default is
+            False.
 
         Returns
         -------
@@ -59,10 +109,15 @@ class GMPrices(GetData):
         """
         self.to_json = to_json
         self.to_csv = to_csv
+        self.to_parquet = to_parquet
+        self.to_sqlite = to_sqlite
         pnl_factor_type = MAX_PNL_FACTOR_FOR_DEPOSITS
         return self._get_data_processing(pnl_factor_type)
 
-    def get_price_traders(self, to_json: bool = False, to_csv: bool = False):
+    def get_price_traders(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
         """
         Get GM price if trading from LP
 
@@ -72,6 +127,12 @@ class GMPrices(GetData):
             pass True to save price to json. The default is False.
         to_csv : bool, optional
             pass True to save price to json. The default is False.
+        to_parquet : bool, optional
+            pass True to add price to the Parquet store. The default is
+            False.
+        to_sqlite : bool, optional
+            pass True to insert price into the SQLite store. The default is
+            False.
 
         Returns
         -------
@@ -81,6 +142,8 @@ class GMPrices(GetData):
         """
         self.to_json = to_json
         self.to_csv = to_csv
+        self.to_parquet = to_parquet
+        self.to_sqlite = to_sqlite
         pnl_factor_type = MAX_PNL_FACTOR_FOR_TRADERS
         return self._get_data_processing(pnl_factor_type)
 
@@ -99,62 +162,22 @@ class GMPrices(GetData):
             dictionary of gm prices.
 
         """
-        output_list = []
-        mapper = []
-        self._filter_swap_markets()
-
-        for iter, market_key in enumerate(self.markets.info):
-            self._get_token_addresses(market_key)
-            index_token_address = self.markets.get_index_token_address(
-                market_key
-            )
-            oracle_prices = self._get_oracle_prices(
-                market_key,
-                index_token_address,
-                return_tuple=True
-            )
-
-            market = [
-                market_key,
-                index_token_address,
-                self._long_token_address,
-                self._short_token_address
-            ]
-
-            output = self._make_market_token_price_query(
-                market,
-                oracle_prices[0],
-                oracle_prices[1],
-                oracle_prices[2],
-                pnl_factor_type
-            )
-
-            # add the uncalled web3 object to list
-            output_list.append(output)
-
-            # add the market symbol to a list to use to map to dictionary later
-            mapper.append(self.markets.get_market_symbol(market_key))
-
-        # feed the uncalled web3 objects into threading function
-        threaded_output = execute_threading(output_list)
-
-        for key, output in zip(mapper, threaded_output):
-            # divide by 10**30 to turn into USD value
-            self.output[key] = output[0] / 10**30
-
-        if self.to_json:
-            filename = "{}_gm_prices.json".format(self.config.chain)
-            save_json_file_to_datastore(
-                filename,
-                self.output
-            )
-
-        if self.to_csv:
-            dataframe = make_timestamped_dataframe(self.output)
-
-            save_csv_to_datastore(
-                "{}_gm_prices.csv".format(self.config.chain),
-                dataframe)
+        snapshot = self._get_snapshot("gm_prices", pnl_factor_type)
+        self.output.update(compute_gm_prices(snapshot))
+
+        if get_pinned_block() is not None:
+            self.output['block_number'] = get_pinned_block()
+        elif self._snapshot_passed:
+            self.output['block_number'] = snapshot.block_number
+
+        _save_gm_prices(
+            self.config.chain,
+            self.output,
+            self.to_json,
+            self.to_csv,
+            self.to_parquet,
+            self.to_sqlite
+        )
 
         self.output['parameter'] = "gm_prices"
         del self.output["long"]
@@ -209,5 +232,91 @@ class GMPrices(GetData):
         return output
 
 
+class AsyncGMPrices(AsyncGetData):
+    """
+    Async counterpart of GMPrices
+    """
+
+    stat = "gm_prices"
+
+    async def get_price_withdraw(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
+        return await self._get_prices(
+            MAX_PNL_FACTOR_FOR_WITHDRAWALS, to_json, to_csv, to_parquet,
+            to_sqlite
+        )
+
+    async def get_price_deposit(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
+        return await self._get_prices(
+            MAX_PNL_FACTOR_FOR_DEPOSITS, to_json, to_csv, to_parquet,
+            to_sqlite
+        )
+
+    async def get_price_traders(
+        self, to_json: bool = False, to_csv: bool = False,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
+        return await self._get_prices(
+            MAX_PNL_FACTOR_FOR_TRADERS, to_json, to_csv, to_parquet,
+            to_sqlite
+        )
+
+    async def _get_prices(
+        self, pnl_factor_type, to_json: bool, to_csv: bool,
+        to_parquet: bool = False, to_sqlite: bool = False
+    ):
+        """
+        Get GM pool prices for a given profit/loss factor
+
+        Parameters
+        ----------
+        pnl_factor_type : hash
+            descriptor for datastore.
+        to_json : bool
+            pass True to save price to json.
+        to_csv : bool
+            pass True to save price to csv.
+        to_parquet : bool, optional
+            pass True to add price to the Parquet store. The default is
+            False.
+        to_sqlite : bool, optional
+            pass True to insert price into the SQLite store. The default is
+            False.
+
+        Returns
+        -------
+        gm_pool_prices : dict
+            dictionary of gm prices.
+
+        """
+        snapshot = await self._get_snapshot(self.stat, pnl_factor_type)
+        output = compute_gm_prices(snapshot)
+
+        if get_pinned_block() is not None:
+            output['block_number'] = get_pinned_block()
+        elif self._snapshot_passed:
+            output['block_number'] = snapshot.block_number
+
+        if to_json or to_csv or to_parquet or to_sqlite:
+            await asyncio.to_thread(
+                _save_gm_prices,
+                self.config.chain,
+                output,
+                to_json,
+                to_csv,
+                to_parquet,
+                to_sqlite
+            )
+
+        output['parameter'] = "gm_prices"
+
+        return output
+
+
 if __name__ == "__main__":
     output = GMPrices(chain="arbitrum").get_price_traders(to_csv=True)
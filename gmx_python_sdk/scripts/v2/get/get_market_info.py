@@ -0,0 +1,245 @@
+import logging
+
+from .get import GetData
+from .get_markets import Markets, get_market_registry
+from .get_oracle_prices import OraclePrices
+from ..gmx_utils import contract_map, get_reader_contract, execute_threading
+
+# Number of markets requested per reader getMarketInfoList call
+MARKET_INFO_PAGE_SIZE = 25
+
+
+class GetMarketInfo:
+    """
+    Fetch the reader MarketInfo of many markets with getMarketInfoList. The
+    reader reads markets by their index in the datastore market list, so
+    each call covers a contiguous run of priced markets in on-chain order
+    """
+
+    def __init__(
+        self, config, markets: Markets = None,
+        page_size: int = MARKET_INFO_PAGE_SIZE
+    ):
+        self.config = config
+        self.markets = markets if markets is not None else Markets(config)
+        self.page_size = page_size
+
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.reader_contract = get_reader_contract(config)
+        self.data_store_contract_address = (
+            contract_map[config.chain]['datastore']['contract_address']
+        )
+
+    def get_market_info(self, market_keys: list = None):
+        """
+        Get the market info of each market
+
+        Parameters
+        ----------
+        market_keys : list, optional
+            market addresses to fetch. The default is None, fetching every
+            market in markets.info.
+
+        Returns
+        -------
+        market_info : dict
+            market info in the format of GetData._format_market_info_output,
+            keyed by market address. Markets that could not be priced or
+            read are left out.
+
+        """
+        oracle_prices_dict = OraclePrices(self.config.chain).get_recent_prices()
+        pages, calls = self.build_calls(oracle_prices_dict)
+
+        return self.decode_outputs(
+            pages,
+            execute_threading(calls, self.config),
+            market_keys
+        )
+
+    def build_calls(self, oracle_prices_dict: dict):
+        """
+        Build the uncalled getMarketInfoList function of each page of
+        markets, without executing them
+
+        Parameters
+        ----------
+        oracle_prices_dict : dict
+            signed prices keyed by token address.
+
+        Returns
+        -------
+        pages : list
+            list of (start index, [(market key, prices), ...]) tuples.
+        calls : list
+            uncalled web3 contract function of each page.
+
+        """
+        pages = self._build_pages(oracle_prices_dict)
+
+        calls = [
+            self.reader_contract.functions.getMarketInfoList(
+                self.data_store_contract_address,
+                [prices for _, prices in page],
+                start,
+                start + len(page)
+            )
+            for start, page in pages
+        ]
+
+        return pages, calls
+
+    def decode_outputs(
+        self, pages: list, outputs: list, market_keys: list = None
+    ):
+        """
+        Format the outputs of the calls from build_calls
+
+        Parameters
+        ----------
+        pages : list
+            pages returned by build_calls.
+        outputs : list
+            decoded output of each call, None where a call reverted.
+        market_keys : list, optional
+            market addresses to keep. The default is None, keeping every
+            market in markets.info.
+
+        Returns
+        -------
+        market_info : dict
+            market info in the format of GetData._format_market_info_output,
+            keyed by market address.
+
+        """
+        if market_keys is None:
+            market_keys = list(self.markets.info)
+
+        wanted_market_keys = set(market_keys)
+
+        market_info = {}
+        for (start, page), output in zip(pages, outputs):
+            if output is None:
+                # A market in the page reverted, read its markets one by one
+                output = self._get_market_info_by_market(page)
+
+            for (market_key, _), raw_market_info in zip(page, output):
+                if (
+                    raw_market_info is None
+                    or market_key not in wanted_market_keys
+                ):
+                    continue
+
+                market_info[market_key] = (
+                    GetData._format_market_info_output(raw_market_info)
+                )
+
+        return market_info
+
+    def _build_pages(self, oracle_prices_dict: dict):
+        """
+        Split the on-chain market list into pages of consecutive markets
+        which can all be priced. Markets that cannot be priced, or are not
+        decoded by the registry, end a page
+
+        Parameters
+        ----------
+        oracle_prices_dict : dict
+            signed prices keyed by token address.
+
+        Returns
+        -------
+        pages : list
+            list of (start index, [(market key, prices), ...]) tuples.
+
+        """
+        registry = get_market_registry(self.config.chain)
+        decoded_markets = registry.info
+
+        pages = []
+        start = None
+        page = []
+        for index, raw_market in enumerate(registry.raw_markets):
+            market = decoded_markets.get(raw_market[0])
+            prices = None
+            if market is not None:
+                try:
+                    prices = GetData._build_market_prices(
+                        oracle_prices_dict,
+                        market['index_token_address'],
+                        market['long_token_address'],
+                        market['short_token_address']
+                    )
+                except KeyError:
+                    pass
+
+            if prices is None:
+                if page:
+                    pages.append((start, page))
+                start = None
+                page = []
+                continue
+
+            if start is None:
+                start = index
+            page.append((raw_market[0], prices))
+
+            if len(page) == self.page_size:
+                pages.append((start, page))
+                start = None
+                page = []
+
+        if page:
+            pages.append((start, page))
+
+        return pages
+
+    def _get_market_info_by_market(self, page: list):
+        """
+        Read the market info of each market in a page with getMarketInfo
+
+        Parameters
+        ----------
+        page : list
+            list of (market key, prices) tuples.
+
+        Returns
+        -------
+        list
+            raw market info of each market, None where the call reverted.
+
+        """
+        self.log.warning(
+            "getMarketInfoList reverted, reading {} markets one by one".format(
+                len(page)
+            )
+        )
+        return execute_threading(self.build_market_calls(page), self.config)
+
+    def build_market_calls(self, page: list):
+        """
+        Build the uncalled getMarketInfo function of each market in a page
+
+        Parameters
+        ----------
+        page : list
+            list of (market key, prices) tuples.
+
+        Returns
+        -------
+        list
+            uncalled web3 contract function of each market.
+
+        """
+        return [
+            self.reader_contract.functions.getMarketInfo(
+                self.data_store_contract_address,
+                prices,
+                market_key
+            )
+            for market_key, prices in page
+        ]
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,990 @@
+import asyncio
+import logging
+
+from numerize import numerize
+
+from .get import GetData
+from .get_market_info import GetMarketInfo
+from .get_markets import Markets
+from .get_oracle_prices import OraclePrices
+from ..gmx_utils import (
+    contract_map, execute_threading, get_datastore_contract,
+    get_reader_contract, get_token_balance_contract,
+    get_funding_factor_per_period
+)
+from ..keys import get_market_keys
+from ..rpc.snapshot import BlockSnapshot, get_pinned_block
+
+# Raw inputs a snapshot can collect
+SNAPSHOT_INPUTS = (
+    "market_info",
+    "open_interest",
+    "pool_amounts",
+    "reserve_factors",
+    "claimable_fees",
+    "gm_prices",
+    "balances"
+)
+
+# Raw inputs each stat is computed from
+STAT_INPUTS = {
+    "open_interest": ("open_interest",),
+    "available_liquidity": (
+        "open_interest", "pool_amounts", "reserve_factors"
+    ),
+    "borrow_apr": ("market_info",),
+    "funding_apr": ("market_info", "open_interest"),
+    "claimable_fees": ("claimable_fees",),
+    "gm_prices": ("gm_prices",),
+    "pool_tvl": ("pool_amounts",),
+    "contract_tvl": ("balances",)
+}
+
+log = logging.getLogger(__name__)
+
+
+class MarketSnapshot:
+    """
+    Every raw on-chain input of the GetData stats, read in one
+    execute_threading pass pinned to a single block. Each stat is then
+    computed from the snapshot by the compute_* functions of this module:
+
+        snapshot = MarketSnapshot(config).collect()
+        open_interest = compute_open_interest(snapshot)
+        liquidity = compute_available_liquidity(snapshot)
+
+    Pass inputs to only collect what some stats need, see STAT_INPUTS.
+    """
+
+    def __init__(
+        self, config, inputs: tuple = SNAPSHOT_INPUTS,
+        pnl_factor_type: bytes = None
+    ):
+        unknown_inputs = set(inputs) - set(SNAPSHOT_INPUTS)
+        if unknown_inputs:
+            raise Exception(
+                "Unknown snapshot inputs: {}".format(sorted(unknown_inputs))
+            )
+
+        self.config = config
+        self.inputs = frozenset(inputs)
+        if pnl_factor_type is None:
+            from ..keys import MAX_PNL_FACTOR_FOR_TRADERS
+            pnl_factor_type = MAX_PNL_FACTOR_FOR_TRADERS
+        self.pnl_factor_type = pnl_factor_type
+
+        self.markets = None
+        self.oracle_prices = None
+        self.block_number = None
+
+        # Raw outputs keyed by market address
+        self.market_info = {}
+        self.open_interest = {}
+        self.pool_amounts = {}
+        self.reserve_factors = {}
+        self.claimable_fees = {}
+        self.gm_prices = {}
+        self.balances = {}
+
+        self._calls = []
+        self._slots = []
+
+    def has_inputs(self, inputs: tuple, pnl_factor_type: bytes = None):
+        """
+        Check if the snapshot holds the given inputs
+
+        Parameters
+        ----------
+        inputs : tuple
+            names of the raw inputs.
+        pnl_factor_type : bytes, optional
+            pnl factor the gm prices must be read with. The default is None.
+
+        Returns
+        -------
+        bool
+            True if every input was collected.
+
+        """
+        if self.block_number is None or not self.inputs.issuperset(inputs):
+            return False
+
+        return (
+            pnl_factor_type is None
+            or "gm_prices" not in inputs
+            or pnl_factor_type == self.pnl_factor_type
+        )
+
+    def collect(self):
+        """
+        Read every requested input in one pass at the same block
+
+        Returns
+        -------
+        MarketSnapshot
+            the snapshot, for chaining.
+
+        """
+        self.markets = Markets(self.config)
+        self.oracle_prices = OraclePrices(
+            self.config.chain
+        ).get_recent_prices()
+
+        with BlockSnapshot(self.config) as block:
+            self.block_number = block.block_number
+
+            market_info, pages = self._build_all_calls()
+            outputs = execute_threading(self._calls, self.config)
+            self._store_outputs(market_info, pages, outputs)
+
+        return self
+
+    def _build_all_calls(self):
+        """
+        Build the calls of every requested input into self._calls, market
+        info pages first
+
+        Returns
+        -------
+        market_info : GetMarketInfo
+            market info fetcher, None if market info is not requested.
+        pages : list
+            market info pages, see GetMarketInfo.build_calls.
+
+        """
+        self._calls = []
+        self._slots = []
+        market_info = None
+        pages = []
+        if "market_info" in self.inputs:
+            market_info = GetMarketInfo(self.config, markets=self.markets)
+            pages, calls = market_info.build_calls(self.oracle_prices)
+            self._calls.extend(calls)
+
+        self._build_calls()
+
+        return market_info, pages
+
+    def _store_outputs(self, market_info, pages: list, outputs: list):
+        """
+        Store the outputs of the calls from _build_all_calls
+
+        Parameters
+        ----------
+        market_info : GetMarketInfo
+            market info fetcher, None if market info is not requested.
+        pages : list
+            market info pages.
+        outputs : list
+            decoded output of each call, None where a call reverted.
+
+        """
+        if market_info is not None:
+            self.market_info = market_info.decode_outputs(
+                pages,
+                outputs[:len(pages)]
+            )
+        outputs = outputs[len(pages):]
+
+        for (store, market_key, field), output in zip(self._slots, outputs):
+            store.setdefault(market_key, {})[field] = output
+
+        self._calls = []
+        self._slots = []
+
+    def _add_call(self, call, store: dict, market_key: str, field: str):
+        self._calls.append(call)
+        self._slots.append((store, market_key, field))
+
+    def _build_calls(self):
+        reader_contract = get_reader_contract(self.config)
+        datastore = get_datastore_contract(self.config)
+        data_store_contract_address = (
+            contract_map[self.config.chain]['datastore']['contract_address']
+        )
+
+        market_keys = get_market_keys(
+            [
+                (
+                    market_key,
+                    market['long_token_address'],
+                    market['short_token_address']
+                )
+                for market_key, market in self.markets.info.items()
+            ]
+        )
+
+        for market_key, market in self.markets.info.items():
+            keys = market_keys[market_key]
+            is_swap_market = self.markets.is_swap_market(market_key)
+
+            if "pool_amounts" in self.inputs:
+                for side in ("long", "short"):
+                    self._add_call(
+                        datastore.functions.getUint(
+                            keys[side + "_pool_amount"]
+                        ),
+                        self.pool_amounts,
+                        market_key,
+                        side
+                    )
+
+            if "balances" in self.inputs:
+                for side in ("long", "short"):
+                    token_contract = get_token_balance_contract(
+                        self.config,
+                        market[side + "_token_address"]
+                    )
+                    self._add_call(
+                        token_contract.functions.balanceOf(market_key),
+                        self.balances,
+                        market_key,
+                        side
+                    )
+                    self._add_call(
+                        token_contract.functions.decimals(),
+                        self.balances,
+                        market_key,
+                        side + "_decimals"
+                    )
+
+            # The remaining inputs are only used by stats of trading markets
+            if is_swap_market:
+                continue
+
+            index_token_address = market['index_token_address']
+            reader_market = [
+                market_key,
+                index_token_address,
+                market['long_token_address'],
+                market['short_token_address']
+            ]
+
+            if (
+                "open_interest" in self.inputs
+                and index_token_address in self.oracle_prices
+            ):
+                index_price = self.oracle_prices[index_token_address]
+                index_prices = [
+                    int(index_price['minPriceFull']),
+                    int(index_price['maxPriceFull'])
+                ]
+                for side, is_long in (("long", True), ("short", False)):
+                    self._add_call(
+                        reader_contract.functions.getOpenInterestWithPnl(
+                            data_store_contract_address,
+                            reader_market,
+                            index_prices,
+                            is_long,
+                            False
+                        ),
+                        self.open_interest,
+                        market_key,
+                        side + "_oi_with_pnl"
+                    )
+                    self._add_call(
+                        reader_contract.functions.getPnl(
+                            data_store_contract_address,
+                            reader_market,
+                            index_prices,
+                            is_long,
+                            False
+                        ),
+                        self.open_interest,
+                        market_key,
+                        side + "_pnl"
+                    )
+
+            if "reserve_factors" in self.inputs:
+                for side in ("long", "short"):
+                    self._add_call(
+                        datastore.functions.getUint(
+                            keys[side + "_reserve_factor"]
+                        ),
+                        self.reserve_factors,
+                        market_key,
+                        side + "_reserve_factor"
+                    )
+                    self._add_call(
+                        datastore.functions.getUint(
+                            keys[side + "_open_interest_reserve_factor"]
+                        ),
+                        self.reserve_factors,
+                        market_key,
+                        side + "_open_interest_reserve_factor"
+                    )
+
+            if "claimable_fees" in self.inputs:
+                for side in ("long", "short"):
+                    self._add_call(
+                        datastore.functions.getUint(
+                            keys[side + "_claimable_fee_amount"]
+                        ),
+                        self.claimable_fees,
+                        market_key,
+                        side
+                    )
+
+            if "gm_prices" in self.inputs:
+                try:
+                    prices = GetData._build_market_prices(
+                        self.oracle_prices,
+                        index_token_address,
+                        market['long_token_address'],
+                        market['short_token_address']
+                    )
+                except KeyError:
+                    continue
+
+                self._add_call(
+                    reader_contract.functions.getMarketTokenPrice(
+                        data_store_contract_address,
+                        reader_market,
+                        prices[0],
+                        prices[1],
+                        prices[2],
+                        self.pnl_factor_type,
+                        True
+                    ),
+                    self.gm_prices,
+                    market_key,
+                    "price"
+                )
+
+
+class AsyncMarketSnapshot(MarketSnapshot):
+    """
+    MarketSnapshot collected without blocking the event loop: the block
+    number, oracle prices and contract calls go over the shared aiohttp
+    session of the running loop, see rpc.async_rpc. Loading the market
+    registry, usually served from memory, runs in a worker thread:
+
+        snapshot = await AsyncMarketSnapshot(config).collect()
+        open_interest = compute_open_interest(snapshot)
+    """
+
+    async def collect(self):
+        """
+        Read every requested input in one pass at the same block
+
+        Returns
+        -------
+        AsyncMarketSnapshot
+            the snapshot, for chaining.
+
+        """
+        from ..rpc.async_rpc import execute_async, get_block_number_async
+
+        # Reuse the block of an enclosing BlockSnapshot
+        self.block_number = get_pinned_block()
+
+        requests = [
+            asyncio.to_thread(Markets, self.config),
+            OraclePrices(self.config.chain).get_recent_prices_async()
+        ]
+        if self.block_number is None:
+            requests.append(get_block_number_async(self.config))
+
+        results = await asyncio.gather(*requests)
+        self.markets, self.oracle_prices = results[:2]
+        if self.block_number is None:
+            self.block_number = results[2]
+
+        market_info, pages = self._build_all_calls()
+        outputs = await execute_async(
+            self._calls,
+            self.config,
+            self.block_number
+        )
+
+        # Read the markets of any reverted market info page one by one
+        for index, (_, page) in enumerate(pages):
+            if outputs[index] is None:
+                outputs[index] = await execute_async(
+                    market_info.build_market_calls(page),
+                    self.config,
+                    self.block_number
+                )
+
+        self._store_outputs(market_info, pages, outputs)
+
+        return self
+
+
+def check_snapshot(
+    snapshot: MarketSnapshot, stat: str, pnl_factor_type: bytes = None
+):
+    """
+    Check a snapshot passed to a fetcher holds the inputs of a stat. A
+    snapshot is never silently replaced by one read at another block, so
+    collect it with every input its fetchers need
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        snapshot passed to the fetcher.
+    stat : str
+        name of the stat, a key of STAT_INPUTS.
+    pnl_factor_type : bytes, optional
+        pnl factor gm prices must be read with. The default is None.
+
+    """
+    if snapshot.block_number is None:
+        raise Exception(
+            "Snapshot for {} has not been collected!".format(stat)
+        )
+
+    _check_inputs(snapshot, stat)
+
+    if not snapshot.has_inputs(STAT_INPUTS[stat], pnl_factor_type):
+        raise Exception(
+            "Snapshot gm prices were read with another pnl factor type!"
+        )
+
+
+def _check_inputs(snapshot: MarketSnapshot, stat: str):
+    if not snapshot.inputs.issuperset(STAT_INPUTS[stat]):
+        raise Exception(
+            "Snapshot is missing inputs {} for {}".format(
+                sorted(set(STAT_INPUTS[stat]) - snapshot.inputs),
+                stat
+            )
+        )
+
+
+def _get_median_price(oracle_prices: dict, token_address: str, precision):
+    return (
+        float(oracle_prices[token_address]['maxPriceFull']) / precision
+        + float(oracle_prices[token_address]['minPriceFull']) / precision
+    ) / 2
+
+
+def _is_complete(raw_outputs: dict, market_key: str, stat: str, market):
+    # An individual call that reverted is None, its market is left out
+    outputs = raw_outputs.get(market_key)
+    if outputs is not None and None not in outputs.values():
+        return True
+
+    _log_dropped(stat, market)
+    return False
+
+
+def _log_dropped(stat: str, market: dict):
+    log.warning(
+        "Leaving {} out of {}, a call reverted".format(
+            market['market_symbol'], stat
+        )
+    )
+
+
+def compute_open_interest(snapshot: MarketSnapshot):
+    """
+    Compute the open interest of each market, see OpenInterest
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of long and short open interest in USD.
+
+    """
+    _check_inputs(snapshot, "open_interest")
+
+    output = {"long": {}, "short": {}}
+    for market_key, market in snapshot.markets.non_swap_info.items():
+        if not _is_complete(
+            snapshot.open_interest, market_key, "open_interest", market
+        ):
+            continue
+
+        raw_output = snapshot.open_interest[market_key]
+        market_symbol = market['market_symbol']
+
+        long_value = (
+            raw_output['long_oi_with_pnl'] - raw_output['long_pnl']
+        ) / 10 ** 30
+        short_value = (
+            raw_output['short_oi_with_pnl'] - raw_output['short_pnl']
+        ) / 10 ** 30
+
+        log.info(f"{market_symbol} Long: ${numerize.numerize(long_value)}")
+        log.info(f"{market_symbol} Short: ${numerize.numerize(short_value)}")
+
+        output['long'][market_symbol] = long_value
+        output['short'][market_symbol] = short_value
+
+    output['parameter'] = "open_interest"
+
+    return output
+
+
+def compute_available_liquidity(
+    snapshot: MarketSnapshot, open_interest: dict = None
+):
+    """
+    Compute the available liquidity of each market, see
+    GetAvailableLiquidity
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+    open_interest : dict, optional
+        output of compute_open_interest. The default is None, computing it
+        from the snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of long and short available liquidity in USD.
+
+    """
+    _check_inputs(snapshot, "available_liquidity")
+
+    if open_interest is None:
+        open_interest = compute_open_interest(snapshot)
+
+    output = {"long": {}, "short": {}}
+    for market_key, market in snapshot.markets.non_swap_info.items():
+        if (
+            not _is_complete(
+                snapshot.pool_amounts, market_key, "available_liquidity",
+                market
+            )
+            or not _is_complete(
+                snapshot.reserve_factors, market_key, "available_liquidity",
+                market
+            )
+        ):
+            continue
+
+        token_symbol = market['market_symbol']
+        if token_symbol not in open_interest['long']:
+            continue
+
+        pool_amounts = snapshot.pool_amounts[market_key]
+        reserve_factors = snapshot.reserve_factors[market_key]
+
+        long_decimal_factor = market['long_token_metadata']['decimals']
+        short_decimal_factor = market['short_token_metadata']['decimals']
+        long_precision = 10 ** (30 + long_decimal_factor)
+        short_precision = 10 ** (30 + short_decimal_factor)
+        oracle_precision = 10 ** (30 - long_decimal_factor)
+
+        token_price = _get_median_price(
+            snapshot.oracle_prices,
+            market['long_token_address'],
+            oracle_precision
+        )
+
+        log.info("Token: {}".format(token_symbol))
+
+        # select the lesser of maximum value of pool reserves or open
+        # interest limit
+        long_reserve_factor = min(
+            reserve_factors['long_reserve_factor'],
+            reserve_factors['long_open_interest_reserve_factor']
+        )
+
+        long_pool_amount = pool_amounts['long']
+        if "2" in token_symbol:
+            long_pool_amount = long_pool_amount / 2
+
+        long_max_reserved_usd = (
+            long_pool_amount * long_reserve_factor / long_precision
+            * token_price
+        )
+        long_liquidity = long_max_reserved_usd - float(
+            open_interest['long'][token_symbol]
+        )
+
+        log.info(
+            "Available Long Liquidity: ${}".format(
+                numerize.numerize(long_liquidity)
+            )
+        )
+
+        short_reserve_factor = min(
+            reserve_factors['short_reserve_factor'],
+            reserve_factors['short_open_interest_reserve_factor']
+        )
+        reserved_short = float(open_interest['short'][token_symbol])
+
+        # If its a single side market need to calculate on token amount
+        # rather than $ value
+        if "2" in token_symbol:
+            short_max_reserved_usd = (
+                pool_amounts['short'] / 2 * short_reserve_factor
+                / short_precision * token_price
+            )
+        else:
+            short_max_reserved_usd = (
+                pool_amounts['short'] * short_reserve_factor
+                / short_precision
+            )
+        short_liquidity = short_max_reserved_usd - reserved_short
+
+        log.info(
+            "Available Short Liquidity: ${}".format(
+                numerize.numerize(short_liquidity)
+            )
+        )
+
+        output['long'][token_symbol] = long_liquidity
+        output['short'][token_symbol] = short_liquidity
+
+    output['parameter'] = "available_liquidity"
+
+    return output
+
+
+def compute_borrow_apr(snapshot: MarketSnapshot):
+    """
+    Compute the hourly borrow rate of each market, see GetBorrowAPR
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of long and short borrow rates.
+
+    """
+    _check_inputs(snapshot, "borrow_apr")
+
+    output = {"long": {}, "short": {}}
+    for market_key, market in snapshot.markets.non_swap_info.items():
+        market_info = snapshot.market_info.get(market_key)
+        if market_info is None:
+            _log_dropped("borrow_apr", market)
+            continue
+
+        key = market['market_symbol']
+        output["long"][key] = (
+            market_info["borrowingFactorPerSecondForLongs"] / 10 ** 28
+        ) * 3600
+        output["short"][key] = (
+            market_info["borrowingFactorPerSecondForShorts"] / 10 ** 28
+        ) * 3600
+
+        log.info(
+            (
+                "{}\nLong Borrow Hourly Rate: -{:.5f}%\n"
+                "Short Borrow Hourly Rate: -{:.5f}%\n"
+            ).format(key, output["long"][key], output["short"][key])
+        )
+
+    output['parameter'] = "borrow_apr"
+
+    return output
+
+
+def compute_funding_apr(
+    snapshot: MarketSnapshot, open_interest: dict = None
+):
+    """
+    Compute the hourly funding rate of each market, see GetFundingFee
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+    open_interest : dict, optional
+        output of compute_open_interest. The default is None, computing it
+        from the snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of long and short funding rates.
+
+    """
+    _check_inputs(snapshot, "funding_apr")
+
+    if open_interest is None:
+        open_interest = compute_open_interest(snapshot)
+
+    output = {"long": {}, "short": {}}
+    for market_key, market in snapshot.markets.non_swap_info.items():
+        market_info = snapshot.market_info.get(market_key)
+        symbol = market['market_symbol']
+        if market_info is None:
+            _log_dropped("funding_apr", market)
+            continue
+        if symbol not in open_interest['long']:
+            continue
+
+        long_interest_usd = open_interest['long'][symbol] * 10 ** 30
+        short_interest_usd = open_interest['short'][symbol] * 10 ** 30
+
+        market_info_dict = {
+            "market_token": market_info["market_address"],
+            "index_token": market_info["index_address"],
+            "long_token": market_info["long_address"],
+            "short_token": market_info["short_address"],
+            "long_borrow_fee": market_info["borrowingFactorPerSecondForLongs"],
+            "short_borrow_fee": market_info[
+                "borrowingFactorPerSecondForShorts"
+            ],
+            "is_long_pays_short": market_info["longsPayShorts"],
+            "funding_factor_per_second": market_info["fundingFactorPerSecond"]
+        }
+
+        long_funding_fee = get_funding_factor_per_period(
+            market_info_dict,
+            True,
+            3600,
+            long_interest_usd,
+            short_interest_usd
+        )
+        short_funding_fee = get_funding_factor_per_period(
+            market_info_dict,
+            False,
+            3600,
+            long_interest_usd,
+            short_interest_usd
+        )
+
+        log.info(
+            "{}\nLong funding hrly rate {:.4f}%\n"
+            "Short funding hrly rate {:.4f}%".format(
+                symbol, long_funding_fee, short_funding_fee
+            )
+        )
+
+        output['long'][symbol] = long_funding_fee
+        output['short'][symbol] = short_funding_fee
+
+    output['parameter'] = "funding_apr"
+
+    return output
+
+
+def compute_claimable_fees(snapshot: MarketSnapshot):
+    """
+    Compute the total claimable fees across markets, see GetClaimableFees
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary with the total claimable fees in USD.
+
+    """
+    _check_inputs(snapshot, "claimable_fees")
+
+    total_fees = 0
+    for market_key, market in snapshot.markets.non_swap_info.items():
+        if not _is_complete(
+            snapshot.claimable_fees, market_key, "claimable_fees", market
+        ):
+            continue
+
+        claimable_fees = snapshot.claimable_fees[market_key]
+        token_symbol = market['market_symbol']
+
+        long_decimal_factor = market['long_token_metadata']['decimals']
+        long_precision = 10 ** (long_decimal_factor - 1)
+        oracle_precision = 10 ** (30 - long_decimal_factor)
+
+        long_token_price = _get_median_price(
+            snapshot.oracle_prices,
+            market['long_token_address'],
+            oracle_precision
+        )
+
+        # convert raw outputs into USD value
+        long_claimable_usd = (
+            claimable_fees['long'] / long_precision
+        ) * long_token_price
+
+        # TODO - currently all short fees are collected in USDC which is
+        # 6 decimals
+        short_claimable_usd = claimable_fees['short'] / (10 ** 6)
+
+        if "2" in token_symbol:
+            short_claimable_usd = 0
+
+        log.info(f"Token: {token_symbol}")
+        log.info(
+            f"Long Claimable Fees: ${numerize.numerize(long_claimable_usd)}"
+        )
+        log.info(
+            f"Short Claimable Fees: ${numerize.numerize(short_claimable_usd)}"
+        )
+
+        total_fees += long_claimable_usd + short_claimable_usd
+
+    return {'total_fees': total_fees, "parameter": "total_fees"}
+
+
+def compute_gm_prices(snapshot: MarketSnapshot):
+    """
+    Compute the GM token price of each market for the snapshot pnl factor,
+    see GMPrices
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of gm prices keyed by market symbol.
+
+    """
+    _check_inputs(snapshot, "gm_prices")
+
+    output = {}
+    for market_key, market in snapshot.markets.non_swap_info.items():
+        if not _is_complete(
+            snapshot.gm_prices, market_key, "gm_prices", market
+        ):
+            continue
+
+        # divide by 10**30 to turn into USD value
+        output[market['market_symbol']] = (
+            snapshot.gm_prices[market_key]['price'][0] / 10 ** 30
+        )
+
+    return output
+
+
+def compute_pool_tvl(snapshot: MarketSnapshot):
+    """
+    Compute the USD value of the datastore pool amounts of each market, see
+    get_pool_tvl.GetPoolTVL
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of total tvl, long token and short token per market.
+
+    """
+    _check_inputs(snapshot, "pool_tvl")
+
+    pool_tvl_dict = {
+        "total_tvl": {},
+        "long_token": {},
+        "short_token": {}
+    }
+    for market_key, market in snapshot.markets.info.items():
+        if not _is_complete(
+            snapshot.pool_amounts, market_key, "pool_tvl", market
+        ):
+            continue
+
+        pool_amounts = snapshot.pool_amounts[market_key]
+        long_decimals = market['long_token_metadata']['decimals']
+        long_token_balance = pool_amounts['long'] / 10 ** long_decimals
+        short_token_balance = pool_amounts['short'] / 10 ** (
+            market['short_token_metadata']['decimals']
+        )
+
+        try:
+            long_usd_balance = long_token_balance * _get_median_price(
+                snapshot.oracle_prices,
+                market['long_token_address'],
+                10 ** (30 - long_decimals)
+            )
+        except KeyError:
+            long_usd_balance = long_token_balance
+
+        dictionary_key = market['market_symbol']
+        pool_tvl_dict['total_tvl'][dictionary_key] = (
+            long_usd_balance + short_token_balance
+        )
+        pool_tvl_dict['long_token'][dictionary_key] = (
+            market['long_token_address']
+        )
+        pool_tvl_dict['short_token'][dictionary_key] = (
+            market['short_token_address']
+        )
+
+        log.info(
+            "{} Pool USD Value: ${}".format(
+                dictionary_key, long_usd_balance + short_token_balance
+            )
+        )
+
+    return pool_tvl_dict
+
+
+def compute_contract_tvl(snapshot: MarketSnapshot):
+    """
+    Compute the USD value of the token balances held by each market
+    contract, see get_contract_balance.GetPoolTVL
+
+    Parameters
+    ----------
+    snapshot : MarketSnapshot
+        collected snapshot.
+
+    Returns
+    -------
+    dict
+        dictionary of total tvl, long token and short token per market.
+
+    """
+    _check_inputs(snapshot, "contract_tvl")
+
+    pool_tvl_dict = {}
+    for market_key, market in snapshot.markets.info.items():
+        if not _is_complete(
+            snapshot.balances, market_key, "contract_tvl", market
+        ):
+            continue
+
+        balances = snapshot.balances[market_key]
+        long_token_balance = (
+            balances['long'] / 10 ** balances['long_decimals']
+        )
+        short_token_balance = (
+            balances['short'] / 10 ** balances['short_decimals']
+        )
+
+        try:
+            long_usd_balance = long_token_balance * _get_median_price(
+                snapshot.oracle_prices,
+                market['long_token_address'],
+                10 ** (30 - market['long_token_metadata']['decimals'])
+            )
+        except KeyError:
+            log.info("Contract address not known")
+            long_usd_balance = long_token_balance
+
+        dictionary_key = market['market_symbol']
+        pool_tvl_dict[dictionary_key] = {
+            'total_tvl': long_usd_balance + short_token_balance,
+            'long_token': market['long_token_address'],
+            'short_token': market['short_token_address']
+        }
+
+        log.info(
+            "{} Pool USD Value: ${}".format(
+                dictionary_key, long_usd_balance + short_token_balance
+            )
+        )
+
+    return pool_tvl_dict
+
+
+if __name__ == "__main__":
+    pass
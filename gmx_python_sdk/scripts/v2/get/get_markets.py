@@ -1,17 +1,389 @@
 import logging
+import threading
+import time
 
 from ..gmx_utils import (
-    contract_map, get_tokens_address_dict, get_reader_contract
+    contract_map, get_tokens_address_dict, get_reader_contract,
+    get_datastore_contract, execute_threading
 )
+from ..keys import MARKET_LIST
 
 from .get_oracle_prices import OraclePrices
 
+# Number of markets requested per reader getMarkets call
+MARKETS_PAGE_SIZE = 50
+
+# Seconds between checks of the on-chain market count
+MARKETS_REFRESH_INTERVAL = 60
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class MarketRegistry:
+    """
+    Decoded markets of one chain, shared across the process. The raw market
+    list is kept in on-chain order and only extended with markets added
+    since the last refresh, found by comparing the datastore market count
+    """
+
+    def __init__(
+        self, chain: str, refresh_interval: float = MARKETS_REFRESH_INTERVAL
+    ):
+        self.chain = chain
+        self.refresh_interval = refresh_interval
+        self.raw_markets = []
+        self.indexes = MarketIndexes({})
+
+        self.log = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._checked_at = None
+
+    @property
+    def info(self):
+        return self.indexes.info
+
+    def get_markets(self, config, force_refresh: bool = False):
+        """
+        Get the decoded markets, refreshing them if the last check of the
+        market count is older than refresh_interval. The returned dictionary
+        is shared and should be treated as read only
+
+        Parameters
+        ----------
+        config : ConfigManager
+            config for the chain of the registry.
+        force_refresh : bool, optional
+            pass True to check the market count regardless of age. The
+            default is False.
+
+        Returns
+        -------
+        dict
+            dictionary of decoded market data keyed by market address.
+
+        """
+        return self.get_indexes(config, force_refresh).info
+
+    def get_indexes(self, config, force_refresh: bool = False):
+        """
+        Get the decoded markets with their secondary indexes, refreshing them
+        if the last check of the market count is older than refresh_interval
+
+        Parameters
+        ----------
+        config : ConfigManager
+            config for the chain of the registry.
+        force_refresh : bool, optional
+            pass True to check the market count regardless of age. The
+            default is False.
+
+        Returns
+        -------
+        MarketIndexes
+            decoded markets and their indexes.
+
+        """
+        self.refresh(config, force_refresh)
+        return self.indexes
+
+    def refresh(self, config, force: bool = False):
+        """
+        Fetch and decode any markets added on chain since the last refresh
+
+        Parameters
+        ----------
+        config : ConfigManager
+            config for the chain of the registry.
+        force : bool, optional
+            pass True to check the market count regardless of age. The
+            default is False.
+
+        """
+        if not force and self._is_fresh():
+            return
+
+        with self._lock:
+            if not force and self._is_fresh():
+                return
+
+            market_count = get_datastore_contract(
+                config
+            ).functions.getAddressCount(MARKET_LIST).call()
+
+            known_count = len(self.raw_markets)
+            if market_count < known_count:
+                # Markets are never removed, treat a shorter list as a reset
+                self.raw_markets = []
+                self.indexes = MarketIndexes({})
+                known_count = 0
+
+            if market_count > known_count:
+                self.raw_markets = self.raw_markets + self._get_raw_markets(
+                    config,
+                    known_count,
+                    market_count
+                )
+
+            if len(self.info) < len(self.raw_markets):
+                self.indexes = MarketIndexes(self._decode_markets())
+
+            self._checked_at = time.monotonic()
+
+    def _is_fresh(self):
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.refresh_interval
+        )
+
+    def _get_raw_markets(self, config, start: int, end: int):
+        """
+        Get a range of markets from the reader contract, one page per call
+        with all pages sent together
+
+        Parameters
+        ----------
+        config : ConfigManager
+            config for the chain of the registry.
+        start : int
+            index of the first market.
+        end : int
+            index after the last market.
+
+        Returns
+        -------
+        list
+            raw reader output for each market, in on-chain order.
+
+        """
+        reader_contract = get_reader_contract(config)
+        data_store_contract_address = (
+            contract_map[config.chain]['datastore']['contract_address']
+        )
+
+        calls = [
+            reader_contract.functions.getMarkets(
+                data_store_contract_address,
+                page_start,
+                min(page_start + MARKETS_PAGE_SIZE, end)
+            )
+            for page_start in range(start, end, MARKETS_PAGE_SIZE)
+        ]
+
+        raw_markets = []
+        for page in execute_threading(calls, config):
+            if page is None:
+                raise Exception("Failed to get markets from reader!")
+            raw_markets.extend(page)
+
+        return raw_markets
+
+    def _decode_markets(self):
+        """
+        Decode every raw market, reusing markets already decoded. Markets
+        whose index token is not yet priced by the signed prices api are
+        skipped and retried on the next refresh
+
+        Returns
+        -------
+        decoded_markets : dict
+            dictionary decoded market data, in on-chain order.
+
+        """
+        token_address_dict = get_tokens_address_dict(self.chain)
+        prices = None
+
+        decoded_markets = {}
+        for raw_market in self.raw_markets:
+            market_key = raw_market[0]
+            if market_key in self.info:
+                decoded_markets[market_key] = self.info[market_key]
+                continue
+
+            if prices is None:
+                prices = OraclePrices(chain=self.chain).get_recent_prices()
+
+            if (
+                raw_market[1] != ZERO_ADDRESS
+                and raw_market[1] not in prices
+            ):
+                self.log.debug(
+                    "{} market not live on GMX yet..".format(raw_market[1])
+                )
+                continue
+
+            decoded_markets[market_key] = decode_market(
+                raw_market,
+                token_address_dict
+            )
+
+        return decoded_markets
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_market_registry(chain: str):
+    """
+    Get the process-wide market registry for a chain
+
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+
+    Returns
+    -------
+    MarketRegistry
+        market registry of the chain.
+
+    """
+    with _registries_lock:
+        if chain not in _registries:
+            _registries[chain] = MarketRegistry(chain)
+
+        return _registries[chain]
+
+
+def decode_market(raw_market: tuple, token_address_dict: dict):
+    """
+    Decode the reader output for a market
+
+    Parameters
+    ----------
+    raw_market : tuple
+        market address, index, long and short token addresses.
+    token_address_dict : dict
+        dictionary of known tokens keyed by address.
+
+    Returns
+    -------
+    dict
+        decoded market data.
+
+    """
+    try:
+        market_symbol = token_address_dict[raw_market[1]]['symbol']
+
+        if raw_market[2] == raw_market[3]:
+            market_symbol = f"{market_symbol}2"
+        decoded_market = {
+            'gmx_market_address': raw_market[0],
+            'market_symbol': market_symbol,
+            'index_token_address': raw_market[1],
+            'market_metadata': token_address_dict[raw_market[1]],
+            'long_token_metadata': token_address_dict[raw_market[2]],
+            'long_token_address': raw_market[2],
+            'short_token_metadata': token_address_dict[raw_market[3]],
+            'short_token_address': raw_market[3]
+        }
+        if raw_market[0] == "0x0Cf1fb4d1FF67A3D8Ca92c9d6643F8F9be8e03E5":
+            decoded_market["market_symbol"] = "wstETH"
+            decoded_market[
+                "index_token_address"
+            ] = "0x5979D7b546E38E414F7E9822514be443A4800529"
+
+    # If KeyError it is because there is no market symbol and it is a
+    # swap market
+    except KeyError:
+        swap_symbol = 'SWAP {}-{}'.format(
+            token_address_dict[raw_market[2]]['symbol'],
+            token_address_dict[raw_market[3]]['symbol']
+        )
+        decoded_market = {
+            'gmx_market_address': raw_market[0],
+            'market_symbol': swap_symbol,
+            'index_token_address': raw_market[1],
+            'market_metadata': {'symbol': swap_symbol},
+            'long_token_metadata': token_address_dict[raw_market[2]],
+            'long_token_address': raw_market[2],
+            'short_token_metadata': token_address_dict[raw_market[3]],
+            'short_token_address': raw_market[3]
+        }
+
+    return decoded_market
+
+
+class MarketIndexes:
+    """
+    Secondary indexes over a dictionary of decoded markets, built once when
+    the markets are decoded. Each index maps a value to the market keys
+    holding it, in on-chain order
+    """
+
+    def __init__(self, info: dict):
+        self.info = info
+        self.by_field = {
+            'market_symbol': {},
+            'index_token_address': {}
+        }
+        self.by_token_pair = {}
+        self.swap_market_keys = frozenset(
+            market_key for market_key, market in info.items()
+            if 'SWAP' in market['market_symbol']
+        )
+        self.non_swap_info = {
+            market_key: market for market_key, market in info.items()
+            if market_key not in self.swap_market_keys
+        }
+
+        for market_key, market in info.items():
+            for field, index in self.by_field.items():
+                index.setdefault(market[field], []).append(market_key)
+
+            self.by_token_pair.setdefault(
+                (market['long_token_address'], market['short_token_address']),
+                []
+            ).append(market_key)
+
+
+class MarketInfo(dict):
+    """
+    Dictionary of decoded markets keyed by market address, carrying the
+    registry indexes so lookups by symbol or index token do not scan every
+    market. Entries may be removed, lookups only return keys still present
+    """
+
+    def __init__(self, info: dict, indexes: MarketIndexes):
+        super().__init__(info)
+        self.indexes = indexes
+
+    def find_key(self, field: str, value):
+        """
+        Find the first market key whose market has the given value for field
+
+        Parameters
+        ----------
+        field : str
+            market field to match, such as market_symbol.
+        value : str
+            required value of the field.
+
+        Returns
+        -------
+        str
+            market key, or None if no market matches.
+
+        """
+        index = self.indexes.by_field.get(field)
+        if index is None:
+            for market_key, market in self.items():
+                if field in market and market[field] == value:
+                    return market_key
+            return None
+
+        for market_key in index.get(value, ()):
+            if market_key in self:
+                return market_key
+        return None
+
 
 class Markets:
     def __init__(self, config):
         self.config = config
-        self.info = self._process_markets()
         self.log = logging.getLogger(__name__)
+        self.info = self._process_markets()
+        self._swap_markets_filtered = False
 
     def get_index_token_address(self, market_key: str) -> str:
         return self.info[market_key]['index_token_address']
@@ -38,6 +410,41 @@ class Markets:
     def is_synthetic(self, market_key: str) -> bool:
         return self.info[market_key]['market_metadata']['synthetic']
 
+    def is_swap_market(self, market_key: str) -> bool:
+        return market_key in self.info.indexes.swap_market_keys
+
+    @property
+    def non_swap_info(self) -> dict:
+        # Shared with the registry, treat as read only
+        return self.info.indexes.non_swap_info
+
+    def get_market_key_by_symbol(self, market_symbol: str) -> str:
+        return self.info.find_key('market_symbol', market_symbol)
+
+    def get_market_key_by_index_token(self, index_token_address: str) -> str:
+        return self.info.find_key('index_token_address', index_token_address)
+
+    def get_market_keys_by_token_pair(
+        self, long_token_address: str, short_token_address: str
+    ) -> list:
+        return [
+            market_key for market_key in self.info.indexes.by_token_pair.get(
+                (long_token_address, short_token_address), ()
+            )
+            if market_key in self.info
+        ]
+
+    def filter_swap_markets(self):
+        """
+        Remove swap markets from info. Only the first call does any work
+        """
+        if self._swap_markets_filtered:
+            return
+
+        for market_key in self.info.indexes.swap_market_keys:
+            self.info.pop(market_key, None)
+        self._swap_markets_filtered = True
+
     def get_available_markets(self):
         """
         Get the available markets on a given chain
@@ -51,108 +458,21 @@ class Markets:
         logging.info("Getting Available Markets..")
         return self._process_markets()
 
-    def _get_available_markets_raw(self):
-        """
-        Get the available markets from the reader contract
-
-        Returns
-        -------
-        Markets: tuple
-            tuple of raw output from the reader contract.
-
-        """
-
-        reader_contract = get_reader_contract(self.config)
-        data_store_contract_address = (
-            contract_map[self.config.chain]['datastore']['contract_address']
-        )
-
-        return reader_contract.functions.getMarkets(
-            data_store_contract_address,
-            0,
-            50
-        ).call()
-
     def _process_markets(self):
         """
-        Call and process the raw market data
+        Get the decoded markets from the shared registry of the chain
 
         Returns
         -------
-        decoded_markets : dict
-            dictionary decoded market data.
+        decoded_markets : MarketInfo
+            dictionary decoded market data. A copy, so entries can be
+            removed without affecting other instances.
 
         """
-        token_address_dict = get_tokens_address_dict(self.config.chain)
-        raw_markets = self._get_available_markets_raw()
-
-        decoded_markets = {}
-        for raw_market in raw_markets:
-            try:
-
-                if not self._check_if_index_token_in_signed_prices_api(
-                    raw_market[1]
-                ):
-                    continue
-                market_symbol = token_address_dict[raw_market[1]]['symbol']
-
-                if raw_market[2] == raw_market[3]:
-                    market_symbol = f"{market_symbol}2"
-                decoded_markets[raw_market[0]] = {
-                    'gmx_market_address': raw_market[0],
-                    'market_symbol': market_symbol,
-                    'index_token_address': raw_market[1],
-                    'market_metadata': token_address_dict[raw_market[1]],
-                    'long_token_metadata': token_address_dict[raw_market[2]],
-                    'long_token_address': raw_market[2],
-                    'short_token_metadata': token_address_dict[raw_market[3]],
-                    'short_token_address': raw_market[3]
-                }
-                if raw_market[0] == "0x0Cf1fb4d1FF67A3D8Ca92c9d6643F8F9be8e03E5":
-                    decoded_markets[raw_market[0]]["market_symbol"] = "wstETH"
-                    decoded_markets[raw_market[0]
-                                    ]["index_token_address"] = "0x5979D7b546E38E414F7E9822514be443A4800529"
-
-            # If KeyError it is because there is no market symbol and it is a
-            # swap market
-            except KeyError:
-                if not self._check_if_index_token_in_signed_prices_api(
-                    raw_market[1]
-                ):
-                    continue
-
-                decoded_markets[raw_market[0]] = {
-                    'gmx_market_address': raw_market[0],
-                    'market_symbol': 'SWAP {}-{}'.format(
-                        token_address_dict[raw_market[2]]['symbol'],
-                        token_address_dict[raw_market[3]]['symbol']
-                    ),
-                    'index_token_address': raw_market[1],
-                    'market_metadata': {'symbol': 'SWAP {}-{}'.format(
-                        token_address_dict[raw_market[2]]['symbol'],
-                        token_address_dict[raw_market[3]]['symbol']
-                    )},
-                    'long_token_metadata': token_address_dict[raw_market[2]],
-                    'long_token_address': raw_market[2],
-                    'short_token_metadata': token_address_dict[raw_market[3]],
-                    'short_token_address': raw_market[3]
-                }
-
-        return decoded_markets
-
-    def _check_if_index_token_in_signed_prices_api(self, index_token_address):
-
-        try:
-            prices = OraclePrices(chain=self.config.chain).get_recent_prices()
-
-            if index_token_address == "0x0000000000000000000000000000000000000000":
-                return True
-            prices[index_token_address]
-            return True
-        except KeyError:
-
-            print("{} market not live on GMX yet..".format(index_token_address))
-            return False
+        indexes = get_market_registry(self.config.chain).get_indexes(
+            self.config
+        )
+        return MarketInfo(indexes.info, indexes)
 
 
 if __name__ == '__main__':
@@ -84,7 +84,7 @@ class GetOpenPositions(GetData):
         """
         market_info = self.markets.info[raw_position[0][1]]
 
-        chain_tokens = get_tokens_address_dict(chain)
+        chain_tokens = get_tokens_address_dict(self.config.chain)
 
         entry_price = (
             raw_position[1][0] / raw_position[1][1]
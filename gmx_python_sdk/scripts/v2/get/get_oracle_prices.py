@@ -1,9 +1,118 @@
+import threading
+import time
+
 import requests
 
+from ..rpc.single_flight import single_flight
+
+# Seconds a fetched set of signed prices is reused for
+ORACLE_PRICES_MAX_AGE = 5
+
+
+class OraclePriceCache:
+    """
+    Process-wide cache of processed signed prices per chain. Concurrent
+    callers needing a refresh share a single in-flight request rather than
+    each making their own, see rpc.single_flight
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(
+        self, chain: str, fetch, max_age: float = ORACLE_PRICES_MAX_AGE,
+        force_refresh: bool = False
+    ):
+        """
+        Get the cached prices for a chain, refreshing them with fetch if they
+        are older than max_age
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        fetch : callable
+            function returning freshly processed prices.
+        max_age : float, optional
+            max age in seconds of cached prices. The default is
+            ORACLE_PRICES_MAX_AGE.
+        force_refresh : bool, optional
+            pass True to ignore the cached prices. The default is False.
+
+        Returns
+        -------
+        dict
+            dictionary of prices keyed by token address.
+
+        """
+        if not force_refresh:
+            prices = self.peek(chain, max_age)
+            if prices is not None:
+                return prices
+
+        def refresh():
+            prices = fetch()
+            self.update(chain, prices)
+            return prices
+
+        return single_flight.do(("oracle_prices", chain), refresh)
+
+    def peek(self, chain: str, max_age: float = ORACLE_PRICES_MAX_AGE):
+        """
+        Get the cached prices for a chain without refreshing them
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        max_age : float, optional
+            max age in seconds of cached prices. The default is
+            ORACLE_PRICES_MAX_AGE.
+
+        Returns
+        -------
+        dict
+            dictionary of prices keyed by token address, None if there are
+            no cached prices younger than max_age.
+
+        """
+        with self._lock:
+            entry = self._entries.get(chain)
+
+        if entry is not None and time.monotonic() - entry[1] <= max_age:
+            return entry[0]
+
+    def update(self, chain: str, prices: dict):
+        """
+        Store a freshly processed set of prices for a chain
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        prices : dict
+            dictionary of prices keyed by token address.
+
+        """
+        with self._lock:
+            self._entries[chain] = (prices, time.monotonic())
+
+    def clear(self):
+        """
+        Drop all cached prices
+        """
+        with self._lock:
+            self._entries = {}
+
+
+oracle_price_cache = OraclePriceCache()
+
 
 class OraclePrices:
-    def __init__(self, chain: str):
+    def __init__(self, chain: str, max_age: float = ORACLE_PRICES_MAX_AGE):
         self.chain = chain
+        self.max_age = max_age
         self.oracle_url = {
             "arbitrum": (
                 "https://arbitrum-api.gmxinfra.io/signed_prices/latest"
@@ -13,9 +122,70 @@ class OraclePrices:
             )
         }
 
-    def get_recent_prices(self):
+    def get_recent_prices(self, force_refresh: bool = False):
+        """
+        Get raw output of the GMX rest v2 api for signed prices. Prices are
+        shared across the process and only re-fetched once older than
+        max_age, the returned dictionary should be treated as read only
+
+        Parameters
+        ----------
+        force_refresh : bool, optional
+            pass True to fetch new prices regardless of their age. The
+            default is False.
+
+        Returns
+        -------
+        dict
+            dictionary containing raw output for each token as its keys.
+
+        """
+        return oracle_price_cache.get(
+            self.chain,
+            self._fetch_prices,
+            self.max_age,
+            force_refresh
+        )
+
+    async def get_recent_prices_async(self, force_refresh: bool = False):
+        """
+        Async counterpart of get_recent_prices, fetching over the shared
+        aiohttp session of the running loop. Shares the process-wide cache
+        with get_recent_prices
+
+        Parameters
+        ----------
+        force_refresh : bool, optional
+            pass True to fetch new prices regardless of their age. The
+            default is False.
+
+        Returns
+        -------
+        dict
+            dictionary containing raw output for each token as its keys.
+
+        """
+        from ..rpc.async_rpc import get_json
+
+        if not force_refresh:
+            prices = oracle_price_cache.peek(self.chain, self.max_age)
+            if prices is not None:
+                return prices
+
+        async def refresh():
+            raw_output = await get_json(self.oracle_url[self.chain])
+            prices = self._process_output(raw_output)
+            oracle_price_cache.update(self.chain, prices)
+            return prices
+
+        return await single_flight.do_async(
+            ("oracle_prices", self.chain),
+            refresh
+        )
+
+    def _fetch_prices(self):
         """
-        Get raw output of the GMX rest v2 api for signed prices
+        Query the signed prices api and process the response
 
         Returns
         -------
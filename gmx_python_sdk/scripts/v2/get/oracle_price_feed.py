@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+
+import requests
+
+from .get_oracle_prices import OraclePrices, oracle_price_cache
+
+
+class PriceTable:
+    """
+    Compact table of the min/max oracle price of each token, in the 30
+    decimal format returned by the signed prices api
+    """
+
+    def __init__(self, prices: dict, updated_at: float):
+        self.prices = prices
+        self.updated_at = updated_at
+
+    def get_price(self, token_address: str):
+        """
+        Get the (min, max) price of a token
+
+        Parameters
+        ----------
+        token_address : str
+            contract address of token.
+
+        Returns
+        -------
+        tuple
+            min and max price.
+
+        """
+        return self.prices[token_address]
+
+    def get_median_price(self, token_address: str):
+        """
+        Get the median of the min and max price of a token
+
+        Parameters
+        ----------
+        token_address : str
+            contract address of token.
+
+        Returns
+        -------
+        float
+            median price.
+
+        """
+        min_price, max_price = self.prices[token_address]
+        return (min_price + max_price) / 2
+
+
+class OraclePriceFeed:
+    """
+    Poll signed_prices/latest on a fixed cadence in a background thread,
+    publishing each new set of prices to subscribers and priming the shared
+    OraclePrices cache so readers never block on http:
+
+        feed = OraclePriceFeed("arbitrum", interval=1)
+        feed.subscribe(lambda table: print(table.updated_at))
+        feed.start()
+
+        async for table in feed.stream():
+            ...
+
+    Payloads identical to the previous poll are not re-parsed or published.
+    """
+
+    def __init__(self, chain: str, interval: float = 1):
+        self.chain = chain
+        self.interval = interval
+        self.latest = None
+
+        self.log = logging.getLogger(self.__class__.__name__)
+        self._oracle_prices = OraclePrices(chain)
+        self._session = requests.Session()
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_digest = None
+        self._last_processed = None
+
+    def start(self):
+        """
+        Start polling in a background thread
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="OraclePriceFeed-{}".format(self.chain),
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """
+        Stop polling and wait for the background thread to exit
+
+        Parameters
+        ----------
+        timeout : float, optional
+            max seconds to wait for the thread. The default is None.
+
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._session.close()
+
+    def subscribe(self, callback):
+        """
+        Register a callback called with each new PriceTable, from the feed
+        thread
+
+        Parameters
+        ----------
+        callback : callable
+            function taking a PriceTable.
+
+        Returns
+        -------
+        callable
+            the registered callback.
+
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        Remove a registered callback
+
+        Parameters
+        ----------
+        callback : callable
+            the registered callback.
+
+        """
+        with self._lock:
+            self._subscribers.remove(callback)
+
+    async def stream(self, max_queue_size: int = 100):
+        """
+        Async iterator yielding each new PriceTable. If the consumer falls
+        behind by more than max_queue_size updates the oldest are dropped
+
+        Parameters
+        ----------
+        max_queue_size : int, optional
+            max number of unconsumed updates held. The default is 100.
+
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(max_queue_size)
+
+        def enqueue(table):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(table)
+
+        def callback(table):
+            loop.call_soon_threadsafe(enqueue, table)
+
+        self.subscribe(callback)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(callback)
+
+    def poll(self):
+        """
+        Fetch the latest payload once, publishing it if it has changed
+
+        Returns
+        -------
+        PriceTable
+            the latest price table.
+
+        """
+        response = self._session.get(
+            self._oracle_prices.oracle_url[self.chain]
+        )
+        response.raise_for_status()
+
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if digest == self._last_digest:
+            # Unchanged prices are still current, keep the cache warm
+            oracle_price_cache.update(self.chain, self._last_processed)
+            return self.latest
+
+        processed = self._oracle_prices._process_output(response.json())
+        table = PriceTable(
+            {
+                token_address: (
+                    int(price['minPriceFull']),
+                    int(price['maxPriceFull'])
+                )
+                for token_address, price in processed.items()
+            },
+            time.time()
+        )
+
+        self._last_digest = digest
+        self._last_processed = processed
+        self.latest = table
+        oracle_price_cache.update(self.chain, processed)
+
+        self._publish(table)
+
+        return table
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            started_at = time.monotonic()
+
+            try:
+                self.poll()
+            except Exception as e:
+                self.log.warning("Price feed poll failed: {}".format(e))
+
+            self._stop_event.wait(
+                max(0, self.interval - (time.monotonic() - started_at))
+            )
+
+    def _publish(self, table: PriceTable):
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(table)
+            except Exception as e:
+                self.log.warning("Price feed subscriber failed: {}".format(e))
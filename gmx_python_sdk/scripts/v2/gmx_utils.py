@@ -1,16 +1,17 @@
-from eth_abi import encode
-from web3 import Web3
-import yaml
+# web3, eth_abi, yaml and pandas are slow to import, so they are imported by
+# the functions that use them rather than at module load
 import logging
 import os
 import json
-import requests
-
-import pandas as pd
 
 from datetime import datetime
+from functools import lru_cache
 
-from concurrent.futures import ThreadPoolExecutor
+from .rpc.connection_pool import connection_pool
+from .rpc.executor import EXECUTOR_MAX_WORKERS, shared_executor
+from .rpc.rate_limiter import rate_limiter
+from .rpc.rpc_pool import get_rpc_urls
+from .rpc.snapshot import get_pinned_block
 
 
 # Get the absolute path of the current script
@@ -20,23 +21,144 @@ base_dir = os.path.abspath(
 )
 package_dir = base_dir + '/gmx_python_sdk/'
 
-logging.basicConfig(
-    format='{asctime} {levelname}: {message}',
-    datefmt='%m/%d/%Y %I:%M:%S %p',
-    style='{',
-    level=logging.INFO
-)
+MULTICALL_BATCH_SIZE = 100
+RPC_BATCH_SIZE = 50
+
+# Max number of requests the async fetchers keep in flight per event loop
+ASYNC_CONCURRENCY = 16
+
+# Default requests per second and burst allowed per rpc endpoint, the rate
+# backs off when the provider throttles and recovers up to this limit
+RPC_RATE_LIMIT = 50
+RPC_BURST = 50
+
+# Default retries of a throttled or failed rpc request, with exponential
+# backoff from RPC_BACKOFF seconds capped at RPC_MAX_BACKOFF
+RPC_MAX_RETRIES = 5
+RPC_BACKOFF = 0.25
+RPC_MAX_BACKOFF = 8
+
+# Latency percentile of an rpc endpoint after which hedged reads are sent to
+# a second endpoint as well, None disables hedging
+RPC_HEDGE_PERCENTILE = None
+
+# Default max number of calls the threading transport runs at once per rpc
+# url on the shared executor
+RPC_CONCURRENCY = 8
 
 
 # Functions required for multithreading
-def execute_call(call):
-    return call.call()
+def execute_call(call, block_identifier=None):
+    return call.call(block_identifier=block_identifier)
+
+
+def execute_threading(function_calls: list, config=None):
+    """
+    Execute a list of uncalled web3 contract functions using the call
+    transport selected on the config:
+
+    - "multicall": packed into Multicall3 aggregate3 batches (default)
+    - "batch": sent as JSON-RPC batch arrays of eth_call
+    - "threading": one eth_call per function on config.max_workers
+      threads of the shared executor, at most config.rpc_concurrency at
+      once per rpc url
+
+    Parameters
+    ----------
+    function_calls : list
+        list of uncalled web3 contract functions.
+    config : ConfigManager, optional
+        config object holding the transport and batch sizes. The default is
+        None.
+
+    Returns
+    -------
+    list
+        decoded outputs in the same order as function_calls, None where an
+        individual call reverted.
+
+    """
+    call_transport = "multicall"
+    if config is not None:
+        call_transport = config.call_transport
+
+        # Apply the config's limits to the endpoints every transport shares
+        rate_limiter.configure(config)
+
+    if call_transport == "multicall":
+        from .rpc.multicall import execute_multicall
+
+        if config is None:
+            return execute_multicall(function_calls, MULTICALL_BATCH_SIZE)
+
+        return execute_multicall(
+            function_calls,
+            config.multicall_batch_size,
+            config.chain
+        )
 
+    if call_transport == "batch":
+        from .rpc.batch_rpc import execute_batch_rpc
 
-def execute_threading(function_calls):
-    with ThreadPoolExecutor() as executor:
-        results = list(executor.map(execute_call, function_calls))
-    return results
+        return execute_batch_rpc(
+            function_calls,
+            config.rpc,
+            config.rpc_batch_size,
+            chain=config.chain
+        )
+
+    if call_transport == "threading":
+        # worker threads do not see the caller's snapshot, so pass the
+        # pinned block explicitly
+        block_identifier = get_pinned_block()
+
+        if shared_executor.max_workers != config.max_workers:
+            shared_executor.configure(config.max_workers)
+
+        return shared_executor.map(
+            lambda call: execute_call(call, block_identifier),
+            function_calls,
+            get_rpc_urls(config.rpc),
+            config.rpc_concurrency
+        )
+
+    raise Exception(
+        'Unknown call transport "{}"!'.format(call_transport)
+    )
+
+
+def decode_contract_function_output(function_call, return_data: bytes):
+    """
+    Decode the raw return data of an eth_call using the abi of the uncalled
+    web3 contract function, matching the output of function_call.call()
+
+    Parameters
+    ----------
+    function_call : web3 contract function
+        uncalled web3 contract function the data was returned for.
+    return_data : bytes
+        raw return data.
+
+    Returns
+    -------
+    decoded output of the function call.
+
+    """
+    from web3._utils.abi import get_abi_output_types, map_abi_data
+    from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+    output_types = get_abi_output_types(function_call.abi)
+    output_data = function_call.w3.codec.decode(output_types, return_data)
+    normalized_data = map_abi_data(
+        BASE_RETURN_NORMALIZERS,
+        output_types,
+        output_data
+    )
+
+    if len(normalized_data) == 1:
+        return normalized_data[0]
+
+    return normalized_data
 
 
 contract_map = {
@@ -134,9 +256,23 @@ contract_map = {
 }
 
 
+def configure_logging():
+    """
+    Set the default logging format of the SDK. Does nothing if the root
+    logger already has handlers
+    """
+    logging.basicConfig(
+        format='{asctime} {levelname}: {message}',
+        datefmt='%m/%d/%Y %I:%M:%S %p',
+        style='{',
+        level=logging.INFO
+    )
+
+
 class ConfigManager:
 
     def __init__(self, chain: str):
+        configure_logging()
 
         self.chain = chain
         self.rpc = None
@@ -144,8 +280,21 @@ class ConfigManager:
         self.user_wallet_address = None
         self.private_key = None
         self.tg_bot_token = None
+        self.call_transport = "multicall"
+        self.multicall_batch_size = MULTICALL_BATCH_SIZE
+        self.rpc_batch_size = RPC_BATCH_SIZE
+        self.async_concurrency = ASYNC_CONCURRENCY
+        self.rpc_rate_limit = RPC_RATE_LIMIT
+        self.rpc_burst = RPC_BURST
+        self.rpc_max_retries = RPC_MAX_RETRIES
+        self.rpc_backoff = RPC_BACKOFF
+        self.rpc_max_backoff = RPC_MAX_BACKOFF
+        self.rpc_hedge_percentile = RPC_HEDGE_PERCENTILE
+        self.rpc_concurrency = RPC_CONCURRENCY
+        self.max_workers = EXECUTOR_MAX_WORKERS
 
     def set_config(self, filepath: str = os.path.join(base_dir, "config.yaml")):
+        import yaml
 
         with open(filepath, 'r') as file:
             config_file = yaml.safe_load(file)
@@ -155,6 +304,27 @@ class ConfigManager:
         self.set_wallet_address(config_file['user_wallet_address'])
         self.set_private_key(config_file['private_key'])
 
+        if 'call_transport' in config_file:
+            self.set_call_transport(config_file['call_transport'])
+
+        if 'rpc_rate_limit' in config_file:
+            self.set_rpc_rate_limit(config_file['rpc_rate_limit'])
+
+        if 'rpc_burst' in config_file:
+            self.set_rpc_burst(config_file['rpc_burst'])
+
+        if 'rpc_max_retries' in config_file:
+            self.set_rpc_max_retries(config_file['rpc_max_retries'])
+
+        if 'rpc_hedge_percentile' in config_file:
+            self.set_rpc_hedge_percentile(config_file['rpc_hedge_percentile'])
+
+        if 'rpc_concurrency' in config_file:
+            self.set_rpc_concurrency(config_file['rpc_concurrency'])
+
+        if 'max_workers' in config_file:
+            self.set_max_workers(config_file['max_workers'])
+
     def set_rpc(self, value):
         self.rpc = value
 
@@ -167,15 +337,75 @@ class ConfigManager:
     def set_private_key(self, value):
         self.private_key = value
 
+    def set_call_transport(self, value):
+        self.call_transport = value
+
+    def set_multicall_batch_size(self, value):
+        self.multicall_batch_size = value
+
+    def set_rpc_batch_size(self, value):
+        self.rpc_batch_size = value
+
+    def set_async_concurrency(self, value):
+        self.async_concurrency = value
+
+    def set_rpc_rate_limit(self, value):
+        self.rpc_rate_limit = value
+
+    def set_rpc_burst(self, value):
+        self.rpc_burst = value
+
+    def set_rpc_max_retries(self, value):
+        self.rpc_max_retries = value
+
+    def set_rpc_backoff(self, value, max_value=None):
+        self.rpc_backoff = value
+        if max_value is not None:
+            self.rpc_max_backoff = max_value
+
+    def set_rpc_hedge_percentile(self, value):
+        if value is not None and not 0 < value < 100:
+            raise Exception("Hedge percentile must be between 0 and 100!")
+        self.rpc_hedge_percentile = value
+
+    def set_rpc_concurrency(self, value):
+        self.rpc_concurrency = value
+
+    def set_max_workers(self, value):
+        self.max_workers = value
+
 
 def create_connection(config):
     """
-    Create a connection to the blockchain
+    Get the pooled connection to the blockchain for the config's chain and
+    rpc, sharing one keep-alive http session and provider per process. When
+    the rpc is a list of urls, requests are routed to the fastest healthy
+    one, see rpc.rpc_pool
+    """
+
+    rate_limiter.configure(config)
+
+    return connection_pool.get_connection(config.chain, config.rpc)
+
+
+def close_connections():
+    """
+    Close pooled http sessions and drop cached connections and contract
+    objects. They are recreated on next use.
     """
 
-    web3_obj = Web3(Web3.HTTPProvider(config.rpc))
+    connection_pool.close()
 
-    return web3_obj
+
+@lru_cache(maxsize=None)
+def _to_checksum_address(address: str):
+    from web3 import Web3
+
+    # Added to support older versions of web3.py for now
+    try:
+        return Web3.toChecksumAddress(address)
+    except AttributeError:
+        return Web3.to_checksum_address(address)
 
 
 def convert_to_checksum_address(config, address: str):
@@ -195,13 +425,28 @@ def convert_to_checksum_address(config, address: str):
         checksum formatted address.
 
     """
-    web3_obj = create_connection(config)
+    return _to_checksum_address(address)
 
-    # Added to support older versions of web3.py for now
-    try:
-        return web3_obj.toChecksumAddress(address)
-    except AttributeError:
-        return web3_obj.to_checksum_address(address)
+
+@lru_cache(maxsize=None)
+def load_abi(abi_path: str):
+    """
+    Read and parse an abi json file, relative to the package directory. Each
+    file is only parsed once per process
+
+    Parameters
+    ----------
+    abi_path : str
+        path of the abi relative to the package directory.
+
+    Returns
+    -------
+    list
+        parsed abi.
+
+    """
+    with open(os.path.join(package_dir, abi_path)) as f:
+        return json.load(f)
 
 
 def get_contract_object(web3_obj, contract_name: str, chain: str):
@@ -224,20 +469,11 @@ def get_contract_object(web3_obj, contract_name: str, chain: str):
         an instantied web3 contract object.
 
     """
-    contract_address = contract_map[chain][contract_name]["contract_address"]
-
-    contract_abi = json.load(
-        open(
-            os.path.join(
-                base_dir,
-                'gmx_python_sdk',
-                contract_map[chain][contract_name]["abi_path"]
-            )
-        )
-    )
-    return web3_obj.eth.contract(
-        address=contract_address,
-        abi=contract_abi
+    return connection_pool.get_contract(
+        web3_obj,
+        contract_map[chain][contract_name]["contract_address"],
+        contract_map[chain][contract_name]["abi_path"],
+        load_abi
     )
 
 
@@ -255,24 +491,18 @@ def get_token_balance_contract(config: str, contract_address: str):
     """
 
     web3_obj = create_connection(config)
-    contract_abi = json.load(
-        open(
-            os.path.join(
-                package_dir,
-                'contracts',
-                'balance_abi.json'
-            )
-        )
-    )
-    return web3_obj.eth.contract(
-        address=contract_address,
-        abi=contract_abi
+    return connection_pool.get_contract(
+        web3_obj,
+        contract_address,
+        os.path.join('contracts', 'balance_abi.json'),
+        load_abi
     )
 
 
 def get_tokens_address_dict(chain: str):
     """
-    Query the GMX infra api for to generate dictionary of tokens available on v2
+    Query the GMX infra api for to generate dictionary of tokens available on
+    v2. The list is cached on disk and revalidated hourly, see TokenRegistry
 
     Parameters
     ----------
@@ -285,30 +515,10 @@ def get_tokens_address_dict(chain: str):
         dictionary containing available tokens to trade on GMX.
 
     """
-    url = {
-        "arbitrum": "https://arbitrum-api.gmxinfra.io/tokens",
-        "avalanche": "https://avalanche-api.gmxinfra.io/tokens"
-    }
+    # Imported here as token_registry imports from this module
+    from .token_registry import get_token_registry
 
-    try:
-        response = requests.get(url[chain])
-
-        # Check if the request was successful (status code 200)
-        if response.status_code == 200:
-
-            # Parse the JSON response
-            token_infos = response.json()['tokens']
-        else:
-            print(f"Error: {response.status_code}")
-    except requests.RequestException as e:
-        print(f"Error: {e}")
-
-    token_address_dict = {}
-
-    for token_info in token_infos:
-        token_address_dict[token_info['address']] = token_info
-
-    return token_address_dict
+    return get_token_registry(chain).get_tokens()
 
 
 def get_reader_contract(config):
@@ -418,8 +628,7 @@ def create_signer(config: str):
     """
 
     private_key = config.private_key
-    rpc = config.rpc
-    web3_obj = create_connection(rpc)
+    web3_obj = create_connection(config)
 
     return web3_obj.eth.account.from_key(private_key)
 
@@ -442,6 +651,9 @@ def create_hash(data_type_list: list, data_value_list: list):
         encoded hashed key .
 
     """
+    from eth_abi import encode
+    from web3 import Web3
+
     byte_data = encode(data_type_list, data_value_list)
     return Web3.keccak(byte_data)
 
@@ -610,9 +822,40 @@ def find_dictionary_by_key_value(outer_dict: dict, key: str, value: str):
         required key to match.
 
     """
-    for inner_dict in outer_dict.values():
+    dictionary_key = find_key_by_key_value(outer_dict, key, value)
+    if dictionary_key is None:
+        return None
+    return outer_dict[dictionary_key]
+
+
+def find_key_by_key_value(outer_dict: dict, key: str, value: str):
+    """
+    For a given dictionary, find the key of the first value which matches a
+    set of keys
+
+    Parameters
+    ----------
+    outer_dict : dict
+        dictionary to filter through.
+    key : str
+        keys to search for.
+    value : str
+        required key to match.
+
+    Returns
+    -------
+    str
+        key of the matching value, or None if no value matches.
+
+    """
+    # Markets.info carries indexes of its markets, avoiding a scan
+    find_key = getattr(outer_dict, "find_key", None)
+    if find_key is not None:
+        return find_key(key, value)
+
+    for dictionary_key, inner_dict in outer_dict.items():
         if key in inner_dict and inner_dict[key] == value:
-            return inner_dict
+            return dictionary_key
     return None
 
 
@@ -710,48 +953,112 @@ def make_timestamped_dataframe(data):
         dataframe to add timestamp column to.
 
     """
+    import pandas as pd
+
     dataframe = pd.DataFrame(data, index=[0])
     dataframe['timestamp'] = datetime.now()
 
     return dataframe
 
 
-def save_csv_to_datastore(filename: str, dataframe):
+def make_timestamped_row(data: dict):
     """
-    For a given filename, save pandas dataframe as a csv to datastore
+    Copy a dictionary of stats into a csv row with a timestamp column
+
+    Parameters
+    ----------
+    data : dict
+        dictionary of data.
+
+    Returns
+    -------
+    dict
+        row with the values of data and a timestamp.
+
+    """
+    row = dict(data)
+    row['timestamp'] = str(datetime.now())
+
+    return row
+
+
+def append_csv_to_datastore(filename: str, row: dict):
+    """
+    Append a row to a csv in the datastore without reading its history. New
+    columns, eg a newly listed market, start a new segment of the file, see
+    storage.csv_store.CSVStore
 
     Parameters
     ----------
     filename : str
         name of file.
-    dataframe : pd.DataFrame
-        pandas dataframe
+    row : dict
+        values keyed by column name.
 
     """
+    from .storage.csv_store import get_csv_store
 
-    archive_filepath = os.path.join(
-        package_dir,
-        "data_store",
-        filename
-    )
+    get_csv_store(filename).append(row)
 
-    if os.path.exists(archive_filepath):
-        archive = pd.read_csv(
-            archive_filepath
-        )
 
-        dataframe = pd.concat(
-            [archive, dataframe]
-        )
+def save_parquet_to_datastore(chain: str, parameter: str, data: dict):
+    """
+    Add the output of a stat to the Parquet store of the datastore, see
+    storage.parquet_store.ParquetStore. Needs pyarrow
 
-    dataframe.to_csv(
-        os.path.join(
-            package_dir,
-            "data_store",
-            filename
-        ),
-        index=False
-    )
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+    parameter : str
+        name of the stat, eg open_interest.
+    data : dict
+        output of the stat.
+
+    """
+    from .storage.parquet_store import parquet_store
+
+    parquet_store.append(chain, parameter, data)
+
+
+def save_sqlite_to_datastore(chain: str, parameter: str, data: dict):
+    """
+    Insert the output of a stat into the SQLite store of the datastore, see
+    storage.sqlite_store.SQLiteStore
+
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+    parameter : str
+        name of the stat, eg open_interest.
+    data : dict
+        output of the stat.
+
+    """
+    from .storage.sqlite_store import sqlite_store
+
+    sqlite_store.append(chain, parameter, data)
+
+
+def save_csv_to_datastore(filename: str, dataframe):
+    """
+    For a given filename, append the rows of a pandas dataframe to a csv in
+    the datastore, see append_csv_to_datastore
+
+    Parameters
+    ----------
+    filename : str
+        name of file.
+    dataframe : pd.DataFrame
+        pandas dataframe
+
+    """
+    from .storage.csv_store import get_csv_store
+
+    store = get_csv_store(filename)
+    for row in dataframe.to_dict('records'):
+        store.append(row)
 
 
 def determine_swap_route(markets: dict, in_token: str, out_token: str):
@@ -833,6 +1140,24 @@ def check_web3_correct_version():
     return current_version > required_version, current_version
 
 
+@lru_cache(maxsize=None)
+def warn_if_newer_web3_version(message: str):
+    """
+    Log a warning once per message if the installed web3 is newer than the
+    version the SDK was developed with. Called on first use of the order
+    classes rather than at import, as the check imports web3 and packaging
+
+    Parameters
+    ----------
+    message : str
+        warning to log, formatted with the installed version.
+
+    """
+    is_newer_version, version = check_web3_correct_version()
+    if is_newer_version:
+        logging.warning(message.format(version))
+
+
 if __name__ == "__main__":
     arbitrum_config_object = ConfigManager(chain='arbitrum')
     arbitrum_config_object.set_config()
@@ -1,97 +1,234 @@
-from .gmx_utils import create_hash_string, create_hash, get_datastore_contract
-
-ACCOUNT_POSITION_LIST = create_hash_string("ACCOUNT_POSITION_LIST")
-CLAIMABLE_FEE_AMOUNT = create_hash_string("CLAIMABLE_FEE_AMOUNT")
-DECREASE_ORDER_GAS_LIMIT = create_hash_string("DECREASE_ORDER_GAS_LIMIT")
-DEPOSIT_GAS_LIMIT = create_hash_string("DEPOSIT_GAS_LIMIT")
-
-WITHDRAWAL_GAS_LIMIT = create_hash_string("WITHDRAWAL_GAS_LIMIT")
-
-EXECUTION_GAS_FEE_BASE_AMOUNT = create_hash_string("EXECUTION_GAS_FEE_BASE_AMOUNT")
-EXECUTION_GAS_FEE_MULTIPLIER_FACTOR = create_hash_string(
-    "EXECUTION_GAS_FEE_MULTIPLIER_FACTOR")
-INCREASE_ORDER_GAS_LIMIT = create_hash_string("INCREASE_ORDER_GAS_LIMIT")
-MAX_OPEN_INTEREST = create_hash_string("MAX_OPEN_INTEREST")
-MAX_POSITION_IMPACT_FACTOR_FOR_LIQUIDATIONS_KEY = create_hash_string(
-    "MAX_POSITION_IMPACT_FACTOR_FOR_LIQUIDATIONS"
-)
-MAX_PNL_FACTOR_FOR_TRADERS = create_hash_string("MAX_PNL_FACTOR_FOR_TRADERS")
-MAX_PNL_FACTOR_FOR_DEPOSITS = create_hash_string("MAX_PNL_FACTOR_FOR_DEPOSITS")
-MAX_PNL_FACTOR_FOR_WITHDRAWALS = create_hash_string("MAX_PNL_FACTOR_FOR_WITHDRAWALS")
-MIN_ADDITIONAL_GAS_FOR_EXECUTION = create_hash_string("MIN_ADDITIONAL_GAS_FOR_EXECUTION")
-MIN_COLLATERAL_USD = create_hash_string("MIN_COLLATERAL_USD")
-MIN_COLLATERAL_FACTOR_KEY = create_hash_string("MIN_COLLATERAL_FACTOR")
-MIN_POSITION_SIZE_USD = create_hash_string("MIN_POSITION_SIZE_USD")
-OPEN_INTEREST_IN_TOKENS = create_hash_string("OPEN_INTEREST_IN_TOKENS")
-OPEN_INTEREST = create_hash_string("OPEN_INTEREST")
-OPEN_INTEREST_RESERVE_FACTOR = create_hash_string(
-    "OPEN_INTEREST_RESERVE_FACTOR"
-)
-POOL_AMOUNT = create_hash_string("POOL_AMOUNT")
-RESERVE_FACTOR = create_hash_string("RESERVE_FACTOR")
-SINGLE_SWAP_GAS_LIMIT = create_hash_string("SINGLE_SWAP_GAS_LIMIT")
-SWAP_ORDER_GAS_LIMIT = create_hash_string("SWAP_ORDER_GAS_LIMIT")
-VIRTUAL_TOKEN_ID = create_hash_string("VIRTUAL_TOKEN_ID")
+from functools import lru_cache
+
+from eth_hash.auto import keccak
+from hexbytes import HexBytes
+
+# get_datastore_contract is imported from here by other modules
+from .gmx_utils import get_datastore_contract
+
+# Max number of derived keys held by the memo cache
+KEY_CACHE_SIZE = 4096
+
+# Datastore key constants, each the hash of its string. They are hashed on
+# first access through __getattr__ rather than at import
+_KEY_STRINGS = {
+    "ACCOUNT_POSITION_LIST": "ACCOUNT_POSITION_LIST",
+    "CLAIMABLE_FEE_AMOUNT": "CLAIMABLE_FEE_AMOUNT",
+    "DECREASE_ORDER_GAS_LIMIT": "DECREASE_ORDER_GAS_LIMIT",
+    "DEPOSIT_GAS_LIMIT": "DEPOSIT_GAS_LIMIT",
+    "WITHDRAWAL_GAS_LIMIT": "WITHDRAWAL_GAS_LIMIT",
+    "EXECUTION_GAS_FEE_BASE_AMOUNT": "EXECUTION_GAS_FEE_BASE_AMOUNT",
+    "EXECUTION_GAS_FEE_MULTIPLIER_FACTOR": (
+        "EXECUTION_GAS_FEE_MULTIPLIER_FACTOR"
+    ),
+    "INCREASE_ORDER_GAS_LIMIT": "INCREASE_ORDER_GAS_LIMIT",
+    "MARKET_LIST": "MARKET_LIST",
+    "MAX_OPEN_INTEREST": "MAX_OPEN_INTEREST",
+    "MAX_POSITION_IMPACT_FACTOR_FOR_LIQUIDATIONS_KEY": (
+        "MAX_POSITION_IMPACT_FACTOR_FOR_LIQUIDATIONS"
+    ),
+    "MAX_PNL_FACTOR_FOR_TRADERS": "MAX_PNL_FACTOR_FOR_TRADERS",
+    "MAX_PNL_FACTOR_FOR_DEPOSITS": "MAX_PNL_FACTOR_FOR_DEPOSITS",
+    "MAX_PNL_FACTOR_FOR_WITHDRAWALS": "MAX_PNL_FACTOR_FOR_WITHDRAWALS",
+    "MIN_ADDITIONAL_GAS_FOR_EXECUTION": "MIN_ADDITIONAL_GAS_FOR_EXECUTION",
+    "MIN_COLLATERAL_USD": "MIN_COLLATERAL_USD",
+    "MIN_COLLATERAL_FACTOR_KEY": "MIN_COLLATERAL_FACTOR",
+    "MIN_POSITION_SIZE_USD": "MIN_POSITION_SIZE_USD",
+    "OPEN_INTEREST_IN_TOKENS": "OPEN_INTEREST_IN_TOKENS",
+    "OPEN_INTEREST": "OPEN_INTEREST",
+    "OPEN_INTEREST_RESERVE_FACTOR": "OPEN_INTEREST_RESERVE_FACTOR",
+    "POOL_AMOUNT": "POOL_AMOUNT",
+    "RESERVE_FACTOR": "RESERVE_FACTOR",
+    "SINGLE_SWAP_GAS_LIMIT": "SINGLE_SWAP_GAS_LIMIT",
+    "SWAP_ORDER_GAS_LIMIT": "SWAP_ORDER_GAS_LIMIT",
+    "VIRTUAL_TOKEN_ID": "VIRTUAL_TOKEN_ID"
+}
+
+
+def _hash_string(string: str):
+    """
+    keccak of abi.encode(string), equal to create_hash_string
+    """
+    data = string.encode()
+    padding = b"\x00" * (-len(data) % 32)
+    return HexBytes(
+        keccak(
+            (32).to_bytes(32, "big")
+            + len(data).to_bytes(32, "big")
+            + data
+            + padding
+        )
+    )
 
 
-def accountPositionListKey(account):
-    return create_hash(
-        ["bytes32", "address"],
-        [ACCOUNT_POSITION_LIST, account]
+def _key(name: str):
+    try:
+        return _key_cache[name]
+    except KeyError:
+        value = _key_cache[name] = _hash_string(_KEY_STRINGS[name])
+        return value
+
+
+_key_cache = {}
+
+
+def __getattr__(name: str):
+    if name in _KEY_STRINGS:
+        return _key(name)
+
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
     )
 
 
+def __dir__():
+    return sorted(set(globals()) | set(_KEY_STRINGS))
+
+
+def _pack_word(value):
+    """
+    Pack a bytes32, address or bool as the 32 byte word abi.encode would
+    produce for it
+    """
+    if isinstance(value, bool):
+        return b"\x00" * 31 + (b"\x01" if value else b"\x00")
+
+    if isinstance(value, bytes):
+        if len(value) != 32:
+            raise ValueError("Expected 32 bytes, got {}".format(len(value)))
+        return value
+
+    address = bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+    if len(address) != 20:
+        raise ValueError("Invalid address: {}".format(value))
+    return b"\x00" * 12 + address
+
+
+def _hash_packed(*words):
+    return HexBytes(keccak(b"".join(words)))
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _hash_words(*values):
+    """
+    keccak of the abi encoding of a fixed layout of bytes32, address and
+    bool values, equal to create_hash with the matching type list
+    """
+    return _hash_packed(*[_pack_word(value) for value in values])
+
+
+def get_market_keys(markets: list):
+    """
+    Derive the datastore keys of each market in one pass. Addresses are
+    packed once per market and each key hashed straight from the packed
+    words
+
+    Parameters
+    ----------
+    markets : list
+        list of (market, long token, short token) address tuples.
+
+    Returns
+    -------
+    market_keys : dict
+        dictionary of keys for each market, keyed by market address.
+
+    """
+    true_word = _pack_word(True)
+    false_word = _pack_word(False)
+
+    market_keys = {}
+    for market, long_token, short_token in markets:
+        market_word = _pack_word(market)
+        long_word = _pack_word(long_token)
+        short_word = _pack_word(short_token)
+
+        market_keys[market] = {
+            "long_pool_amount": _hash_packed(
+                _key("POOL_AMOUNT"), market_word, long_word
+            ),
+            "short_pool_amount": _hash_packed(
+                _key("POOL_AMOUNT"), market_word, short_word
+            ),
+            "long_reserve_factor": _hash_packed(
+                _key("RESERVE_FACTOR"), market_word, true_word
+            ),
+            "short_reserve_factor": _hash_packed(
+                _key("RESERVE_FACTOR"), market_word, false_word
+            ),
+            "long_open_interest_reserve_factor": _hash_packed(
+                _key("OPEN_INTEREST_RESERVE_FACTOR"), market_word, true_word
+            ),
+            "short_open_interest_reserve_factor": _hash_packed(
+                _key("OPEN_INTEREST_RESERVE_FACTOR"), market_word, false_word
+            ),
+            "long_claimable_fee_amount": _hash_packed(
+                _key("CLAIMABLE_FEE_AMOUNT"), market_word, long_word
+            ),
+            "short_claimable_fee_amount": _hash_packed(
+                _key("CLAIMABLE_FEE_AMOUNT"), market_word, short_word
+            ),
+            "long_max_open_interest": _hash_packed(
+                _key("MAX_OPEN_INTEREST"), market_word, true_word
+            ),
+            "short_max_open_interest": _hash_packed(
+                _key("MAX_OPEN_INTEREST"), market_word, false_word
+            )
+        }
+
+    return market_keys
+
+
+def accountPositionListKey(account):
+    return _hash_words(_key("ACCOUNT_POSITION_LIST"), account)
+
+
 def claimable_fee_amount_key(market: str, token: str):
-    return create_hash(
-        ["bytes32", "address", "address"],
-        [CLAIMABLE_FEE_AMOUNT, market, token]
-    )
+    return _hash_words(_key("CLAIMABLE_FEE_AMOUNT"), market, token)
 
 
 def decrease_order_gas_limit_key():
-    return DECREASE_ORDER_GAS_LIMIT
+    return _key("DECREASE_ORDER_GAS_LIMIT")
 
 
 def deposit_gas_limit_key():
-    return DEPOSIT_GAS_LIMIT
+    return _key("DEPOSIT_GAS_LIMIT")
 
 
 def execution_gas_fee_base_amount_key():
-    return EXECUTION_GAS_FEE_BASE_AMOUNT
+    return _key("EXECUTION_GAS_FEE_BASE_AMOUNT")
 
 
 def execution_gas_fee_multiplier_key():
-    return EXECUTION_GAS_FEE_MULTIPLIER_FACTOR
+    return _key("EXECUTION_GAS_FEE_MULTIPLIER_FACTOR")
 
 
 def increase_order_gas_limit_key():
-    return INCREASE_ORDER_GAS_LIMIT
+    return _key("INCREASE_ORDER_GAS_LIMIT")
 
 
 def min_additional_gas_for_execution_key():
-    return MIN_ADDITIONAL_GAS_FOR_EXECUTION
+    return _key("MIN_ADDITIONAL_GAS_FOR_EXECUTION")
 
 
 def min_collateral():
-    return MIN_COLLATERAL_USD
+    return _key("MIN_COLLATERAL_USD")
 
 
 def min_collateral_factor_key(market):
-    return create_hash(["bytes32", "address"], [MIN_COLLATERAL_FACTOR_KEY, market])
+    return _hash_words(_key("MIN_COLLATERAL_FACTOR_KEY"), market)
 
 
 def max_open_interest_key(market: str,
                           is_long: bool):
 
-    return create_hash(
-        ["bytes32", "address", "bool"],
-        [MAX_OPEN_INTEREST, market, is_long]
-    )
+    return _hash_words(_key("MAX_OPEN_INTEREST"), market, is_long)
 
 
 def max_position_impact_factor_for_liquidations_key(market):
-    return create_hash(["bytes32", "address"],
-                       [MAX_POSITION_IMPACT_FACTOR_FOR_LIQUIDATIONS_KEY, market])
+    return _hash_words(
+        _key("MAX_POSITION_IMPACT_FACTOR_FOR_LIQUIDATIONS_KEY"), market
+    )
 
 
 def open_interest_in_tokens_key(
@@ -99,9 +236,8 @@ def open_interest_in_tokens_key(
     collateral_token: str,
     is_long: bool
 ):
-    return create_hash(
-        ["bytes32", "address", "address", "bool"],
-        [OPEN_INTEREST_IN_TOKENS, market, collateral_token, is_long]
+    return _hash_words(
+        _key("OPEN_INTEREST_IN_TOKENS"), market, collateral_token, is_long
     )
 
 
@@ -110,56 +246,44 @@ def open_interest_key(
     collateral_token: str,
     is_long: bool
 ):
-    return create_hash(
-        ["bytes32", "address", "address", "bool"],
-        [OPEN_INTEREST, market, collateral_token, is_long]
-    )
+    return _hash_words(_key("OPEN_INTEREST"), market, collateral_token, is_long)
 
 
 def open_interest_reserve_factor_key(
     market: str,
     is_long: bool
 ):
-    return create_hash(
-        ["bytes32", "address", "bool"],
-        [OPEN_INTEREST_RESERVE_FACTOR, market, is_long]
-    )
+    return _hash_words(_key("OPEN_INTEREST_RESERVE_FACTOR"), market, is_long)
 
 
 def pool_amount_key(
     market: str,
     token: str
 ):
-    return create_hash(
-        ["bytes32", "address", "address"],
-        [POOL_AMOUNT, market, token]
-    )
+    return _hash_words(_key("POOL_AMOUNT"), market, token)
 
 
 def reserve_factor_key(
     market: str,
     is_long: bool
 ):
-    return create_hash(
-        ["bytes32", "address", "bool"],
-        [RESERVE_FACTOR, market, is_long]
-    )
+    return _hash_words(_key("RESERVE_FACTOR"), market, is_long)
 
 
 def single_swap_gas_limit_key():
-    return SINGLE_SWAP_GAS_LIMIT
+    return _key("SINGLE_SWAP_GAS_LIMIT")
 
 
 def swap_order_gas_limit_key():
-    return SWAP_ORDER_GAS_LIMIT
+    return _key("SWAP_ORDER_GAS_LIMIT")
 
 
 def virtualTokenIdKey(token: str):
-    return create_hash(["bytes32", "address"], [VIRTUAL_TOKEN_ID, token])
+    return _hash_words(_key("VIRTUAL_TOKEN_ID"), token)
 
 
 def withdraw_gas_limit_key():
-    return WITHDRAWAL_GAS_LIMIT
+    return _key("WITHDRAWAL_GAS_LIMIT")
 
 
 if __name__ == "__main__":
@@ -10,15 +10,16 @@ from ..get.get_oracle_prices import OraclePrices
 from ..gmx_utils import convert_to_checksum_address, \
     get_exchange_router_contract, create_connection, \
     determine_swap_route, contract_map, get_estimated_deposit_amount_out, \
-    check_web3_correct_version
+    warn_if_newer_web3_version
 
 from ..approve_token_for_spend import check_if_approved
 
 from ..gas_utils import get_execution_fee
+from ..rpc.hedging import HedgedReads
 
-is_newer_version, version = check_web3_correct_version()
-if is_newer_version:
-    logging.warning(f"Current version of py web3 ({version}), may result in errors.")
+WEB3_VERSION_WARNING = (
+    "Current version of py web3 ({}), may result in errors."
+)
 
 
 class Deposit:
@@ -35,6 +36,8 @@ class Deposit:
         debug_mode: bool = False,
         execution_buffer: float = 1.1
     ) -> None:
+        warn_if_newer_web3_version(WEB3_VERSION_WARNING)
+
         self.config = config
         self.market_key = market_key
         self.initial_long_token = initial_long_token
@@ -52,9 +55,10 @@ class Deposit:
                 (self.execution_buffer - 1) * 100))
 
         if self.max_fee_per_gas is None:
-            block = create_connection(
-                config
-            ).eth.get_block('latest')
+            with HedgedReads(config):
+                block = create_connection(
+                    config
+                ).eth.get_block('latest')
             self.max_fee_per_gas = block['baseFeePerGas'] * 1.35
 
         self._exchange_router_contract_obj = get_exchange_router_contract(
@@ -175,11 +179,13 @@ class Deposit:
         min_market_tokens = self._estimate_deposit()
 
         # Giving a 10% buffer here
+        with HedgedReads(self.config):
+            gas_price = self._connection.eth.gas_price
         execution_fee = int(
             get_execution_fee(
                 self._gas_limits,
                 self._gas_limits_order_type,
-                self._connection.eth.gas_price
+                gas_price
             ) * self.execution_buffer
         )
 
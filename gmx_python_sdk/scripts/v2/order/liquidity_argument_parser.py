@@ -2,8 +2,9 @@ import numpy as np
 
 from ..get.get_markets import Markets
 from ..get.get_oracle_prices import OraclePrices
+from ..gmx_utils import find_key_by_key_value
 
-from ..gmx_utils import get_tokens_address_dict
+from ..token_registry import get_token_registry
 
 
 class LiquidityArgumentParser:
@@ -109,13 +110,9 @@ class LiquidityArgumentParser:
         except KeyError:
             raise Exception("Market Token Address and Symbol not provided!")
 
-        self.parameters_dict['market_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']
-            ),
-            token_symbol
-
-        )
+        self.parameters_dict['market_token_address'] = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(token_symbol)
 
     def _handle_missing_market_key(self):
         """
@@ -153,11 +150,9 @@ class LiquidityArgumentParser:
             return
 
         # search the known tokens for a contract address using the user supplied symbol
-        self.parameters_dict['long_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']),
-            long_token_symbol
-        )
+        self.parameters_dict['long_token_address'] = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(long_token_symbol)
 
     def _handle_missing_short_token_address(self):
         """
@@ -175,11 +170,9 @@ class LiquidityArgumentParser:
             return
 
         # search the known tokens for a contract address using the user supplied symbol
-        self.parameters_dict['short_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']),
-            short_token_symbol
-        )
+        self.parameters_dict['short_token_address'] = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(short_token_symbol)
 
     def _handle_missing_out_token_address(self):
         """
@@ -196,11 +189,9 @@ class LiquidityArgumentParser:
             raise Exception("Must provided either out token symbol or address")
 
         # search the known tokens for a contract address using the user supplied symbol
-        out_token_address = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']),
-            out_token_symbol
-        )
+        out_token_address = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(out_token_symbol)
 
         markets = Markets(self.config).get_available_markets()
         market = markets[self.parameters_dict['market_key']]
@@ -228,9 +219,9 @@ class LiquidityArgumentParser:
             [float(prices[self.parameters_dict["long_token_address"]]['maxPriceFull']),
              float(prices[self.parameters_dict["long_token_address"]]['minPriceFull'])]
         )
-        decimal = get_tokens_address_dict(
+        decimal = get_token_registry(
             self.parameters_dict['chain']
-        )[self.parameters_dict["long_token_address"]]['decimals']
+        ).get_decimals(self.parameters_dict["long_token_address"])
         oracle_factor = decimal - 30
 
         price = price * 10 ** oracle_factor
@@ -253,9 +244,9 @@ class LiquidityArgumentParser:
             [float(prices[self.parameters_dict["short_token_address"]]['maxPriceFull']),
              float(prices[self.parameters_dict["short_token_address"]]['minPriceFull'])]
         )
-        decimal = get_tokens_address_dict(
+        decimal = get_token_registry(
             self.parameters_dict['chain']
-        )[self.parameters_dict["short_token_address"]]['decimals']
+        ).get_decimals(self.parameters_dict["short_token_address"])
         oracle_factor = decimal - 30
 
         price = price * 10 ** oracle_factor
@@ -298,7 +289,6 @@ class LiquidityArgumentParser:
 
         """
 
-        for key, value in input_dict.items():
-            if value.get('index_token_address') == index_token_address:
-                return key
-        return None
+        return find_key_by_key_value(
+            input_dict, 'index_token_address', index_token_address
+        )
@@ -10,15 +10,16 @@ from ..gmx_utils import (
     get_exchange_router_contract, create_connection, contract_map,
     PRECISION, get_execution_price_and_price_impact, order_type as order_types,
     decrease_position_swap_type as decrease_position_swap_types,
-    convert_to_checksum_address, check_web3_correct_version
+    convert_to_checksum_address, warn_if_newer_web3_version
 )
 from ..gas_utils import get_execution_fee
+from ..rpc.hedging import HedgedReads
 from ..approve_token_for_spend import check_if_approved
 
-is_newer_version, version = check_web3_correct_version()
-if is_newer_version:
-    logging.warning(
-        f"GMX Python SDK was developed with py web3 version 6.10.0. Current version of py web3 ({version}), may result in errors.")
+WEB3_VERSION_WARNING = (
+    "GMX Python SDK was developed with py web3 version 6.10.0. Current "
+    "version of py web3 ({}), may result in errors."
+)
 
 
 class Order:
@@ -31,6 +32,8 @@ class Order:
         debug_mode: bool = False, execution_buffer: float = 1.3
     ) -> None:
 
+        warn_if_newer_web3_version(WEB3_VERSION_WARNING)
+
         self.config = config
         self.market_key = market_key
         self.collateral_address = collateral_address
@@ -50,9 +53,10 @@ class Order:
                 (self.execution_buffer - 1) * 100))
 
         if self.max_fee_per_gas is None:
-            block = create_connection(
-                config
-            ).eth.get_block('latest')
+            with HedgedReads(config):
+                block = create_connection(
+                    config
+                ).eth.get_block('latest')
             self.max_fee_per_gas = block['baseFeePerGas'] * 1.35
 
         self._exchange_router_contract_obj = get_exchange_router_contract(
@@ -193,7 +197,8 @@ class Order:
         """
 
         self.determine_gas_limits()
-        gas_price = self._connection.eth.gas_price
+        with HedgedReads(self.config):
+            gas_price = self._connection.eth.gas_price
         execution_fee = int(
             get_execution_fee(
                 self._gas_limits,
@@ -305,11 +310,14 @@ class Order:
             acceptable_price = 0
             gmx_market_address = "0x0000000000000000000000000000000000000000"
 
-        execution_price_and_price_impact_dict = get_execution_price_and_price_impact(
-            self.config,
-            execution_price_parameters,
-            decimals
-        )
+        with HedgedReads(self.config):
+            execution_price_and_price_impact_dict = (
+                get_execution_price_and_price_impact(
+                    self.config,
+                    execution_price_parameters,
+                    decimals
+                )
+            )
         self.log.info(
             "Execution price: ${:.4f}".format(
                 execution_price_and_price_impact_dict['execution_price']
@@ -2,7 +2,8 @@ import numpy as np
 
 from ..get.get_oracle_prices import OraclePrices
 from ..get.get_markets import Markets
-from ..gmx_utils import get_tokens_address_dict, determine_swap_route
+from ..gmx_utils import determine_swap_route, find_key_by_key_value
+from ..token_registry import get_token_registry
 
 
 class OrderArgumentParser:
@@ -123,13 +124,9 @@ class OrderArgumentParser:
         except KeyError:
             raise Exception("Index Token Address and Symbol not provided!")
 
-        self.parameters_dict['index_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']
-            ),
-            token_symbol
-
-        )
+        self.parameters_dict['index_token_address'] = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(token_symbol)
 
     def _handle_missing_market_key(self):
         """
@@ -167,11 +164,9 @@ class OrderArgumentParser:
             raise Exception("Start Token Address and Symbol not provided!")
 
         # search the known tokens for a contract address using the user supplied symbol
-        self.parameters_dict['start_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']),
-            start_token_symbol
-        )
+        self.parameters_dict['start_token_address'] = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(start_token_symbol)
 
     def _handle_missing_out_token_address(self):
         """
@@ -185,11 +180,9 @@ class OrderArgumentParser:
             raise Exception("Out Token Address and Symbol not provided!")
 
         # search the known tokens for a contract address using the user supplied symbol
-        self.parameters_dict['out_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']),
-            start_token_symbol
-        )
+        self.parameters_dict['out_token_address'] = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(start_token_symbol)
 
     def _handle_missing_collateral_address(self):
         """
@@ -210,11 +203,9 @@ class OrderArgumentParser:
             raise Exception("Collateral Token Address and Symbol not provided!")
 
         # search the known tokens for a contract address using the user supplied symbol
-        collateral_address = self.find_key_by_symbol(
-            get_tokens_address_dict(
-                self.parameters_dict['chain']),
-            collateral_token_symbol
-        )
+        collateral_address = get_token_registry(
+            self.parameters_dict['chain']
+        ).get_address_by_symbol(collateral_token_symbol)
 
         # check if the collateral token address can be used in the requested market
         if self._check_if_valid_collateral_for_market(collateral_address) and not self.is_swap:
@@ -331,10 +322,9 @@ class OrderArgumentParser:
 
         """
 
-        for key, value in input_dict.items():
-            if value.get('index_token_address') == index_token_address:
-                return key
-        return None
+        return find_key_by_key_value(
+            input_dict, 'index_token_address', index_token_address
+        )
 
     def calculate_missing_position_size_info_keys(self):
         """
@@ -393,9 +383,9 @@ class OrderArgumentParser:
             [float(prices[self.parameters_dict["start_token_address"]]['maxPriceFull']),
              float(prices[self.parameters_dict["start_token_address"]]['minPriceFull'])]
         )
-        oracle_factor = get_tokens_address_dict(
+        oracle_factor = get_token_registry(
             self.parameters_dict['chain']
-        )[self.parameters_dict["start_token_address"]]['decimals'] - 30
+        ).get_decimals(self.parameters_dict["start_token_address"]) - 30
 
         price = price * 10 ** oracle_factor
 
@@ -417,9 +407,9 @@ class OrderArgumentParser:
             [float(prices[self.parameters_dict["start_token_address"]]['maxPriceFull']),
              float(prices[self.parameters_dict["start_token_address"]]['minPriceFull'])]
         )
-        oracle_factor = get_tokens_address_dict(
+        oracle_factor = get_token_registry(
             self.parameters_dict['chain']
-        )[self.parameters_dict["start_token_address"]]['decimals'] - 30
+        ).get_decimals(self.parameters_dict["start_token_address"]) - 30
 
         price = price * 10 ** oracle_factor
 
@@ -439,9 +429,9 @@ class OrderArgumentParser:
                 self.parameters_dict["size_delta_usd"] * 10**30)
 
         # Each token has its a specific decimal factor that needs to be applied
-        decimal = get_tokens_address_dict(
+        decimal = get_token_registry(
             self.parameters_dict['chain']
-        )[self.parameters_dict["start_token_address"]]['decimals']
+        ).get_decimals(self.parameters_dict["start_token_address"])
         self.parameters_dict["initial_collateral_delta"] = int(
             self.parameters_dict["initial_collateral_delta"] * 10**decimal
         )
@@ -0,0 +1,546 @@
+import asyncio
+import logging
+
+from hexbytes import HexBytes
+
+from .call_cache import call_cache
+from .rate_limiter import (
+    check_http_status, check_rpc_response, get_rate_limited_ids,
+    rate_limiter
+)
+from .rpc_pool import rpc_pools
+from .single_flight import COALESCED_METHODS, single_flight
+from .snapshot import get_pinned_block
+from ..gmx_utils import ASYNC_CONCURRENCY, decode_contract_function_output
+
+
+class AsyncSessionPool:
+    """
+    Registry of aiohttp sessions and concurrency semaphores, one session
+    and one semaphore per concurrency limit for each running event loop.
+    Every async fetcher on a loop shares them, so many chains and fetchers
+    running on one loop with the same limit are bounded by one semaphore.
+    Entries of loops that have been closed are dropped
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._semaphores = {}
+
+    def get_session(self):
+        """
+        Get the http session of the running event loop
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            shared http session.
+
+        """
+        import aiohttp
+
+        from .http_provider import RPC_REQUEST_TIMEOUT
+
+        loop = asyncio.get_running_loop()
+        self._drop_closed_loops()
+        session = self._sessions.get(loop)
+
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0),
+                timeout=aiohttp.ClientTimeout(total=RPC_REQUEST_TIMEOUT)
+            )
+            self._sessions[loop] = session
+
+        return session
+
+    def get_semaphore(self, concurrency: int = ASYNC_CONCURRENCY):
+        """
+        Get the semaphore bounding requests in flight on the running event
+        loop with the given concurrency
+
+        Parameters
+        ----------
+        concurrency : int, optional
+            max number of requests in flight. The default is
+            ASYNC_CONCURRENCY.
+
+        Returns
+        -------
+        asyncio.Semaphore
+            shared semaphore.
+
+        """
+        loop = asyncio.get_running_loop()
+        self._drop_closed_loops()
+        semaphores = self._semaphores.setdefault(loop, {})
+
+        if concurrency not in semaphores:
+            semaphores[concurrency] = asyncio.Semaphore(concurrency)
+
+        return semaphores[concurrency]
+
+    async def close(self):
+        """
+        Close the session of the running event loop. Call before the loop
+        shuts down
+        """
+        loop = asyncio.get_running_loop()
+        self._semaphores.pop(loop, None)
+        session = self._sessions.pop(loop, None)
+
+        if session is not None:
+            await session.close()
+
+    def _drop_closed_loops(self):
+        # Each asyncio.run uses a new loop, forget the ones it closed
+        for registry in (self._sessions, self._semaphores):
+            for loop in [loop for loop in registry if loop.is_closed()]:
+                del registry[loop]
+
+
+async_session_pool = AsyncSessionPool()
+
+
+async def post_json(rpc, payload, concurrency: int = ASYNC_CONCURRENCY):
+    """
+    POST a JSON-RPC payload on the shared session of the running loop, to
+    the best endpoint of the rpc pool and through its rate limiter.
+    Identical read payloads posted concurrently share one request
+
+    Parameters
+    ----------
+    rpc : str or list
+        rpc url or urls, see rpc_pool.RPCPool.
+    payload : dict or list
+        JSON body.
+    concurrency : int, optional
+        max number of requests in flight. The default is ASYNC_CONCURRENCY.
+
+    Returns
+    -------
+    dict or list
+        decoded JSON response.
+
+    """
+    import aiohttp
+
+    async def send(url: str):
+        async with async_session_pool.get_semaphore(concurrency):
+            async with async_session_pool.get_session().post(
+                url,
+                json=payload
+            ) as response:
+                check_http_status(response.status, response.headers)
+                response.raise_for_status()
+                output = await response.json(content_type=None)
+
+        check_rpc_response(output)
+
+        return output
+
+    pool = rpc_pools.get_pool(rpc)
+
+    def post():
+        return pool.call_async(
+            send,
+            (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        )
+
+    requests = payload if isinstance(payload, list) else [payload]
+    if all(request['method'] in COALESCED_METHODS for request in requests):
+        return await single_flight.do_async(
+            (pool.urls, repr(payload)),
+            post
+        )
+
+    return await post()
+
+
+async def get_json(url: str, concurrency: int = ASYNC_CONCURRENCY):
+    """
+    GET a JSON document on the shared session of the running loop
+
+    Parameters
+    ----------
+    url : str
+        url to get.
+    concurrency : int, optional
+        max number of requests in flight. The default is ASYNC_CONCURRENCY.
+
+    Returns
+    -------
+    dict or list
+        decoded JSON response.
+
+    """
+    async with async_session_pool.get_semaphore(concurrency):
+        async with async_session_pool.get_session().get(url) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+
+async def get_block_number_async(config):
+    """
+    Get the latest block number
+
+    Parameters
+    ----------
+    config : ConfigManager
+        config holding the rpc.
+
+    Returns
+    -------
+    int
+        block number.
+
+    """
+    rate_limiter.configure(config)
+
+    response = await post_json(
+        config.rpc,
+        {"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []},
+        config.async_concurrency
+    )
+
+    if "error" in response:
+        raise Exception(
+            "eth_blockNumber failed: {}".format(response['error'])
+        )
+
+    return int(response['result'], 16)
+
+
+async def execute_async(function_calls: list, config, block=None):
+    """
+    Async counterpart of execute_threading. Executes a list of uncalled web3
+    contract functions over the shared aiohttp session using the call
+    transport selected on the config:
+
+    - "multicall": packed into Multicall3 aggregate3 batches (default)
+    - "batch": sent as JSON-RPC batch arrays of eth_call
+    - "threading": one eth_call per function
+
+    Requests run concurrently, bounded by config.async_concurrency
+
+    Parameters
+    ----------
+    function_calls : list
+        list of uncalled web3 contract functions.
+    config : ConfigManager
+        config object holding the rpc, transport and batch sizes.
+    block : int, optional
+        block number to read at. The default is None, using the pinned
+        block or latest.
+
+    Returns
+    -------
+    list
+        decoded outputs in the same order as function_calls, None where an
+        individual call reverted.
+
+    """
+    rate_limiter.configure(config)
+
+    if block is None:
+        block = get_pinned_block()
+    block_identifier = "latest" if block is None else hex(block)
+
+    results = [None] * len(function_calls)
+    cache_keys = [None] * len(function_calls)
+    pending = []
+    for index, call in enumerate(function_calls):
+        call_data = call._encode_transaction_data()
+
+        cache_keys[index] = call_cache.make_key(
+            config.chain,
+            call.address,
+            call_data,
+            "latest" if block is None else block
+        )
+        cached = call_cache.get(cache_keys[index])
+        if cached is not None:
+            results[index] = decode_contract_function_output(
+                call,
+                HexBytes(cached)
+            )
+            continue
+
+        pending.append((index, call, call_data))
+
+    if config.call_transport == "multicall":
+        batch_size = config.multicall_batch_size
+        execute_batch = _execute_multicall_batch
+    elif config.call_transport == "batch":
+        batch_size = config.rpc_batch_size
+        execute_batch = _execute_json_rpc_batch
+    elif config.call_transport == "threading":
+        batch_size = 1
+        execute_batch = _execute_json_rpc_batch
+    else:
+        raise Exception(
+            'Unknown call transport "{}"!'.format(config.call_transport)
+        )
+
+    batches = [
+        pending[start:start + batch_size]
+        for start in range(0, len(pending), batch_size)
+    ]
+    batch_results = await asyncio.gather(
+        *[
+            execute_batch(batch, config, block_identifier)
+            for batch in batches
+        ]
+    )
+
+    for batch, raw_results in zip(batches, batch_results):
+        for (index, call, _), return_data in zip(batch, raw_results):
+            if return_data is None:
+                continue
+
+            call_cache.put(
+                cache_keys[index],
+                "0x" + bytes(return_data).hex()
+            )
+            results[index] = decode_contract_function_output(
+                call,
+                return_data
+            )
+
+    return results
+
+
+async def _eth_call(
+    config, to: str, data: str, block_identifier: str, request_id: int = 0
+):
+    """
+    Make a single eth_call
+
+    Returns
+    -------
+    dict
+        JSON-RPC response.
+
+    """
+    return await post_json(
+        config.rpc,
+        _make_eth_call_payload(to, data, block_identifier, request_id),
+        config.async_concurrency
+    )
+
+
+def _make_eth_call_payload(
+    to: str, data: str, block_identifier: str, request_id: int
+):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "eth_call",
+        "params": [{"to": to, "data": data}, block_identifier]
+    }
+
+
+async def _execute_multicall_batch(
+    batch: list, config, block_identifier: str
+):
+    """
+    Execute a single aggregate3 call, splitting the batch in half if the
+    node rejects it
+
+    Parameters
+    ----------
+    batch : list
+        list of (index, uncalled web3 contract function, calldata).
+    config : ConfigManager
+        config holding the rpc.
+    block_identifier : str
+        hex block number or latest.
+
+    Returns
+    -------
+    list
+        raw return data of each call, None where it reverted.
+
+    """
+    from .multicall import get_multicall_contract
+
+    multicall = get_multicall_contract(batch[0][1].w3)
+    aggregate = multicall.functions.aggregate3(
+        [(call.address, True, call_data) for _, call, call_data in batch]
+    )
+
+    response = await _eth_call(
+        config,
+        aggregate.address,
+        aggregate._encode_transaction_data(),
+        block_identifier
+    )
+
+    if "error" in response:
+        if len(batch) == 1:
+            raise Exception(
+                "Multicall failed: {}".format(response['error'])
+            )
+
+        logging.warning(
+            "Multicall batch of {} failed, splitting: {}".format(
+                len(batch), response['error']
+            )
+        )
+        midpoint = len(batch) // 2
+        first, second = await asyncio.gather(
+            _execute_multicall_batch(
+                batch[:midpoint], config, block_identifier
+            ),
+            _execute_multicall_batch(
+                batch[midpoint:], config, block_identifier
+            )
+        )
+        return first + second
+
+    raw_results = decode_contract_function_output(
+        aggregate,
+        HexBytes(response['result'])
+    )
+
+    outputs = []
+    for (_, call, _), (success, return_data) in zip(batch, raw_results):
+        if not success:
+            logging.warning(
+                "Multicall: call to {} reverted".format(call.fn_name)
+            )
+            return_data = None
+        outputs.append(return_data)
+
+    return outputs
+
+
+async def _execute_json_rpc_batch(
+    batch: list, config, block_identifier: str, retries: int = None
+):
+    """
+    Send a batch of eth_calls as one JSON-RPC batch POST, or as a single
+    request for a batch of one. Calls the provider throttled on their own
+    are resent
+
+    Parameters
+    ----------
+    batch : list
+        list of (index, uncalled web3 contract function, calldata).
+    config : ConfigManager
+        config holding the rpc.
+    block_identifier : str
+        hex block number or latest.
+    retries : int, optional
+        times throttled calls are resent. The default is None, using
+        BATCH_RATE_LIMIT_RETRIES.
+
+    Returns
+    -------
+    list
+        raw return data of each call, None where it failed.
+
+    """
+    payloads = [
+        _make_eth_call_payload(
+            call.address, call_data, block_identifier, request_id
+        )
+        for request_id, (_, call, call_data) in enumerate(batch)
+    ]
+
+    import aiohttp
+    from .batch_rpc import (
+        BATCH_RATE_LIMIT_RETRIES, BATCH_TOO_LARGE_STATUS_CODES
+    )
+
+    if retries is None:
+        retries = BATCH_RATE_LIMIT_RETRIES
+
+    try:
+        if len(payloads) == 1:
+            output = [
+                await post_json(
+                    config.rpc,
+                    payloads[0],
+                    config.async_concurrency
+                )
+            ]
+        else:
+            output = await post_json(
+                config.rpc,
+                payloads,
+                config.async_concurrency
+            )
+    except aiohttp.ClientResponseError as e:
+        if (
+            len(batch) == 1
+            or e.status not in BATCH_TOO_LARGE_STATUS_CODES
+        ):
+            raise
+        output = None
+
+    responses = {}
+    if isinstance(output, list):
+        responses = {
+            item['id']: item for item in output
+            if item.get('id') is not None
+        }
+
+    if len(responses) < len(payloads):
+        # The provider capped the batch, split it until it is accepted
+        if len(batch) == 1:
+            raise Exception("eth_call failed: {}".format(output))
+
+        midpoint = len(batch) // 2
+        logging.warning(
+            "RPC rejected batch, reducing batch size to {}".format(midpoint)
+        )
+        first, second = await asyncio.gather(
+            _execute_json_rpc_batch(
+                batch[:midpoint], config, block_identifier, retries
+            ),
+            _execute_json_rpc_batch(
+                batch[midpoint:], config, block_identifier, retries
+            )
+        )
+        return first + second
+
+    throttled_ids = get_rate_limited_ids(responses)
+    resent = {}
+    if throttled_ids and retries > 0:
+        logging.warning(
+            "RPC throttled {} requests of a batch, resending them".format(
+                len(throttled_ids)
+            )
+        )
+        resent = dict(
+            zip(
+                throttled_ids,
+                await _execute_json_rpc_batch(
+                    [batch[request_id] for request_id in throttled_ids],
+                    config,
+                    block_identifier,
+                    retries - 1
+                )
+            )
+        )
+
+    outputs = []
+    for request_id, (_, call, _) in enumerate(batch):
+        if request_id in resent:
+            outputs.append(resent[request_id])
+            continue
+
+        response = responses[request_id]
+        if "error" in response:
+            logging.warning(
+                "Batch RPC: call to {} failed: {}".format(
+                    call.fn_name, response['error']
+                )
+            )
+            outputs.append(None)
+            continue
+
+        outputs.append(HexBytes(response['result']))
+
+    return outputs
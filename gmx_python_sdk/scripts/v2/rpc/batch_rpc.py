@@ -0,0 +1,214 @@
+import logging
+
+import requests
+from hexbytes import HexBytes
+
+from .call_cache import call_cache
+from .http_provider import RETRY_ERRORS
+from .connection_pool import connection_pool
+from .rate_limiter import (
+    check_http_status, check_rpc_response, get_rate_limited_ids
+)
+from .rpc_pool import rpc_pools
+from .single_flight import single_flight
+from .snapshot import get_pinned_block
+from ..gmx_utils import decode_contract_function_output
+
+# HTTP status codes providers use when a batch is larger than they allow
+BATCH_TOO_LARGE_STATUS_CODES = (400, 413)
+
+# Times the requests of a batch throttled on their own are resent
+BATCH_RATE_LIMIT_RETRIES = 3
+
+
+class BatchSizeExceeded(Exception):
+    pass
+
+
+def execute_batch_rpc(
+    function_calls: list, rpc, batch_size: int = 50,
+    session: requests.Session = None, chain: str = None
+):
+    """
+    Send a list of uncalled web3 contract functions as JSON-RPC batch POSTs
+    of eth_call requests, matching each response back to its call by id.
+    Identical batches posted concurrently share one request
+
+    Parameters
+    ----------
+    function_calls : list
+        list of uncalled web3 contract functions.
+    rpc : str or list
+        rpc url or urls to post the batches to, see rpc_pool.RPCPool.
+    batch_size : int, optional
+        max number of eth_calls per POST. Halved automatically when the
+        provider caps the batch size. The default is 50.
+    session : requests.Session, optional
+        http session to reuse. The default is None, using the pooled
+        session of each url.
+    chain : str, optional
+        chain the calls are made on, used to serve repeated calls from the
+        call cache. The default is None which bypasses the cache.
+
+    Returns
+    -------
+    results : list
+        decoded outputs in the same order as function_calls, None where an
+        individual call reverted.
+
+    """
+    block_identifier = "latest"
+    if get_pinned_block() is not None:
+        block_identifier = hex(get_pinned_block())
+
+    results = [None] * len(function_calls)
+    cache_keys = [None] * len(function_calls)
+    payloads = []
+    for request_id, call in enumerate(function_calls):
+        call_data = call._encode_transaction_data()
+
+        if chain is not None:
+            cache_keys[request_id] = call_cache.make_key(
+                chain, call.address, call_data, block_identifier
+            )
+            cached = call_cache.get(cache_keys[request_id])
+            if cached is not None:
+                results[request_id] = decode_contract_function_output(
+                    call,
+                    HexBytes(cached)
+                )
+                continue
+
+        payloads.append(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "eth_call",
+                "params": [
+                    {
+                        "to": call.address,
+                        "data": call_data
+                    },
+                    block_identifier
+                ]
+            }
+        )
+
+    pool = rpc_pools.get_pool(rpc)
+
+    def post_chunk(url: str):
+        return _post_batch(
+            session or connection_pool.get_session(url),
+            url,
+            chunk
+        )
+
+    responses = {}
+    for attempt in range(BATCH_RATE_LIMIT_RETRIES + 1):
+        start = 0
+        while start < len(payloads):
+            chunk = payloads[start:start + batch_size]
+            try:
+                responses.update(
+                    single_flight.do(
+                        (pool.urls, repr(chunk)),
+                        lambda: pool.call(post_chunk, RETRY_ERRORS)
+                    )
+                )
+            except BatchSizeExceeded:
+                if batch_size == 1:
+                    raise
+                batch_size = max(1, batch_size // 2)
+                logging.warning(
+                    "RPC rejected batch, reducing batch size to {}".format(
+                        batch_size
+                    )
+                )
+                continue
+
+            start += len(chunk)
+
+        # Resend only the requests the provider throttled on their own
+        throttled_ids = set(get_rate_limited_ids(responses))
+        if not throttled_ids or attempt == BATCH_RATE_LIMIT_RETRIES:
+            break
+
+        logging.warning(
+            "RPC throttled {} requests of a batch, resending them".format(
+                len(throttled_ids)
+            )
+        )
+        payloads = [
+            payload for payload in payloads if payload['id'] in throttled_ids
+        ]
+
+    for request_id, response in responses.items():
+        call = function_calls[request_id]
+
+        if "error" in response:
+            logging.warning(
+                "Batch RPC: call to {} failed: {}".format(
+                    call.fn_name, response['error']
+                )
+            )
+            continue
+
+        call_cache.put(cache_keys[request_id], response['result'])
+        results[request_id] = decode_contract_function_output(
+            call,
+            HexBytes(response['result'])
+        )
+
+    return results
+
+
+def _post_batch(session, rpc: str, payloads: list):
+    """
+    POST a single JSON-RPC batch and index the responses by id
+
+    Parameters
+    ----------
+    session : requests.Session
+        http session.
+    rpc : str
+        rpc url.
+    payloads : list
+        list of JSON-RPC request dictionaries.
+
+    Raises
+    ------
+    BatchSizeExceeded
+        the provider refused the batch or answered only part of it.
+    RateLimited
+        the provider throttled the batch.
+
+    Returns
+    -------
+    dict
+        JSON-RPC responses keyed by request id.
+
+    """
+    response = session.post(rpc, json=payloads)
+
+    if response.status_code in BATCH_TOO_LARGE_STATUS_CODES:
+        raise BatchSizeExceeded(response.text)
+    check_http_status(response.status_code, response.headers)
+    response.raise_for_status()
+
+    output = response.json()
+    check_rpc_response(output)
+
+    # Providers which cap batches reply with a single error object instead
+    # of an array, or silently drop the requests over their limit
+    if not isinstance(output, list):
+        raise BatchSizeExceeded(output.get('error'))
+
+    responses = {
+        item['id']: item for item in output if item.get('id') is not None
+    }
+    if len(responses) < len(payloads):
+        raise BatchSizeExceeded(
+            "{} of {} requests answered".format(len(responses), len(payloads))
+        )
+
+    return responses
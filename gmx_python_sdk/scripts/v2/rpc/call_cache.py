@@ -0,0 +1,214 @@
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class CallCache:
+    """
+    Bounded LRU cache of raw eth_call results keyed by
+    (chain, to, calldata, block). Reads pinned to a block number never go
+    stale and are only dropped by LRU eviction, while "latest" reads expire
+    after latest_ttl seconds
+    """
+
+    def __init__(self, max_size: int = 4096, latest_ttl: float = 2.0):
+        self.max_size = max_size
+        self.latest_ttl = latest_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def configure(self, max_size: int = None, latest_ttl: float = None):
+        """
+        Update the cache limits, pass 0 for either to disable that part of
+        the cache
+
+        Parameters
+        ----------
+        max_size : int, optional
+            max number of results held. The default is None.
+        latest_ttl : float, optional
+            seconds a "latest" read stays valid. The default is None.
+
+        """
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if latest_ttl is not None:
+                self.latest_ttl = latest_ttl
+
+            self._evict()
+
+    @staticmethod
+    def make_key(chain: str, to: str, data: str, block):
+        """
+        Build the cache key for an eth_call
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        to : str
+            address called.
+        data : str
+            hex encoded calldata.
+        block : str or int
+            "latest" or the block number the call is made at.
+
+        Returns
+        -------
+        tuple
+            cache key, or None if the call should not be cached.
+
+        """
+        if isinstance(block, str) and block != "latest":
+            try:
+                block = int(block, 16)
+            except ValueError:
+                # pending, safe, finalized etc. are not cached
+                return None
+
+        return (chain, to.lower(), data.lower(), block)
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Parameters
+        ----------
+        key : tuple
+            key from make_key.
+
+        Returns
+        -------
+        str
+            hex encoded return data, or None on a miss.
+
+        """
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                result, expires_at = entry
+
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result: str):
+        """
+        Store a result
+
+        Parameters
+        ----------
+        key : tuple
+            key from make_key.
+        result : str
+            hex encoded return data.
+
+        """
+        if key is None or self.max_size == 0:
+            return
+
+        expires_at = None
+        if key[3] == "latest":
+            if self.latest_ttl <= 0:
+                return
+            expires_at = time.monotonic() + self.latest_ttl
+
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def stats(self):
+        """
+        Get the hit/miss counters
+
+        Returns
+        -------
+        dict
+            hits, misses and current size of the cache.
+
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries)
+            }
+
+    def clear(self):
+        """
+        Drop all cached results and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def middleware(self, chain: str):
+        """
+        Build a web3 middleware serving eth_call requests from the cache for
+        a connection to the given chain
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+
+        """
+        def call_cache_middleware(make_request, w3):
+
+            def middleware(method, params):
+                if method != "eth_call" or not self._is_cacheable(params):
+                    return make_request(method, params)
+
+                key = self.make_key(
+                    chain,
+                    params[0]['to'],
+                    params[0]['data'],
+                    params[1]
+                )
+                result = self.get(key)
+                if result is not None:
+                    return {"jsonrpc": "2.0", "id": 0, "result": result}
+
+                response = make_request(method, params)
+                if "result" in response and "error" not in response:
+                    self.put(key, response['result'])
+
+                return response
+
+            return middleware
+
+        return call_cache_middleware
+
+    @staticmethod
+    def _is_cacheable(params):
+        # Only plain calls are cached, a sender or state override can change
+        # the result
+        return (
+            len(params) == 2
+            and isinstance(params[0], dict)
+            and set(params[0]) == {"to", "data"}
+        )
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+call_cache = CallCache()
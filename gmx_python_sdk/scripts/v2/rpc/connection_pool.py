@@ -0,0 +1,148 @@
+import threading
+import weakref
+
+from .call_cache import call_cache
+from .snapshot import block_pin_middleware
+
+
+class ConnectionPool:
+    """
+    Process-wide registry of web3 connections and contract objects. One
+    keep-alive http session is held per rpc url, one provider per (chain,
+    rpc urls), and one contract object per (connection, address, abi)
+    """
+
+    def __init__(self, max_pool_size: int = 32):
+        self.max_pool_size = max_pool_size
+
+        self._lock = threading.RLock()
+        self._sessions = {}
+        self._connections = {}
+        self._contracts = weakref.WeakKeyDictionary()
+
+    def get_session(self, rpc: str):
+        """
+        Get the keep-alive http session for a given rpc
+
+        Parameters
+        ----------
+        rpc : str
+            rpc url.
+
+        Returns
+        -------
+        requests.Session
+            shared http session.
+
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with self._lock:
+            if rpc not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.max_pool_size,
+                    pool_maxsize=self.max_pool_size
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[rpc] = session
+
+            return self._sessions[rpc]
+
+    def get_connection(self, chain: str, rpc):
+        """
+        Get the shared web3 connection for a given chain and rpc. With
+        several rpc urls requests are routed across them, see
+        rpc_pool.RPCPool
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        rpc : str or list
+            rpc url or urls.
+
+        Returns
+        -------
+        web3_obj
+            web3 connection.
+
+        """
+        from web3 import Web3
+        from .http_provider import PooledHTTPProvider
+        from .rpc_pool import get_rpc_urls
+
+        key = (chain, get_rpc_urls(rpc))
+
+        with self._lock:
+            if key not in self._connections:
+                web3_obj = Web3(PooledHTTPProvider(rpc, self.get_session))
+                # block_pin is added last so it is the outermost layer and
+                # the cache sees the pinned block number
+                web3_obj.middleware_onion.add(
+                    call_cache.middleware(chain),
+                    "call_cache"
+                )
+                web3_obj.middleware_onion.add(
+                    block_pin_middleware,
+                    "block_pin"
+                )
+                self._connections[key] = web3_obj
+
+            return self._connections[key]
+
+    def get_contract(
+        self, web3_obj, contract_address: str, abi_path: str, load_abi
+    ):
+        """
+        Get a contract object for a given connection, address and abi,
+        creating it on first use
+
+        Parameters
+        ----------
+        web3_obj : web3_obj
+            web3 connection.
+        contract_address : str
+            address of the contract.
+        abi_path : str
+            path of the abi json file.
+        load_abi : callable
+            function returning the parsed abi for abi_path.
+
+        Returns
+        -------
+        contract_obj
+            an instantied web3 contract object.
+
+        """
+        key = (contract_address, abi_path)
+
+        with self._lock:
+            contracts = self._contracts.setdefault(web3_obj, {})
+
+            if key not in contracts:
+                contracts[key] = web3_obj.eth.contract(
+                    address=contract_address,
+                    abi=load_abi(abi_path)
+                )
+
+            return contracts[key]
+
+    def close(self):
+        """
+        Close all http sessions and drop every pooled connection and contract
+        object. The pool rebuilds itself on next use, so this also acts as a
+        reset, eg after changing rpc
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+
+            self._sessions = {}
+            self._connections = {}
+            self._contracts = weakref.WeakKeyDictionary()
+
+
+connection_pool = ConnectionPool()
@@ -0,0 +1,261 @@
+import threading
+
+# Default number of worker threads of the shared executor
+EXECUTOR_MAX_WORKERS = 32
+
+
+def get_slot_key(rpc):
+    """
+    Get the key the slots of an rpc url, or pool of urls, are counted under
+
+    Parameters
+    ----------
+    rpc : str or tuple
+        rpc url, or urls of a pool, None when the calls are not limited.
+
+    Returns
+    -------
+    str or tuple
+        the url, or the tuple of urls of a pool of several.
+
+    """
+    if rpc is None or isinstance(rpc, str):
+        return rpc
+
+    urls = tuple(rpc)
+    if len(urls) == 1:
+        return urls[0]
+
+    return urls
+
+
+def get_slot_limit(key, concurrency: int):
+    """
+    Get the number of slots of a url or pool, concurrency per url
+    """
+    if concurrency is None or isinstance(key, str):
+        return concurrency
+
+    return concurrency * len(key)
+
+
+class SharedExecutor:
+    """
+    Process-wide thread pool running rpc calls, created on first use and
+    kept for the life of the process so threads are not spawned and torn
+    down for every list of calls. Each call takes a slot of the rpc url it
+    goes to, and the number of slots per url is capped so one slow provider
+    cannot take every worker. The rpc pool picks the url of each call
+    itself, so calls to a pool of urls share the slots of the whole pool,
+    concurrency per url times the number of urls.
+
+    Calls must not themselves wait on calls submitted to the executor, as
+    every worker could end up waiting.
+    """
+
+    def __init__(self, max_workers: int = EXECUTOR_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+
+        self._lock = threading.Lock()
+        self._slot_released = threading.Condition(self._lock)
+        self._executor = None
+        self._worker_threads = set()
+        self._limits = {}
+        self._slots = {}
+
+    def configure(self, max_workers: int):
+        """
+        Set the number of worker threads. Takes effect once the running
+        pool has finished its calls
+
+        Parameters
+        ----------
+        max_workers : int
+            number of worker threads.
+
+        """
+        with self._lock:
+            self.max_workers = max_workers
+            executor = self._executor
+            self._executor = None
+            self._worker_threads = set()
+
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def set_limit(self, rpc, concurrency: int):
+        """
+        Set the max number of calls to an rpc url, or pool of urls, queued
+        or running at once. Calls already holding a slot keep it, so
+        lowering the limit takes effect as they finish
+
+        Parameters
+        ----------
+        rpc : str or tuple
+            rpc url, or urls of a pool.
+        concurrency : int
+            max number of calls at once per url, None for no limit.
+
+        """
+        key = get_slot_key(rpc)
+        with self._lock:
+            self._limits[key] = get_slot_limit(key, concurrency)
+            self._slot_released.notify_all()
+
+    def map(self, fn, items, rpc=None, concurrency: int = None):
+        """
+        Run fn on each item on the shared pool, with at most concurrency
+        calls per rpc url queued or running at once
+
+        Parameters
+        ----------
+        fn : callable
+            function taking an item.
+        items : iterable
+            items to call fn on.
+        rpc : str or tuple, optional
+            rpc url, or urls of a pool, the calls go to. The default is
+            None, not limiting the calls.
+        concurrency : int, optional
+            max number of calls at once per url, ignored without rpc. The
+            default is None, keeping the current limit of the url or pool,
+            or no limit.
+
+        Returns
+        -------
+        list
+            outputs of fn in the same order as items.
+
+        """
+        key = get_slot_key(rpc)
+        if key is not None and concurrency is not None:
+            if self._limits.get(key) != get_slot_limit(key, concurrency):
+                self.set_limit(key, concurrency)
+
+        executor = self._get_executor()
+
+        futures = []
+        try:
+            for item in items:
+                self._acquire_slot(key)
+
+                try:
+                    future = executor.submit(self._run, fn, item)
+                except BaseException:
+                    self._on_done(None, key)
+                    raise
+
+                future.add_done_callback(
+                    lambda future: self._on_done(future, key)
+                )
+                futures.append(future)
+
+            return [future.result() for future in futures]
+        finally:
+            # Drop calls not started yet when one failed
+            for future in futures:
+                future.cancel()
+
+    def stats(self):
+        """
+        Get the load of the pool
+
+        Returns
+        -------
+        dict
+            number of worker threads, calls waiting for a worker, calls
+            running, calls completed, and calls queued or running per rpc
+            url or pool of urls.
+
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "workers": len(self._worker_threads),
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "endpoints": {
+                    key: slots
+                    for key, slots in self._slots.items()
+                    if slots
+                }
+            }
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Shut the pool down, letting running calls finish. The pool is
+        created again on next use, so this also acts as a reset
+
+        Parameters
+        ----------
+        wait : bool, optional
+            pass False to return without waiting for the calls to finish.
+            The default is True.
+        cancel_pending : bool, optional
+            pass True to drop calls still waiting for a worker. The default
+            is False.
+
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._worker_threads = set()
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+    def _get_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="gmx-rpc"
+                )
+
+            return self._executor
+
+    def _acquire_slot(self, key):
+        """
+        Wait for a free slot of the url or pool, and take it
+        """
+        with self._lock:
+            if key is not None:
+                while True:
+                    limit = self._limits.get(key)
+                    if limit is None or self._slots.get(key, 0) < limit:
+                        break
+                    self._slot_released.wait()
+
+                self._slots[key] = self._slots.get(key, 0) + 1
+            self.queued += 1
+
+    def _run(self, fn, item):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self._worker_threads.add(threading.get_ident())
+
+        try:
+            return fn(item)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def _on_done(self, future, key):
+        with self._lock:
+            if future is None or future.cancelled():
+                self.queued -= 1
+
+            if key is not None:
+                self._slots[key] -= 1
+                self._slot_released.notify_all()
+
+
+shared_executor = SharedExecutor()
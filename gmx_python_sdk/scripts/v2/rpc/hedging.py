@@ -0,0 +1,61 @@
+from contextvars import ContextVar
+
+# Latency percentile reads in the current context are hedged at, if any
+_hedge_percentile = ContextVar("hedge_percentile", default=None)
+
+# Idempotent reads which may be sent to two endpoints at once
+HEDGE_METHODS = (
+    "eth_call",
+    "eth_blockNumber",
+    "eth_gasPrice",
+    "eth_maxPriorityFeePerGas",
+    "eth_getBlockByNumber",
+    "eth_getBalance",
+)
+
+
+def get_hedge_percentile():
+    """
+    Get the latency percentile reads are currently hedged at
+
+    Returns
+    -------
+    float
+        percentile, or None if not inside HedgedReads.
+
+    """
+    return _hedge_percentile.get()
+
+
+class HedgedReads:
+    """
+    Context manager hedging the latency-sensitive reads made inside it, eg
+    on the order path before a transaction is submitted:
+
+        with HedgedReads(config):
+            gas_price = connection.eth.gas_price
+
+    When a read has not returned within config.rpc_hedge_percentile of the
+    endpoint's recent latencies, it is also sent to the next best endpoint
+    of the rpc pool and the first answer is used, see
+    rpc_pool.RPCPool.call_hedged. Does nothing if the percentile is not set
+    or the config has a single rpc url.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+        self._token = None
+
+    def __enter__(self):
+        percentile = self.config.rpc_hedge_percentile
+
+        if percentile is not None:
+            self._token = _hedge_percentile.set(percentile)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._token is not None:
+            _hedge_percentile.reset(self._token)
+            self._token = None
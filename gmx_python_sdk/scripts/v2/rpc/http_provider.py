@@ -0,0 +1,78 @@
+import requests
+from web3 import HTTPProvider
+
+from .hedging import HEDGE_METHODS, get_hedge_percentile
+from .rate_limiter import check_http_status, check_rpc_response
+from .rpc_pool import get_rpc_urls, rpc_pools
+from .single_flight import COALESCED_METHODS, single_flight
+
+# Connection failures retried with backoff
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+# Seconds before a request to an rpc times out
+RPC_REQUEST_TIMEOUT = 30
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider sending each request to the best endpoint of an RPCPool,
+    through the rate limiter of that endpoint, see rpc.rpc_pool and
+    rpc.rate_limiter. Replaces the fixed-delay retry middleware of
+    HTTPProvider with failover, and backoff with jitter, on 429, 5xx and
+    rate limit JSON-RPC errors. Reads inside HedgedReads are hedged, see
+    rpc.hedging, and concurrent identical reads share one request, see
+    rpc.single_flight
+    """
+
+    _middlewares = ()
+
+    def __init__(self, rpc, get_session):
+        self.pool = rpc_pools.get_pool(rpc)
+        self.get_session = get_session
+
+        super().__init__(get_rpc_urls(rpc)[0])
+
+    def __str__(self) -> str:
+        return "RPC pool {}".format(", ".join(self.pool.urls))
+
+    def make_request(self, method, params):
+        if method in COALESCED_METHODS:
+            return single_flight.do(
+                (self.pool.urls, method, repr(params)),
+                lambda: self._make_request(method, params)
+            )
+
+        return self._make_request(method, params)
+
+    def _make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+
+        percentile = get_hedge_percentile()
+        if percentile is not None and method in HEDGE_METHODS:
+            return self.pool.call_hedged(
+                lambda url: self._post(url, request_data),
+                RETRY_ERRORS,
+                percentile
+            )
+
+        return self.pool.call(
+            lambda url: self._post(url, request_data),
+            RETRY_ERRORS
+        )
+
+    def _post(self, url: str, request_data: bytes):
+        request_kwargs = {"timeout": RPC_REQUEST_TIMEOUT}
+        request_kwargs.update(self.get_request_kwargs())
+
+        response = self.get_session(url).post(
+            url,
+            data=request_data,
+            **request_kwargs
+        )
+        check_http_status(response.status_code, response.headers)
+        response.raise_for_status()
+
+        output = self.decode_rpc_response(response.content)
+        check_rpc_response(output)
+
+        return output
@@ -0,0 +1,152 @@
+import logging
+import os
+
+from hexbytes import HexBytes
+
+from .call_cache import call_cache
+from .connection_pool import connection_pool
+from .snapshot import get_pinned_block
+from ..gmx_utils import load_abi, decode_contract_function_output
+
+# Multicall3 is deployed at the same address on every supported chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+
+def get_multicall_contract(web3_obj):
+    """
+    Get a Multicall3 contract object for a given web3 connection
+
+    Parameters
+    ----------
+    web3_obj : web3_obj
+        web3 connection.
+
+    Returns
+    -------
+    contract_obj
+        an instantied web3 contract object.
+
+    """
+    return connection_pool.get_contract(
+        web3_obj,
+        MULTICALL3_ADDRESS,
+        os.path.join('contracts', 'multicall3.json'),
+        load_abi
+    )
+
+
+def execute_multicall(
+    function_calls: list, batch_size: int = 100, chain: str = None
+):
+    """
+    Pack a list of uncalled web3 contract functions into Multicall3
+    aggregate3 batches and decode each result back into its original position
+
+    Parameters
+    ----------
+    function_calls : list
+        list of uncalled web3 contract functions.
+    batch_size : int, optional
+        max number of calls to pack into one aggregate3 call. The default is
+        100.
+    chain : str, optional
+        chain the calls are made on, used to serve repeated calls from the
+        call cache. The default is None which bypasses the cache.
+
+    Returns
+    -------
+    results : list
+        decoded outputs in the same order as function_calls, None where an
+        individual call reverted.
+
+    """
+    if len(function_calls) == 0:
+        return []
+
+    multicall = get_multicall_contract(function_calls[0].w3)
+
+    block = get_pinned_block()
+    if block is None:
+        block = "latest"
+
+    results = [None] * len(function_calls)
+    cache_keys = [None] * len(function_calls)
+    pending = []
+    for index, call in enumerate(function_calls):
+        call_data = call._encode_transaction_data()
+
+        if chain is not None:
+            cache_keys[index] = call_cache.make_key(
+                chain, call.address, call_data, block
+            )
+            cached = call_cache.get(cache_keys[index])
+            if cached is not None:
+                results[index] = decode_contract_function_output(
+                    call,
+                    HexBytes(cached)
+                )
+                continue
+
+        pending.append((index, call, call_data))
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        raw_results = _execute_batch(multicall, batch)
+
+        for (index, call, call_data), (success, return_data) in zip(
+            batch, raw_results
+        ):
+            if not success:
+                logging.warning(
+                    "Multicall: call to {} reverted".format(call.fn_name)
+                )
+                continue
+
+            call_cache.put(cache_keys[index], "0x" + return_data.hex())
+            results[index] = decode_contract_function_output(
+                call,
+                return_data
+            )
+
+    return results
+
+
+def _execute_batch(multicall, batch: list):
+    """
+    Execute a single aggregate3 call, splitting the batch in half if the
+    node rejects it (eg gas or response size limits)
+
+    Parameters
+    ----------
+    multicall : contract_obj
+        Multicall3 contract object.
+    batch : list
+        list of (index, uncalled web3 contract function, calldata).
+
+    Returns
+    -------
+    raw_results : list
+        list of (success, return data) for each call.
+
+    """
+    calls = [
+        (call.address, True, call_data) for _, call, call_data in batch
+    ]
+
+    try:
+        return multicall.functions.aggregate3(calls).call()
+    except ValueError as e:
+        if len(batch) == 1:
+            raise
+
+        logging.warning(
+            "Multicall batch of {} failed, splitting: {}".format(
+                len(batch), e
+            )
+        )
+        midpoint = len(batch) // 2
+
+        return (
+            _execute_batch(multicall, batch[:midpoint])
+            + _execute_batch(multicall, batch[midpoint:])
+        )
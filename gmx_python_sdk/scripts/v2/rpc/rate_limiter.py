@@ -0,0 +1,414 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+
+# HTTP status codes retried with backoff
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# JSON-RPC error codes providers use for rate limiting
+RATE_LIMIT_ERROR_CODES = (-32005, 429)
+
+# Fragments of JSON-RPC error messages providers use for rate limiting.
+# Kept narrow, as eg "gas limit exceeded" is a deterministic failure
+RATE_LIMIT_ERROR_MESSAGES = (
+    "rate limit",
+    "too many requests"
+)
+
+# JSON-RPC error code of a reverted eth_call, never a rate limit whatever
+# its revert reason says
+EXECUTION_REVERTED_ERROR_CODE = 3
+
+
+class RateLimited(Exception):
+    """
+    Raised by a request when the provider throttled it or failed in a way
+    that is worth retrying
+    """
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def check_http_status(status_code: int, headers: dict = None):
+    """
+    Raise RateLimited for a retryable HTTP status
+
+    Parameters
+    ----------
+    status_code : int
+        HTTP status code of the response.
+    headers : dict, optional
+        response headers, read for Retry-After. The default is None.
+
+    Raises
+    ------
+    RateLimited
+        the status is 429 or a 5xx.
+
+    """
+    if status_code not in RETRY_STATUS_CODES:
+        return
+
+    retry_after = None
+    if headers is not None:
+        try:
+            retry_after = float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            pass
+
+    raise RateLimited("HTTP {}".format(status_code), retry_after)
+
+
+def is_rate_limit_error(error) -> bool:
+    """
+    Check if a JSON-RPC error object is a rate limit error
+
+    Parameters
+    ----------
+    error : dict or str
+        error member of a JSON-RPC response.
+
+    Returns
+    -------
+    bool
+        True if the provider throttled the request.
+
+    """
+    if isinstance(error, dict):
+        if error.get("code") in RATE_LIMIT_ERROR_CODES:
+            return True
+        if error.get("code") == EXECUTION_REVERTED_ERROR_CODE:
+            return False
+        error = error.get("message", "")
+    elif error is None:
+        return False
+
+    error = str(error).lower()
+    if error.startswith("execution reverted"):
+        return False
+
+    return any(message in error for message in RATE_LIMIT_ERROR_MESSAGES)
+
+
+def check_rpc_response(response):
+    """
+    Raise RateLimited if a JSON-RPC response, or every response of a
+    batch, is a rate limit error. Requests of a batch throttled on their
+    own are left to the transport, which retries them, see
+    get_rate_limited_ids
+
+    Parameters
+    ----------
+    response : dict or list
+        decoded JSON-RPC response.
+
+    Raises
+    ------
+    RateLimited
+        the provider throttled the request.
+
+    """
+    responses = response if isinstance(response, list) else [response]
+
+    if responses and all(
+        isinstance(item, dict) and is_rate_limit_error(item.get("error"))
+        for item in responses
+    ):
+        raise RateLimited("JSON-RPC error {}".format(responses[0]["error"]))
+
+
+def get_rate_limited_ids(responses: dict):
+    """
+    Get the ids of the responses of a batch which are rate limit errors
+
+    Parameters
+    ----------
+    responses : dict
+        JSON-RPC responses keyed by request id.
+
+    Returns
+    -------
+    list
+        ids of the throttled requests.
+
+    """
+    return [
+        request_id for request_id, response in responses.items()
+        if is_rate_limit_error(response.get("error"))
+    ]
+
+
+class EndpointLimiter:
+    """
+    Token bucket and retry policy of one RPC endpoint. Requests take a token
+    before they are sent, refilled at rate per second up to burst. The rate
+    adapts to the provider: it is halved when a request is throttled and
+    grows back by one request per second for every rate successful requests,
+    up to max_rate. Throttled and failed requests are retried with
+    exponential backoff and full jitter
+    """
+
+    def __init__(
+        self, max_rate: float, burst: int, max_retries: int,
+        backoff: float, max_backoff: float
+    ):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    def configure(
+        self, max_rate: float, burst: int, max_retries: int,
+        backoff: float, max_backoff: float
+    ):
+        """
+        Update the limits, keeping the adapted rate if it is lower than the
+        new max_rate
+        """
+        with self._lock:
+            if self.rate == self.max_rate:
+                self.rate = max_rate
+            else:
+                self.rate = min(self.rate, max_rate)
+            self.max_rate = max_rate
+            self.burst = burst
+            self.max_retries = max_retries
+            self.backoff = backoff
+            self.max_backoff = max_backoff
+            self._tokens = min(self._tokens, float(burst))
+
+    def _reserve(self):
+        """
+        Take a token, returning how long the caller must wait before
+        sending. The token is reserved immediately so waiting callers are
+        served in order
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+
+            return wait
+
+    def acquire(self):
+        """
+        Block until a request can be sent
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Wait, without blocking the event loop, until a request can be sent
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+    def on_throttle(self, retry_after: float = None):
+        with self._lock:
+            self.rate = max(1.0, self.rate / 2)
+            if retry_after is not None:
+                self._blocked_until = max(
+                    self._blocked_until,
+                    time.monotonic() + retry_after
+                )
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Delay before retry number attempt, exponential with full jitter
+
+        Parameters
+        ----------
+        attempt : int
+            zero based retry number.
+
+        Returns
+        -------
+        float
+            seconds to wait.
+
+        """
+        return random.uniform(
+            0,
+            min(self.max_backoff, self.backoff * 2 ** attempt)
+        )
+
+    def call(self, send, retry_errors: tuple = ()):
+        """
+        Send a request through the limiter, retrying it when throttled
+
+        Parameters
+        ----------
+        send : callable
+            function making the request, raising RateLimited when it
+            should be retried.
+        retry_errors : tuple, optional
+            further exceptions to retry, eg connection errors. The default
+            is ().
+
+        Returns
+        -------
+        output of send.
+
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                output = send()
+            except (RateLimited,) + tuple(retry_errors) as e:
+                if attempt == self.max_retries:
+                    raise
+
+                delay = self._on_retry(e, attempt)
+                time.sleep(delay)
+                continue
+
+            self.on_success()
+            return output
+
+    async def call_async(self, send, retry_errors: tuple = ()):
+        """
+        Async counterpart of call, send is a coroutine function
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async()
+            try:
+                output = await send()
+            except (RateLimited,) + tuple(retry_errors) as e:
+                if attempt == self.max_retries:
+                    raise
+
+                delay = self._on_retry(e, attempt)
+                await asyncio.sleep(delay)
+                continue
+
+            self.on_success()
+            return output
+
+    def _on_retry(self, error: Exception, attempt: int) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(error, RateLimited):
+            self.on_throttle(retry_after)
+
+        delay = self.backoff_delay(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        logging.warning(
+            "RPC request failed ({}), retry {} of {} in {:.2f}s".format(
+                error, attempt + 1, self.max_retries, delay
+            )
+        )
+
+        return delay
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide registry of one EndpointLimiter per RPC url, so every call
+    path to an endpoint shares its budget
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters = {}
+
+    def get_limiter(self, rpc: str, config=None):
+        """
+        Get the limiter of an endpoint, creating it on first use and
+        applying the limits of config if given
+
+        Parameters
+        ----------
+        rpc : str
+            rpc url.
+        config : ConfigManager, optional
+            config holding the limits. The default is None, keeping the
+            current limits or the defaults.
+
+        Returns
+        -------
+        EndpointLimiter
+            shared limiter of the endpoint.
+
+        """
+        from ..gmx_utils import (
+            RPC_RATE_LIMIT, RPC_BURST, RPC_MAX_RETRIES, RPC_BACKOFF,
+            RPC_MAX_BACKOFF
+        )
+
+        limits = (
+            RPC_RATE_LIMIT, RPC_BURST, RPC_MAX_RETRIES, RPC_BACKOFF,
+            RPC_MAX_BACKOFF
+        )
+        if config is not None:
+            limits = (
+                config.rpc_rate_limit,
+                config.rpc_burst,
+                config.rpc_max_retries,
+                config.rpc_backoff,
+                config.rpc_max_backoff
+            )
+
+        with self._lock:
+            limiter = self._limiters.get(rpc)
+            if limiter is None:
+                limiter = EndpointLimiter(*limits)
+                self._limiters[rpc] = limiter
+                return limiter
+
+        if config is not None:
+            limiter.configure(*limits)
+
+        return limiter
+
+    def configure(self, config):
+        """
+        Apply the limits of a config to each of its rpc urls
+
+        Parameters
+        ----------
+        config : ConfigManager
+            config holding the rpc urls and limits.
+
+        """
+        from .rpc_pool import get_rpc_urls
+
+        for url in get_rpc_urls(config.rpc):
+            self.get_limiter(url, config)
+
+    def clear(self):
+        """
+        Drop every limiter
+        """
+        with self._lock:
+            self._limiters = {}
+
+
+rate_limiter = RateLimiterRegistry()
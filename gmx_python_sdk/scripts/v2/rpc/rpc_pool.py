@@ -0,0 +1,505 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from .rate_limiter import RateLimited, rate_limiter
+
+# Weight of the newest sample in the rolling latency and error rate
+EWMA_ALPHA = 0.2
+
+# Consecutive failures which eject an endpoint, and seconds before an
+# ejected endpoint is probed again. The wait doubles each time a probe fails
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 30
+CIRCUIT_MAX_RESET_TIMEOUT = 600
+
+# Extra latency, as a multiple, charged per unit of error rate when ranking
+ERROR_RATE_PENALTY = 10
+
+# Recent latencies kept per endpoint for percentiles, and the number needed
+# before a percentile is trusted. Until then hedged reads wait
+# HEDGE_DEFAULT_DELAY seconds before firing the hedge
+LATENCY_SAMPLES = 100
+HEDGE_MIN_SAMPLES = 10
+HEDGE_DEFAULT_DELAY = 0.5
+
+# Threads sending hedged reads
+HEDGE_WORKERS = 8
+
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_rpc_urls(rpc) -> tuple:
+    """
+    Normalise the rpc of a config, a url or a list of urls, to a tuple
+
+    Parameters
+    ----------
+    rpc : str or list
+        rpc url or urls.
+
+    Returns
+    -------
+    tuple
+        rpc urls in preference order.
+
+    """
+    if isinstance(rpc, str):
+        return (rpc,)
+
+    return tuple(rpc)
+
+
+class EndpointHealth:
+    """
+    Rolling latency and error rate of one endpoint, with a circuit breaker.
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens
+    and the endpoint is skipped until reset_timeout has passed, after which
+    a single probe request is let through. A successful probe closes the
+    circuit, a failed one opens it again for twice as long
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = None
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.reset_timeout = CIRCUIT_RESET_TIMEOUT
+        self.open_until = None
+        self.probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_until is not None
+
+    def is_available(self, now: float) -> bool:
+        if self.open_until is None:
+            return True
+
+        return now >= self.open_until and not self.probing
+
+    def score(self) -> float:
+        # Endpoints without samples yet are tried first
+        if self.latency is None:
+            return 0.0
+
+        return self.latency * (1 + ERROR_RATE_PENALTY * self.error_rate)
+
+    def latency_percentile(self, percentile: float):
+        """
+        Get a percentile of the recent latencies
+
+        Parameters
+        ----------
+        percentile : float
+            percentile between 0 and 100.
+
+        Returns
+        -------
+        float
+            latency in seconds, None if there are fewer than
+            HEDGE_MIN_SAMPLES samples.
+
+        """
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+
+        latencies = sorted(self.latencies)
+
+        return latencies[int(percentile / 100 * (len(latencies) - 1))]
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += EWMA_ALPHA * (latency - self.latency)
+        self.error_rate -= EWMA_ALPHA * self.error_rate
+        self.consecutive_failures = 0
+
+        if self.is_open:
+            logging.info("RPC {} recovered, closing circuit".format(self.url))
+        self.open_until = None
+        self.probing = False
+        self.reset_timeout = CIRCUIT_RESET_TIMEOUT
+
+    def record_failure(self, now: float):
+        self.error_rate += EWMA_ALPHA * (1 - self.error_rate)
+        self.consecutive_failures += 1
+
+        if self.probing:
+            # The probe failed, stay ejected for longer
+            self.reset_timeout = min(
+                CIRCUIT_MAX_RESET_TIMEOUT,
+                self.reset_timeout * 2
+            )
+            self.open_until = now + self.reset_timeout
+            self.probing = False
+        elif (
+            not self.is_open
+            and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+        ):
+            logging.warning(
+                "RPC {} failed {} times in a row, ejecting for {}s".format(
+                    self.url, self.consecutive_failures, self.reset_timeout
+                )
+            )
+            self.open_until = now + self.reset_timeout
+
+
+class RPCPool:
+    """
+    Several endpoints of one chain. Each request is sent to the healthy
+    endpoint with the lowest rolling latency, penalised by its error rate,
+    and fails over to the next best endpoint when it is throttled or cannot
+    be reached. Requests to each endpoint go through its rate limiter. When
+    every endpoint has failed the request, it is retried with backoff on the
+    best one
+    """
+
+    def __init__(self, urls: tuple):
+        if len(urls) == 0:
+            raise Exception("RPC pool needs at least one rpc url!")
+
+        self.urls = tuple(urls)
+        self.health = {url: EndpointHealth(url) for url in self.urls}
+
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+        self._lock = threading.Lock()
+
+    def select(self, exclude: tuple = ()):
+        """
+        Choose the endpoint for the next request
+
+        Parameters
+        ----------
+        exclude : tuple, optional
+            urls already tried for this request. The default is ().
+
+        Returns
+        -------
+        str
+            url of the best available endpoint. When every endpoint not
+            excluded is ejected, the one due to be probed soonest. None if
+            every endpoint is excluded.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                self.health[url] for url in self.urls if url not in exclude
+            ]
+            if not candidates:
+                return None
+
+            available = [
+                health for health in candidates if health.is_available(now)
+            ]
+            if not available:
+                return min(
+                    candidates,
+                    key=lambda health: health.open_until
+                ).url
+
+            # min is stable, so ties keep the configured order
+            best = min(available, key=lambda health: health.score())
+            if best.is_open:
+                best.probing = True
+
+            return best.url
+
+    def record_success(self, url: str, latency: float):
+        with self._lock:
+            self.health[url].record_success(latency)
+
+    def record_failure(self, url: str):
+        with self._lock:
+            self.health[url].record_failure(time.monotonic())
+
+    def stats(self):
+        """
+        Get the health of each endpoint
+
+        Returns
+        -------
+        dict
+            latency, error rate and circuit state keyed by url.
+
+        """
+        with self._lock:
+            return {
+                url: {
+                    "latency": health.latency,
+                    "error_rate": health.error_rate,
+                    "ejected": health.is_open
+                }
+                for url, health in self.health.items()
+            }
+
+    def hedge_stats(self):
+        """
+        Get the hedged read counters
+
+        Returns
+        -------
+        dict
+            number of hedges fired, and of those answered first by the
+            hedge endpoint.
+
+        """
+        with self._lock:
+            return {"fired": self.hedges_fired, "won": self.hedges_won}
+
+    def call(self, send, retry_errors: tuple = ()):
+        """
+        Send a request to the best endpoint, failing over to the others
+
+        Parameters
+        ----------
+        send : callable
+            function taking an endpoint url and making the request, raising
+            RateLimited when it should be retried.
+        retry_errors : tuple, optional
+            further exceptions to fail over on, eg connection errors. The
+            default is ().
+
+        Returns
+        -------
+        output of send.
+
+        """
+        errors = (RateLimited,) + tuple(retry_errors)
+
+        tried = ()
+        while len(tried) < len(self.urls) - 1:
+            url = self.select(exclude=tried)
+            try:
+                return self._send(url, send, errors)
+            except errors as e:
+                self._on_failover(url, e)
+                tried += (url,)
+
+        # Last endpoint left, or every endpoint failed, retry with backoff
+        url = self.select(exclude=tried) or self.select()
+
+        return rate_limiter.get_limiter(url).call(
+            lambda: self._timed(url, send, errors),
+            retry_errors
+        )
+
+    def call_hedged(self, send, retry_errors: tuple = (), percentile=95):
+        """
+        Send a read to the best endpoint and, if it has not answered within
+        the given percentile of that endpoint's recent latencies, send the
+        same read to the next best endpoint too. The first answer wins, the
+        slower request is left to finish in the background. Only use for
+        idempotent reads
+
+        Parameters
+        ----------
+        send : callable
+            function taking an endpoint url and making the request, raising
+            RateLimited when it should be retried.
+        retry_errors : tuple, optional
+            further exceptions to fail over on. The default is ().
+        percentile : float, optional
+            latency percentile after which the hedge is sent. The default
+            is 95.
+
+        Returns
+        -------
+        output of send.
+
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        errors = (RateLimited,) + tuple(retry_errors)
+
+        if len(self.urls) < 2:
+            return self.call(send, retry_errors)
+
+        primary = self.select()
+        with self._lock:
+            delay = self.health[primary].latency_percentile(percentile)
+        if delay is None:
+            delay = HEDGE_DEFAULT_DELAY
+
+        executor = _get_hedge_executor()
+        futures = {
+            executor.submit(self._send, primary, send, errors): primary
+        }
+
+        secondary = None
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            # Selected only now, as selecting an ejected endpoint marks it
+            # as probing until the probe is answered
+            secondary = self.select(exclude=(primary,))
+            with self._lock:
+                self.hedges_fired += 1
+            futures[
+                executor.submit(self._send, secondary, send, errors)
+            ] = secondary
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    output = future.result()
+                except errors as e:
+                    self._on_failover(futures[future], e)
+                    continue
+
+                if futures[future] == secondary:
+                    with self._lock:
+                        self.hedges_won += 1
+
+                return output
+
+        # Every request sent failed, fall back to failover and backoff
+        return self.call(send, retry_errors)
+
+    async def call_async(self, send, retry_errors: tuple = ()):
+        """
+        Async counterpart of call, send is a coroutine function
+        """
+        errors = (RateLimited,) + tuple(retry_errors)
+
+        tried = ()
+        while len(tried) < len(self.urls) - 1:
+            url = self.select(exclude=tried)
+            limiter = rate_limiter.get_limiter(url)
+            await limiter.acquire_async()
+            try:
+                output = await self._timed_async(url, send, errors)
+            except errors as e:
+                self._on_failover(url, e)
+                tried += (url,)
+                continue
+
+            limiter.on_success()
+            return output
+
+        url = self.select(exclude=tried) or self.select()
+
+        return await rate_limiter.get_limiter(url).call_async(
+            lambda: self._timed_async(url, send, errors),
+            retry_errors
+        )
+
+    def _send(self, url: str, send, errors: tuple):
+        """
+        Send a request to one endpoint through its rate limiter
+        """
+        limiter = rate_limiter.get_limiter(url)
+        limiter.acquire()
+
+        output = self._timed(url, send, errors)
+        limiter.on_success()
+
+        return output
+
+    def _timed(self, url: str, send, errors: tuple):
+        start = time.monotonic()
+        try:
+            output = send(url)
+        except errors:
+            self.record_failure(url)
+            raise
+        except Exception:
+            # The endpoint answered, the request itself was bad
+            self.record_success(url, time.monotonic() - start)
+            raise
+
+        self.record_success(url, time.monotonic() - start)
+        return output
+
+    async def _timed_async(self, url: str, send, errors: tuple):
+        start = time.monotonic()
+        try:
+            output = await send(url)
+        except errors:
+            self.record_failure(url)
+            raise
+        except Exception:
+            self.record_success(url, time.monotonic() - start)
+            raise
+
+        self.record_success(url, time.monotonic() - start)
+        return output
+
+    def _on_failover(self, url: str, error: Exception):
+        if isinstance(error, RateLimited):
+            rate_limiter.get_limiter(url).on_throttle(error.retry_after)
+
+        logging.warning(
+            "RPC request to {} failed ({}), failing over".format(url, error)
+        )
+
+
+def _get_hedge_executor():
+    """
+    Get the thread pool sending hedged reads, creating it on first use
+    """
+    global _hedge_executor
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=HEDGE_WORKERS,
+                thread_name_prefix="rpc-hedge"
+            )
+
+        return _hedge_executor
+
+
+class RPCPoolRegistry:
+    """
+    Process-wide registry of one RPCPool per set of urls, so every call path
+    shares the health of each endpoint
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def get_pool(self, rpc):
+        """
+        Get the pool of a config's rpc
+
+        Parameters
+        ----------
+        rpc : str or list
+            rpc url or urls.
+
+        Returns
+        -------
+        RPCPool
+            shared pool.
+
+        """
+        urls = get_rpc_urls(rpc)
+
+        with self._lock:
+            if urls not in self._pools:
+                self._pools[urls] = RPCPool(urls)
+
+            return self._pools[urls]
+
+    def clear(self):
+        """
+        Drop every pool
+        """
+        with self._lock:
+            self._pools = {}
+
+
+rpc_pools = RPCPoolRegistry()
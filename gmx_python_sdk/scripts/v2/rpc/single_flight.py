@@ -0,0 +1,154 @@
+import asyncio
+import threading
+
+from concurrent.futures import Future
+
+# Idempotent JSON-RPC reads which concurrent identical requests may share
+COALESCED_METHODS = (
+    "eth_call",
+    "eth_blockNumber",
+    "eth_chainId",
+    "eth_gasPrice",
+    "eth_maxPriorityFeePerGas",
+    "eth_getBlockByNumber",
+    "eth_getBalance",
+    "eth_getCode",
+)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls. The first caller of a key runs the
+    call, callers arriving while it is in flight wait for it and get the
+    same result, or the same exception. Nothing is kept once the call has
+    finished, so a later caller runs the call again.
+
+    Threads and async tasks are coalesced separately, async tasks with the
+    other tasks of their event loop.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.saved = 0
+
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._in_flight_async = {}
+
+    def do(self, key, call):
+        """
+        Run call, or wait for the in-flight call with the same key
+
+        Parameters
+        ----------
+        key : hashable
+            identity of the call, eg the method and its parameters.
+        call : callable
+            function making the call.
+
+        Returns
+        -------
+        output of call.
+
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.saved += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            output = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(output)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+        return output
+
+    async def do_async(self, key, call):
+        """
+        Async counterpart of do, call is a coroutine function
+
+        Parameters
+        ----------
+        key : hashable
+            identity of the call, eg the method and its parameters.
+        call : callable
+            coroutine function making the call.
+
+        Returns
+        -------
+        output of call.
+
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+
+        with self._lock:
+            self.calls += 1
+            task = self._in_flight_async.get(loop_key)
+            if task is None:
+                # The call runs in its own task, so cancelling the caller
+                # that started it does not cancel it for the others
+                task = loop.create_task(call())
+                self._in_flight_async[loop_key] = task
+                task.add_done_callback(
+                    lambda task: self._on_async_done(loop_key, task)
+                )
+            else:
+                self.saved += 1
+
+        # Shielded so a cancelled caller only stops its own wait
+        return await asyncio.shield(task)
+
+    def _on_async_done(self, loop_key, task):
+        with self._lock:
+            if self._in_flight_async.get(loop_key) is task:
+                del self._in_flight_async[loop_key]
+
+        # Retrieve the exception so a call whose callers were all cancelled
+        # is not reported as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        """
+        Get the coalescing counters
+
+        Returns
+        -------
+        dict
+            number of calls made through the single flight, how many of
+            them shared an in-flight call rather than making their own, and
+            how many calls are in flight.
+
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "saved": self.saved,
+                "in_flight": len(self._in_flight) + len(self._in_flight_async)
+            }
+
+    def reset_stats(self):
+        """
+        Reset the counters
+        """
+        with self._lock:
+            self.calls = 0
+            self.saved = 0
+
+
+single_flight = SingleFlight()
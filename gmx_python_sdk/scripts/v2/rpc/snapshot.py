@@ -0,0 +1,100 @@
+from contextvars import ContextVar
+
+# Block number every read in the current context is pinned to, if any
+_pinned_block = ContextVar("pinned_block", default=None)
+
+# Methods whose block parameter is pinned, mapped to its position in params
+PINNED_METHODS = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+}
+
+
+def get_pinned_block():
+    """
+    Get the block number reads are currently pinned to
+
+    Returns
+    -------
+    int
+        pinned block number, or None if not inside a BlockSnapshot.
+
+    """
+    return _pinned_block.get()
+
+
+def block_pin_middleware(make_request, w3):
+    """
+    web3 middleware rewriting "latest" reads to the pinned block number while
+    inside a BlockSnapshot
+    """
+    def middleware(method, params):
+        block_number = _pinned_block.get()
+
+        if block_number is not None and method in PINNED_METHODS:
+            position = PINNED_METHODS[method]
+
+            if len(params) > position and params[position] == "latest":
+                params = list(params)
+                params[position] = hex(block_number)
+
+        return make_request(method, params)
+
+    return middleware
+
+
+class BlockSnapshot:
+    """
+    Context manager resolving one block number up front and pinning every
+    reader and datastore call made inside it to that block, so several
+    fetchers read one consistent state:
+
+        with BlockSnapshot(config) as snapshot:
+            open_interest = OpenInterest(config).get_data()
+            liquidity = GetAvailableLiquidity(config).get_data()
+
+    Nested snapshots reuse the block of the outermost one.
+    """
+
+    def __init__(self, config, block_identifier="latest"):
+        self.config = config
+        self.block_identifier = block_identifier
+        self.block_number = None
+
+        self._token = None
+
+    def __enter__(self):
+        self.block_number = _pinned_block.get()
+
+        if self.block_number is None:
+            self.block_number = self._resolve_block_number()
+            self._token = _pinned_block.set(self.block_number)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._token is not None:
+            _pinned_block.reset(self._token)
+            self._token = None
+
+    def _resolve_block_number(self):
+        """
+        Resolve the block identifier to a block number
+
+        Returns
+        -------
+        int
+            block number.
+
+        """
+        from ..gmx_utils import create_connection
+
+        if isinstance(self.block_identifier, int):
+            return self.block_identifier
+
+        connection = create_connection(self.config)
+
+        if self.block_identifier == "latest":
+            return connection.eth.block_number
+
+        return connection.eth.get_block(self.block_identifier)['number']
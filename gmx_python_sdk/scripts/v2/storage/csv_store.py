@@ -0,0 +1,357 @@
+import csv
+import io
+import os
+import threading
+
+from ..gmx_utils import package_dir
+
+# Size in bytes after which rows go to a new segment
+CSV_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CSVStore:
+    """
+    Append-only CSV file in the datastore directory, split into segments.
+    New rows are written to the end of the active segment without reading
+    any history. When a row brings columns the active segment does not have,
+    eg a newly listed market, or the segment outgrows max_segment_bytes, a
+    new segment is started with the union of the columns.
+
+    The first segment keeps the plain filename, so files written before
+    segments were introduced are read and extended as is, and later
+    segments are numbered, eg arbitrum_gm_prices.1.csv. A new segment is
+    written to a temporary file and linked into place, so readers never see
+    a partial header, and when several writers start the same segment one
+    creates it and the others append to it. Segments before the active one
+    can be deleted, eg once rolled up, without affecting readers or
+    writers.
+    """
+
+    def __init__(
+        self, filename: str,
+        directory: str = os.path.join(package_dir, "data_store"),
+        max_segment_bytes: int = CSV_SEGMENT_MAX_BYTES
+    ):
+        self.filename = filename
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+
+        self._stem, self._extension = os.path.splitext(filename)
+        self._lock = threading.Lock()
+        self._index = None
+        self._header = None
+
+    def segment_path(self, index: int):
+        """
+        Get the path of a segment
+
+        Parameters
+        ----------
+        index : int
+            segment number, 0 for the first.
+
+        Returns
+        -------
+        str
+            path of the segment.
+
+        """
+        if index == 0:
+            return os.path.join(self.directory, self.filename)
+
+        return os.path.join(
+            self.directory,
+            "{}.{}{}".format(self._stem, index, self._extension)
+        )
+
+    def segment_indices(self):
+        """
+        Get the numbers of the existing segments, oldest first
+
+        Returns
+        -------
+        list
+            segment numbers.
+
+        """
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        indices = []
+        for name in names:
+            if name == self.filename:
+                indices.append(0)
+                continue
+
+            stem, extension = os.path.splitext(name)
+            index = stem[len(self._stem) + 1:]
+            if (
+                extension == self._extension
+                and stem.startswith(self._stem + ".")
+                and index.isdigit()
+            ):
+                indices.append(int(index))
+
+        return sorted(indices)
+
+    def segments(self):
+        """
+        Get the paths of the existing segments, oldest first
+
+        Returns
+        -------
+        list
+            segment paths.
+
+        """
+        return [self.segment_path(index) for index in self.segment_indices()]
+
+    def last_row(self, path: str = None):
+        """
+        Read the last row of a segment without reading the rest of it
+
+        Parameters
+        ----------
+        path : str, optional
+            path of the segment. The default is None, the newest segment.
+
+        Returns
+        -------
+        dict
+            row values as strings keyed by column, None if the segment has
+            no rows.
+
+        """
+        if path is None:
+            segments = self.segments()
+            if not segments:
+                return None
+            path = segments[-1]
+
+        header = self._read_header(path)
+        if header is None:
+            return None
+
+        with open(path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            chunk_size = 4096
+            while True:
+                start = max(0, end - chunk_size)
+                f.seek(start)
+                lines = f.read(end - start).rstrip(b"\n").split(b"\n")
+                # Grow the chunk until it holds a whole line
+                if len(lines) > 1 or start == 0:
+                    break
+                chunk_size *= 2
+
+        if start == 0 and len(lines) < 2:
+            return None
+
+        values = next(csv.reader([lines[-1].decode()]))
+
+        return dict(zip(header, values))
+
+    def append(self, row: dict):
+        """
+        Append a row
+
+        Parameters
+        ----------
+        row : dict
+            values keyed by column name. Columns of the segment missing from
+            the row are left empty.
+
+        """
+        with self._lock:
+            while True:
+                self._sync()
+
+                path = self.segment_path(self._index)
+                size = os.path.getsize(path) if self._header else 0
+                new_columns = [
+                    column for column in row
+                    if column not in (self._header or [])
+                ]
+
+                if (
+                    self._header and not new_columns
+                    and size < self.max_segment_bytes
+                ):
+                    with open(path, 'a', newline='') as f:
+                        f.write(self._format_rows(self._header, [row]))
+                    return
+
+                index = self._index + 1 if self._header else self._index
+                header = (self._header or []) + new_columns
+                if self._write_segment(index, header, [row]):
+                    self._index = index
+                    self._header = header
+                    return
+
+                # Another writer started the segment first, append to it
+                self._index = index
+                self._header = None
+
+    def iter_rows(self, columns: list = None):
+        """
+        Stream the rows of every segment, oldest first, without loading the
+        file into memory
+
+        Parameters
+        ----------
+        columns : list, optional
+            columns to keep. The default is None, keeping all.
+
+        Yields
+        ------
+        dict
+            row values as strings keyed by column, None where a segment does
+            not have the column.
+
+        """
+        for path in self.segments():
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    if columns is None:
+                        yield row
+                    else:
+                        yield {column: row.get(column) for column in columns}
+
+    def read(self, columns: list = None):
+        """
+        Read every segment into one dataframe
+
+        Parameters
+        ----------
+        columns : list, optional
+            columns to read. The default is None, reading all.
+
+        Returns
+        -------
+        pd.DataFrame
+            rows of all segments, with the union of their columns.
+
+        """
+        import pandas as pd
+
+        frames = []
+        for path in self.segments():
+            if columns is None:
+                frames.append(pd.read_csv(path))
+                continue
+
+            # Read one column at least so rows of segments without any of
+            # the columns are kept, as empty values
+            header = self._read_header(path) or []
+            usecols = [column for column in header if column in columns]
+            frame = pd.read_csv(path, usecols=usecols or header[:1])
+            frames.append(frame.reindex(columns=columns))
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _sync(self):
+        """
+        Find the active segment and its header, picking up segments started
+        by other writers since the last append
+        """
+        if self._index is None:
+            indices = self.segment_indices()
+            self._index = indices[-1] if indices else 0
+            self._header = None
+
+        while os.path.exists(self.segment_path(self._index + 1)):
+            self._index += 1
+            self._header = None
+
+        if self._header is None:
+            self._header = self._read_header(self.segment_path(self._index))
+
+    @staticmethod
+    def _read_header(path: str):
+        try:
+            with open(path, newline='') as f:
+                return next(csv.reader(f), None)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _format_rows(header: list, rows: list, with_header: bool = False):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(
+            buffer,
+            fieldnames=header,
+            lineterminator="\n"
+        )
+        if with_header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+        return buffer.getvalue()
+
+    def _write_segment(self, index: int, header: list, rows: list):
+        """
+        Atomically create a segment holding header and rows. The segment is
+        claimed with a hard link, which fails if another writer created it
+        first. A segment without a header is replaced
+
+        Returns
+        -------
+        bool
+            True if the segment was created, False if it already existed.
+
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        path = self.segment_path(index)
+        temporary_path = "{}.{}.{}.tmp".format(
+            path,
+            os.getpid(),
+            threading.get_ident()
+        )
+        with open(temporary_path, 'w', newline='') as f:
+            f.write(self._format_rows(header, rows, with_header=True))
+
+        try:
+            os.link(temporary_path, path)
+        except FileExistsError:
+            if self._read_header(path) is not None:
+                os.remove(temporary_path)
+                return False
+
+            os.replace(temporary_path, path)
+            return True
+
+        os.remove(temporary_path)
+
+        return True
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_csv_store(filename: str):
+    """
+    Get the process-wide store of a csv file in the datastore directory
+
+    Parameters
+    ----------
+    filename : str
+        name of file.
+
+    Returns
+    -------
+    CSVStore
+        store of the file.
+
+    """
+    with _stores_lock:
+        if filename not in _stores:
+            _stores[filename] = CSVStore(filename)
+
+        return _stores[filename]
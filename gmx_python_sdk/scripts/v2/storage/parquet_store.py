@@ -0,0 +1,409 @@
+import numbers
+import os
+import threading
+import uuid
+
+from datetime import datetime, timezone
+
+from ..gmx_utils import package_dir
+
+# Rows per row group when a day's files are compacted, readers skip row
+# groups outside the queried time range using their statistics
+PARQUET_ROW_GROUP_SIZE = 4096
+
+# Separator between the side and the market of a flattened column, eg
+# long.ETH
+COLUMN_SEPARATOR = "."
+
+# Keys of the stats holding a dictionary of values per market. Market
+# symbols can themselves contain the separator, eg BTC.b, so only these are
+# split off a column name
+STAT_SIDES = ("long", "short", "total_tvl", "long_token", "short_token")
+
+
+def flatten_stats(data: dict):
+    """
+    Flatten the output of a stat into one row, nested dictionaries such as
+    long and short becoming side.market columns
+
+    Parameters
+    ----------
+    data : dict
+        output of a stat.
+
+    Returns
+    -------
+    dict
+        row values keyed by column, without the parameter.
+
+    """
+    row = {}
+    for key, value in data.items():
+        if key == "parameter":
+            continue
+
+        if isinstance(value, dict):
+            for market, market_value in value.items():
+                row[key + COLUMN_SEPARATOR + market] = market_value
+        else:
+            row[key] = value
+
+    return row
+
+
+def get_market(column: str):
+    """
+    Get the market of a flattened column
+
+    Parameters
+    ----------
+    column : str
+        column name, eg long.ETH, long.BTC.b or ETH.
+
+    Returns
+    -------
+    str
+        market name.
+
+    """
+    side, separator, market = column.partition(COLUMN_SEPARATOR)
+    if separator and side in STAT_SIDES:
+        return market
+
+    return column
+
+
+class ParquetStore:
+    """
+    Columnar time-series store of collected stats, written as Parquet files
+    partitioned by chain, parameter and UTC day:
+
+        data_store/parquet/chain=arbitrum/parameter=open_interest/
+            date=2024-06-01/<file>.parquet
+
+    Each stat is one row with a timestamp column and one column per market
+    and side, so reading one market only reads its columns, and a time range
+    only reads the days and row groups it covers. Each write adds a small
+    file. Once writes roll over to a new day, the files of the finished days
+    are compacted into one file sorted by time. Naive datetimes are taken
+    as UTC. Needs pyarrow
+    """
+
+    def __init__(
+        self,
+        directory: str = os.path.join(package_dir, "data_store", "parquet")
+    ):
+        self.directory = directory
+
+        self._lock = threading.Lock()
+        self._last_dates = {}
+
+    def partition_path(self, chain: str, parameter: str, date: str):
+        """
+        Get the directory of a partition
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat, eg open_interest.
+        date : str
+            UTC day as YYYY-MM-DD.
+
+        Returns
+        -------
+        str
+            partition directory.
+
+        """
+        return os.path.join(
+            self.directory,
+            "chain={}".format(chain),
+            "parameter={}".format(parameter),
+            "date={}".format(date)
+        )
+
+    def dates(self, chain: str, parameter: str):
+        """
+        Get the days holding data for a stat
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat.
+
+        Returns
+        -------
+        list
+            UTC days as YYYY-MM-DD, oldest first.
+
+        """
+        parameter_path = os.path.dirname(
+            self.partition_path(chain, parameter, "")
+        )
+        try:
+            names = os.listdir(parameter_path)
+        except FileNotFoundError:
+            return []
+
+        return sorted(
+            name[len("date="):] for name in names if name.startswith("date=")
+        )
+
+    def append(
+        self, chain: str, parameter: str, data: dict, timestamp=None
+    ):
+        """
+        Write the output of a stat as a new row
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat, eg open_interest.
+        data : dict
+            output of the stat.
+        timestamp : datetime, optional
+            time of the row. The default is None, using now.
+
+        """
+        import pyarrow as pa
+
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        else:
+            timestamp = self._to_utc(timestamp)
+        date = timestamp.strftime("%Y-%m-%d")
+
+        columns = {
+            "timestamp": pa.array([timestamp], pa.timestamp("us", "UTC"))
+        }
+        for column, value in flatten_stats(data).items():
+            value_type = self._get_type(column, value)
+            if value_type == pa.string() and value is not None:
+                value = str(value)
+            elif value_type == pa.float64() and value is not None:
+                value = float(value)
+            columns[column] = pa.array([value], value_type)
+
+        self._write_table(
+            pa.table(columns),
+            self.partition_path(chain, parameter, date),
+            "{}-{}.parquet".format(
+                timestamp.strftime("%H%M%S%f"),
+                uuid.uuid4().hex[:8]
+            )
+        )
+
+        with self._lock:
+            rolled_over = self._last_dates.get((chain, parameter)) != date
+            self._last_dates[(chain, parameter)] = date
+        if rolled_over:
+            self.compact_finished_days(chain, parameter, date)
+
+    def compact_finished_days(self, chain: str, parameter: str, date: str):
+        """
+        Compact every day of a stat before date
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat.
+        date : str
+            UTC day being written, as YYYY-MM-DD.
+
+        """
+        for finished_date in self.dates(chain, parameter):
+            if finished_date < date:
+                self.compact(chain, parameter, finished_date)
+
+    def read(
+        self, chain: str, parameter: str, start=None, end=None,
+        markets: list = None, columns: list = None
+    ):
+        """
+        Read a stat over a time range, for a subset of markets
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat, eg open_interest.
+        start : datetime, optional
+            first time included. The default is None, from the first row.
+        end : datetime, optional
+            first time excluded. The default is None, up to the last row.
+        markets : list, optional
+            markets to read the columns of. The default is None, all.
+        columns : list, optional
+            further columns to read by name, eg block_number. The default
+            is None.
+
+        Returns
+        -------
+        pd.DataFrame
+            timestamp and the selected columns, ordered by time.
+
+        """
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        start = self._to_utc(start)
+        end = self._to_utc(end)
+
+        files = []
+        for date in self.dates(chain, parameter):
+            if start is not None and date < start.strftime("%Y-%m-%d"):
+                continue
+            if end is not None and date > end.strftime("%Y-%m-%d"):
+                continue
+
+            partition_path = self.partition_path(chain, parameter, date)
+            files += [
+                os.path.join(partition_path, name)
+                for name in sorted(os.listdir(partition_path))
+                if name.endswith(".parquet")
+            ]
+
+        if not files:
+            return pd.DataFrame()
+
+        # Files written before a market was listed lack its columns
+        schema = pa.unify_schemas(
+            [pq.read_schema(filepath) for filepath in files]
+        )
+        selected = ["timestamp"] + [
+            name for name in schema.names
+            if name != "timestamp" and (
+                (markets is None and columns is None)
+                or (markets is not None and get_market(name) in markets)
+                or (columns is not None and name in columns)
+            )
+        ]
+
+        expression = None
+        if start is not None:
+            expression = ds.field("timestamp") >= start
+        if end is not None:
+            before_end = ds.field("timestamp") < end
+            expression = (
+                before_end if expression is None else expression & before_end
+            )
+
+        table = ds.dataset(files, schema=schema, format="parquet").to_table(
+            columns=selected,
+            filter=expression
+        )
+
+        return table.sort_by("timestamp").to_pandas()
+
+    def compact(self, chain: str, parameter: str, date: str):
+        """
+        Merge the files of a day into one file sorted by time, with row
+        groups of PARQUET_ROW_GROUP_SIZE rows. Rows written while compacting
+        are kept in their own files. Readers running while the merged file is
+        moved into place may see a day's rows twice, so compact days that are
+        no longer written to. A day being compacted by another writer is
+        skipped
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat.
+        date : str
+            UTC day as YYYY-MM-DD.
+
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        partition_path = self.partition_path(chain, parameter, date)
+        filepaths = [
+            os.path.join(partition_path, name)
+            for name in sorted(os.listdir(partition_path))
+            if name.endswith(".parquet")
+        ]
+        if len(filepaths) < 2:
+            return
+
+        # Claimed so two writers rolling over together do not both merge
+        # the same files
+        lock_path = os.path.join(partition_path, ".compacting")
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            return
+
+        try:
+            tables = [pq.read_table(filepath) for filepath in filepaths]
+            table = pa.concat_tables(tables, promote_options="default")
+
+            self._write_table(
+                table.sort_by("timestamp"),
+                partition_path,
+                "compacted-{}.parquet".format(uuid.uuid4().hex[:8])
+            )
+            for filepath in filepaths:
+                os.remove(filepath)
+        finally:
+            os.remove(lock_path)
+
+    def _write_table(self, table, partition_path: str, filename: str):
+        """
+        Write a file to a partition, through a temporary file so readers
+        never see a partial file
+        """
+        import pyarrow.parquet as pq
+
+        os.makedirs(partition_path, exist_ok=True)
+
+        filepath = os.path.join(partition_path, filename)
+        temporary_path = filepath + ".tmp"
+        pq.write_table(
+            table,
+            temporary_path,
+            row_group_size=PARQUET_ROW_GROUP_SIZE
+        )
+        os.replace(temporary_path, filepath)
+
+    @staticmethod
+    def _get_type(column: str, value):
+        import pyarrow as pa
+
+        import numpy as np
+
+        if column == "block_number":
+            return pa.int64()
+        # Typed from the value alone, so a missing or numpy value must get
+        # the same type as a float in other files of the day
+        if value is None:
+            return pa.float64()
+        if isinstance(value, (bool, np.bool_)):
+            return pa.bool_()
+        if isinstance(value, (numbers.Number, np.number)):
+            return pa.float64()
+
+        return pa.string()
+
+    @staticmethod
+    def _to_utc(value):
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+
+        return value.astimezone(timezone.utc)
+
+
+parquet_store = ParquetStore()
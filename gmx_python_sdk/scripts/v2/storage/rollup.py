@@ -0,0 +1,337 @@
+import csv
+import logging
+import math
+import os
+import time
+
+from datetime import datetime, timezone
+
+from .csv_store import get_csv_store
+
+# Bucket widths in seconds of the rolled up files, buckets are aligned to
+# UTC
+ROLLUP_INTERVALS = {
+    "1m": 60,
+    "1h": 60 * 60,
+    "1d": 24 * 60 * 60
+}
+
+# Stats with one csv per side, see GetData._save_data
+SIDED_STATS = [
+    "open_interest",
+    "funding_apr",
+    "borrow_apr",
+    "available_liquidity"
+]
+
+# Columns of the raw files which are not stats
+SKIPPED_COLUMNS = ("timestamp", "block_number", "parameter")
+
+AGGREGATES = ("open", "high", "low", "close", "mean")
+
+
+def get_stat_filenames(chain: str):
+    """
+    Get the csv files the stats of a chain are saved to with to_csv
+
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+
+    Returns
+    -------
+    list
+        names of files in the datastore.
+
+    """
+    filenames = []
+    for parameter in SIDED_STATS:
+        filenames += [
+            "{}_long_{}_data.csv".format(chain, parameter),
+            "{}_short_{}_data.csv".format(chain, parameter)
+        ]
+
+    return filenames + ["{}_gm_prices.csv".format(chain)]
+
+
+def get_rollup_filename(filename: str, interval: str):
+    """
+    Get the name of the file a raw csv is rolled up to
+
+    Parameters
+    ----------
+    filename : str
+        name of the raw file, eg arbitrum_gm_prices.csv.
+    interval : str
+        key of ROLLUP_INTERVALS.
+
+    Returns
+    -------
+    str
+        name of the rolled up file, eg arbitrum_gm_prices_1h.csv.
+
+    """
+    stem, extension = os.path.splitext(filename)
+
+    return "{}_{}{}".format(stem, interval, extension)
+
+
+def parse_timestamp(value: str):
+    """
+    Parse a timestamp written by make_timestamped_row, in local time, or by
+    a rollup, in UTC
+
+    Parameters
+    ----------
+    value : str
+        timestamp column of a row.
+
+    Returns
+    -------
+    float
+        unix time, None if the value is not a timestamp.
+
+    """
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class Bucket:
+    """
+    Open, high, low, close and mean of each column over one interval
+    """
+
+    def __init__(self, start: float):
+        self.start = start
+        self.count = 0
+        self.columns = {}
+
+    def add(self, row: dict):
+        self.count += 1
+        for column, value in row.items():
+            if column in SKIPPED_COLUMNS:
+                continue
+
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if math.isnan(value):
+                continue
+
+            aggregate = self.columns.get(column)
+            if aggregate is None:
+                # open, high, low, close, sum, count
+                self.columns[column] = [value, value, value, value, value, 1]
+                continue
+
+            aggregate[1] = max(aggregate[1], value)
+            aggregate[2] = min(aggregate[2], value)
+            aggregate[3] = value
+            aggregate[4] += value
+            aggregate[5] += 1
+
+    def to_row(self):
+        row = {
+            "timestamp": str(
+                datetime.fromtimestamp(self.start, timezone.utc)
+            ),
+            "count": self.count
+        }
+        for column, aggregate in self.columns.items():
+            values = aggregate[:4] + [aggregate[4] / aggregate[5]]
+            for name, value in zip(AGGREGATES, values):
+                row["{}.{}".format(column, name)] = value
+
+        return row
+
+
+class StatRollup:
+    """
+    Roll the raw rows of a csv stat up into buckets of each interval,
+    written to their own append-only files, eg arbitrum_gm_prices_1h.csv
+    with open, high, low, close and mean columns per market.
+
+    Rows are streamed segment by segment with one open bucket per interval,
+    so memory does not grow with the history. A bucket is written once a
+    later row or the clock closes it, and each run carries on after the last
+    bucket written, skipping segments that were already rolled up. Raw
+    segments whose rows are all rolled up and older than the retention
+    window can then be deleted.
+    """
+
+    def __init__(self, filename: str, intervals: list = None):
+        self.filename = filename
+        self.intervals = list(intervals or ROLLUP_INTERVALS)
+
+        self.log = logging.getLogger(self.__class__.__name__)
+        self.store = get_csv_store(filename)
+        self.rollup_stores = {
+            interval: get_csv_store(get_rollup_filename(filename, interval))
+            for interval in self.intervals
+        }
+
+    def rolled_until(self):
+        """
+        Get the end of the last bucket written for each interval
+
+        Returns
+        -------
+        dict
+            unix time keyed by interval, 0 for intervals without buckets.
+
+        """
+        rolled_until = {}
+        for interval, store in self.rollup_stores.items():
+            last_row = store.last_row()
+            start = parse_timestamp(last_row and last_row.get("timestamp"))
+            rolled_until[interval] = (
+                0 if start is None else start + ROLLUP_INTERVALS[interval]
+            )
+
+        return rolled_until
+
+    def run(self, now: float = None):
+        """
+        Roll up the rows added since the last run
+
+        Parameters
+        ----------
+        now : float, optional
+            unix time closing the last buckets. The default is None, using
+            the clock.
+
+        Returns
+        -------
+        dict
+            number of buckets written keyed by interval.
+
+        """
+        if now is None:
+            now = time.time()
+
+        rolled_until = self.rolled_until()
+        oldest = min(rolled_until.values())
+        buckets = dict.fromkeys(self.intervals)
+        written = dict.fromkeys(self.intervals, 0)
+
+        for path in self.store.segments():
+            last_row = self.store.last_row(path)
+            last_timestamp = parse_timestamp(
+                last_row and last_row.get("timestamp")
+            )
+            if last_timestamp is not None and last_timestamp < oldest:
+                continue
+
+            for row in self._iter_segment(path):
+                timestamp = parse_timestamp(row.get("timestamp"))
+                if timestamp is None:
+                    continue
+
+                for interval in self.intervals:
+                    if timestamp < rolled_until[interval]:
+                        continue
+
+                    width = ROLLUP_INTERVALS[interval]
+                    start = timestamp - timestamp % width
+                    bucket = buckets[interval]
+                    if bucket is not None and start > bucket.start:
+                        self.rollup_stores[interval].append(bucket.to_row())
+                        written[interval] += 1
+                        bucket = None
+                    if bucket is None:
+                        bucket = buckets[interval] = Bucket(start)
+
+                    bucket.add(row)
+
+        for interval, bucket in buckets.items():
+            if (
+                bucket is not None
+                and bucket.start + ROLLUP_INTERVALS[interval] <= now
+            ):
+                self.rollup_stores[interval].append(bucket.to_row())
+                written[interval] += 1
+
+        return written
+
+    def prune(self, retention: float, now: float = None):
+        """
+        Delete raw segments whose rows are older than the retention window
+        and rolled up for every interval. The active segment is kept
+
+        Parameters
+        ----------
+        retention : float
+            seconds of raw rows to keep.
+        now : float, optional
+            unix time the window ends at. The default is None, using the
+            clock.
+
+        Returns
+        -------
+        list
+            paths of the deleted segments.
+
+        """
+        if now is None:
+            now = time.time()
+
+        cutoff = min([now - retention] + list(self.rolled_until().values()))
+
+        deleted = []
+        for path in self.store.segments()[:-1]:
+            last_row = self.store.last_row(path)
+            last_timestamp = parse_timestamp(
+                last_row and last_row.get("timestamp")
+            )
+            if last_timestamp is None or last_timestamp >= cutoff:
+                break
+
+            os.remove(path)
+            deleted.append(path)
+            self.log.info("Pruned {}".format(path))
+
+        return deleted
+
+    @staticmethod
+    def _iter_segment(path: str):
+        with open(path, newline='') as f:
+            yield from csv.DictReader(f)
+
+
+def compact_stats(
+    chain: str, intervals: list = None, retention: float = None
+):
+    """
+    Roll up the csv stats of a chain, see StatRollup, and prune their raw
+    segments past the retention window
+
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+    intervals : list, optional
+        keys of ROLLUP_INTERVALS. The default is None, all of them.
+    retention : float, optional
+        seconds of raw rows to keep. The default is None, keeping all.
+
+    Returns
+    -------
+    dict
+        buckets written per interval, keyed by filename.
+
+    """
+    written = {}
+    for filename in get_stat_filenames(chain):
+        rollup = StatRollup(filename, intervals)
+        if not rollup.store.segments():
+            continue
+
+        written[filename] = rollup.run()
+        if retention is not None:
+            rollup.prune(retention)
+
+    return written
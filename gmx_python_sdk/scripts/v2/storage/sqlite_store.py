@@ -0,0 +1,253 @@
+import os
+import sqlite3
+import threading
+import time
+
+from ..gmx_utils import package_dir
+
+# Seconds a writer waits for another process holding the write lock
+SQLITE_BUSY_TIMEOUT = 30
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS stats (
+        chain TEXT NOT NULL,
+        parameter TEXT NOT NULL,
+        market TEXT NOT NULL,
+        side TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        block_number INTEGER,
+        value
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS stats_chain_parameter_market_timestamp
+    ON stats (chain, parameter, market, timestamp)
+    """
+)
+
+
+def get_stat_rows(data: dict):
+    """
+    Split the output of a stat into one (market, side, value) row per market
+    and side. Values of stats without sides, eg gm prices, get an empty side
+
+    Parameters
+    ----------
+    data : dict
+        output of a stat.
+
+    Returns
+    -------
+    list
+        (market, side, value) tuples.
+
+    """
+    rows = []
+    for key, value in data.items():
+        if key in ("parameter", "block_number"):
+            continue
+
+        if isinstance(value, dict):
+            rows += [
+                (market, key, to_sql_value(market_value))
+                for market, market_value in value.items()
+            ]
+        else:
+            rows.append((key, "", to_sql_value(value)))
+
+    return rows
+
+
+def to_sql_value(value):
+    """
+    Convert a stat value to a type SQLite stores. Integers beyond 64 bits
+    and numpy numbers become floats, anything else not numeric a string
+
+    Parameters
+    ----------
+    value : object
+        value of a stat.
+
+    Returns
+    -------
+    int, float, str or None
+        value to insert.
+
+    """
+    if value is None or isinstance(value, (float, str)):
+        return value
+    if isinstance(value, int):
+        if -2 ** 63 <= value < 2 ** 63:
+            return int(value)
+        return float(value)
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class SQLiteStore:
+    """
+    SQLite database of collected stats, one row per chain, parameter,
+    market, side and timestamp, indexed for range queries of a market.
+    The database runs in WAL mode, so several collector processes can write
+    to it while dashboards read. Each stat is inserted in one transaction
+    """
+
+    def __init__(
+        self,
+        filepath: str = os.path.join(package_dir, "data_store", "stats.db")
+    ):
+        self.filepath = filepath
+
+        self._local = threading.local()
+
+    def get_connection(self):
+        """
+        Get the connection of the calling thread, opening it on first use
+
+        Returns
+        -------
+        sqlite3.Connection
+            connection to the database.
+
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            connection = sqlite3.connect(
+                self.filepath,
+                timeout=SQLITE_BUSY_TIMEOUT
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+            self._local.connection = connection
+
+        return connection
+
+    def append(
+        self, chain: str, parameter: str, data: dict, timestamp: float = None
+    ):
+        """
+        Insert the output of a stat, in one transaction
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat, eg open_interest.
+        data : dict
+            output of the stat.
+        timestamp : float, optional
+            unix time of the stat. The default is None, using now.
+
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        block_number = data.get("block_number")
+        rows = [
+            (
+                chain, parameter, market, side, timestamp, block_number,
+                value
+            )
+            for market, side, value in get_stat_rows(data)
+        ]
+
+        connection = self.get_connection()
+        with connection:
+            connection.executemany(
+                "INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def query(
+        self, chain: str, parameter: str, markets: list = None,
+        start: float = None, end: float = None, side: str = None
+    ):
+        """
+        Read a stat over a time range, for a subset of markets
+
+        Parameters
+        ----------
+        chain : str
+            arbitrum or avalanche.
+        parameter : str
+            name of the stat, eg open_interest.
+        markets : list, optional
+            markets to read. The default is None, all.
+        start : float, optional
+            first unix time included. The default is None.
+        end : float, optional
+            first unix time excluded. The default is None.
+        side : str, optional
+            long, short or another side of the stat. The default is None,
+            all sides.
+
+        Returns
+        -------
+        list
+            (timestamp, market, side, value, block_number) tuples ordered
+            by market and time.
+
+        """
+        clauses = ["chain = ?", "parameter = ?"]
+        parameters = [chain, parameter]
+
+        if markets is not None:
+            clauses.append(
+                "market IN ({})".format(", ".join("?" * len(markets)))
+            )
+            parameters += list(markets)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            parameters.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            parameters.append(end)
+        if side is not None:
+            clauses.append("side = ?")
+            parameters.append(side)
+
+        return self.get_connection().execute(
+            "SELECT timestamp, market, side, value, block_number FROM stats "
+            "WHERE {} ORDER BY market, timestamp".format(
+                " AND ".join(clauses)
+            ),
+            parameters
+        ).fetchall()
+
+    def read(self, *args, **kwargs):
+        """
+        Same as query, returning a dataframe
+
+        Returns
+        -------
+        pd.DataFrame
+            timestamp, market, side, value and block_number columns.
+
+        """
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.query(*args, **kwargs),
+            columns=["timestamp", "market", "side", "value", "block_number"]
+        )
+
+    def close(self):
+        """
+        Close the connection of the calling thread
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+sqlite_store = SQLiteStore()
@@ -0,0 +1,437 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from ..gmx_utils import package_dir
+
+# Default number of ticks held before the oldest are overwritten, about a
+# day of one second polls of 48 tokens. The file is sparse until written
+ORACLE_TICK_CAPACITY = 2 ** 22
+
+TICK_BUFFER_MAGIC = b"GMXTICK1"
+
+# Fixed 64 byte header at the start of the file. write_index counts every
+# tick ever written, so the ring position of a tick is its index modulo
+# capacity
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("record_size", "<u4"),
+        ("reserved", "<u4"),
+        ("capacity", "<u8"),
+        ("write_index", "<u8"),
+        ("retention", "<f8"),
+        ("padding", "V24")
+    ]
+)
+
+# Prices are 30 decimal integers which can exceed 64 bits, so each is split
+# into its high and low 64 bits
+TICK_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("token", "<u4"),
+        ("reserved", "<u4"),
+        ("min_price_hi", "<u8"),
+        ("min_price_lo", "<u8"),
+        ("max_price_hi", "<u8"),
+        ("max_price_lo", "<u8")
+    ]
+)
+
+
+def split_price(price: int):
+    """
+    Split a 128 bit price into its high and low 64 bits
+
+    Parameters
+    ----------
+    price : int
+        price in 30 decimal format.
+
+    Returns
+    -------
+    tuple
+        high and low 64 bits.
+
+    """
+    return price >> 64, price & 0xFFFFFFFFFFFFFFFF
+
+
+def join_price(hi: int, lo: int):
+    """
+    Join the high and low 64 bits of a price
+
+    Parameters
+    ----------
+    hi : int
+        high 64 bits.
+    lo : int
+        low 64 bits.
+
+    Returns
+    -------
+    int
+        price in 30 decimal format.
+
+    """
+    return (int(hi) << 64) | int(lo)
+
+
+def get_price_array(ticks, side: str = "min"):
+    """
+    Get the prices of an array of ticks as floats, for analysis where the
+    precision of a float is enough
+
+    Parameters
+    ----------
+    ticks : np.ndarray
+        array of TICK_DTYPE.
+    side : str, optional
+        min or max. The default is "min".
+
+    Returns
+    -------
+    np.ndarray
+        prices in 30 decimal format as float64.
+
+    """
+    return (
+        ticks[side + "_price_hi"].astype(np.float64) * 2.0 ** 64
+        + ticks[side + "_price_lo"].astype(np.float64)
+    )
+
+
+class OracleTickBuffer:
+    """
+    Fixed-width ring buffer of oracle price ticks in a memory-mapped file,
+    one row of (timestamp, token index, min price, max price) per token per
+    update. Once capacity ticks have been written the oldest are
+    overwritten. Token addresses are held in a json sidecar, ticks store
+    their index in it.
+
+    One process records, eg from an OraclePriceFeed:
+
+        ticks = OracleTickBuffer("arbitrum_ticks.bin")
+        feed.subscribe(ticks.record_table)
+
+    while any number of processes open the same file read only and get
+    numpy views of the ticks without copying or parsing anything:
+
+        ticks = OracleTickBuffer("arbitrum_ticks.bin", readonly=True)
+        for view in ticks.views():
+            ...
+    """
+
+    def __init__(
+        self, filepath: str, capacity: int = ORACLE_TICK_CAPACITY,
+        retention: float = None, readonly: bool = False
+    ):
+        self.filepath = filepath
+        self.tokens_filepath = filepath + ".tokens.json"
+        self.readonly = readonly
+
+        self._lock = threading.Lock()
+        self._tokens = []
+        self._token_index = {}
+
+        if not os.path.exists(filepath):
+            if readonly:
+                raise FileNotFoundError(filepath)
+            self._create(capacity, retention)
+
+        mode = "r" if readonly else "r+"
+        self._header = np.memmap(
+            filepath,
+            dtype=HEADER_DTYPE,
+            mode=mode,
+            shape=(1,)
+        )
+        if (
+            self._header["magic"][0] != TICK_BUFFER_MAGIC
+            or self._header["record_size"][0] != TICK_DTYPE.itemsize
+        ):
+            raise Exception(
+                "{} is not an oracle tick buffer!".format(filepath)
+            )
+
+        self.capacity = int(self._header["capacity"][0])
+        self._ticks = np.memmap(
+            filepath,
+            dtype=TICK_DTYPE,
+            mode=mode,
+            offset=HEADER_DTYPE.itemsize,
+            shape=(self.capacity,)
+        )
+
+        self._load_tokens()
+
+    @property
+    def write_index(self) -> int:
+        """
+        Number of ticks written since the buffer was created
+        """
+        return int(self._header["write_index"][0])
+
+    @property
+    def retention(self):
+        """
+        Seconds of ticks, before the newest one, that reads return. None
+        returns every tick still in the buffer
+        """
+        retention = float(self._header["retention"][0])
+
+        return retention if retention > 0 else None
+
+    def set_retention(self, retention: float):
+        """
+        Set the retention window
+
+        Parameters
+        ----------
+        retention : float
+            seconds of ticks reads return, None for every tick held.
+
+        """
+        self._header["retention"][0] = retention or 0
+
+    @property
+    def tokens(self):
+        """
+        Token addresses, indexed by the token field of the ticks
+        """
+        if self.readonly:
+            # The writer may have added tokens since the last read
+            self._load_tokens()
+
+        return self._tokens
+
+    def get_token_index(self, token_address: str):
+        """
+        Get the index ticks of a token are stored under
+
+        Parameters
+        ----------
+        token_address : str
+            contract address of token.
+
+        Returns
+        -------
+        int
+            token index, None if the token has no ticks.
+
+        """
+        if token_address not in self._token_index:
+            self._load_tokens()
+
+        return self._token_index.get(token_address)
+
+    def record(self, prices: dict, timestamp: float = None):
+        """
+        Append one tick per token
+
+        Parameters
+        ----------
+        prices : dict
+            output of OraclePrices.get_recent_prices, or (min, max) prices
+            keyed by token address.
+        timestamp : float, optional
+            unix time of the prices. The default is None, using now.
+
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            ticks = np.zeros(len(prices), dtype=TICK_DTYPE)
+            ticks["timestamp"] = timestamp
+
+            for row, (token_address, price) in enumerate(prices.items()):
+                if isinstance(price, dict):
+                    price = (price["minPriceFull"], price["maxPriceFull"])
+
+                ticks["token"][row] = self._add_token(token_address)
+                (
+                    ticks["min_price_hi"][row], ticks["min_price_lo"][row]
+                ) = split_price(int(price[0]))
+                (
+                    ticks["max_price_hi"][row], ticks["max_price_lo"][row]
+                ) = split_price(int(price[1]))
+
+            write_index = self.write_index
+            positions = (
+                np.arange(write_index, write_index + len(ticks))
+                % self.capacity
+            )
+            self._ticks[positions] = ticks
+
+            # Published last, so readers never see a tick being written
+            self._header["write_index"][0] = write_index + len(ticks)
+
+    def record_table(self, table):
+        """
+        Append the prices of a PriceTable, for use as an OraclePriceFeed
+        subscriber
+
+        Parameters
+        ----------
+        table : PriceTable
+            prices published by the feed.
+
+        """
+        self.record(table.prices, table.updated_at)
+
+    def views(self):
+        """
+        Get zero-copy views of the ticks held, oldest first. Ticks are
+        returned in two views when they wrap around the end of the buffer.
+        The retention window is not applied, and a view can be overwritten
+        by the writer once it falls behind by capacity ticks
+
+        Returns
+        -------
+        list
+            arrays of TICK_DTYPE.
+
+        """
+        write_index = self.write_index
+        start = max(0, write_index - self.capacity)
+        if write_index == start:
+            return []
+
+        first = start % self.capacity
+        last = write_index % self.capacity
+        if first < last:
+            return [self._ticks[first:last]]
+
+        return [self._ticks[first:], self._ticks[:last]]
+
+    def read(
+        self, start: float = None, end: float = None,
+        token_address: str = None
+    ):
+        """
+        Copy the ticks within the retention window, optionally filtered by
+        time and token
+
+        Parameters
+        ----------
+        start : float, optional
+            first unix time included. The default is None.
+        end : float, optional
+            first unix time excluded. The default is None.
+        token_address : str, optional
+            token to read ticks of. The default is None, all tokens.
+
+        Returns
+        -------
+        np.ndarray
+            array of TICK_DTYPE, oldest first.
+
+        """
+        write_index = self.write_index
+        views = self.views()
+        ticks = (
+            np.concatenate(views) if views
+            else np.zeros(0, dtype=TICK_DTYPE)
+        )
+
+        # Drop ticks the writer overwrote while they were copied
+        overwritten = self.write_index - self.capacity
+        held_from = max(0, write_index - self.capacity)
+        if overwritten > held_from:
+            ticks = ticks[overwritten - held_from:]
+
+        mask = np.ones(len(ticks), dtype=bool)
+        if self.retention is not None and len(ticks):
+            mask &= ticks["timestamp"] >= (
+                ticks["timestamp"][-1] - self.retention
+            )
+        if start is not None:
+            mask &= ticks["timestamp"] >= start
+        if end is not None:
+            mask &= ticks["timestamp"] < end
+        if token_address is not None:
+            token_index = self.get_token_index(token_address)
+            if token_index is None:
+                return ticks[:0]
+            mask &= ticks["token"] == token_index
+
+        return ticks[mask]
+
+    def flush(self):
+        """
+        Write the buffer to disk. Not needed for readers in other processes,
+        which share the mapped pages
+        """
+        self._ticks.flush()
+        self._header.flush()
+
+    def _create(self, capacity: int, retention: float):
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"] = TICK_BUFFER_MAGIC
+        header["record_size"] = TICK_DTYPE.itemsize
+        header["capacity"] = capacity
+        header["retention"] = retention or 0
+
+        temporary_filepath = "{}.{}.tmp".format(self.filepath, os.getpid())
+        with open(temporary_filepath, "wb") as f:
+            f.write(header.tobytes())
+            f.truncate(HEADER_DTYPE.itemsize + capacity * TICK_DTYPE.itemsize)
+        os.replace(temporary_filepath, self.filepath)
+
+    def _load_tokens(self):
+        try:
+            with open(self.tokens_filepath) as f:
+                self._tokens = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self._token_index = {
+            token_address: index
+            for index, token_address in enumerate(self._tokens)
+        }
+
+    def _add_token(self, token_address: str):
+        index = self._token_index.get(token_address)
+        if index is not None:
+            return index
+
+        # The sidecar is saved before any tick refers to the new index
+        self._tokens = self._tokens + [token_address]
+        self._token_index[token_address] = len(self._tokens) - 1
+
+        temporary_filepath = "{}.{}.tmp".format(
+            self.tokens_filepath,
+            os.getpid()
+        )
+        with open(temporary_filepath, "w") as f:
+            json.dump(self._tokens, f)
+        os.replace(temporary_filepath, self.tokens_filepath)
+
+        return self._token_index[token_address]
+
+
+def get_tick_buffer_filepath(chain: str):
+    """
+    Get the default path of the tick buffer of a chain in the datastore
+
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+
+    Returns
+    -------
+    str
+        path of the buffer file.
+
+    """
+    return os.path.join(
+        package_dir,
+        "data_store",
+        "{}_oracle_ticks.bin".format(chain)
+    )
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from .gmx_utils import package_dir
+from .rpc.single_flight import single_flight
+
+TOKENS_URL = {
+    "arbitrum": "https://arbitrum-api.gmxinfra.io/tokens",
+    "avalanche": "https://avalanche-api.gmxinfra.io/tokens"
+}
+
+# Seconds before the token list is revalidated against the api
+TOKEN_REGISTRY_TTL = 3600
+
+
+class TokenRegistry:
+    """
+    Token list of the GMX infra api for one chain, held in memory and
+    persisted to the datastore directory. Once older than ttl the list is
+    revalidated with its ETag, so an unchanged list costs a 304 response
+    """
+
+    def __init__(
+        self, chain: str, ttl: float = TOKEN_REGISTRY_TTL,
+        cache_dir: str = os.path.join(package_dir, "data_store")
+    ):
+        self.chain = chain
+        self.ttl = ttl
+        self.cache_filepath = os.path.join(
+            cache_dir,
+            "{}_tokens_cache.json".format(chain)
+        )
+
+        self.log = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._symbol_index = {}
+        self._etag = None
+        self._fetched_at = 0
+
+        self._load_cache_file()
+
+    def get_tokens(self):
+        """
+        Get the dictionary of tokens, keyed by address. Should be treated as
+        read only
+
+        Returns
+        -------
+        dict
+            dictionary containing available tokens to trade on GMX.
+
+        """
+        self.refresh()
+        return self._tokens
+
+    def get_address_by_symbol(self, symbol: str):
+        """
+        Get the contract address of a token from its symbol
+
+        Parameters
+        ----------
+        symbol : str
+            token symbol.
+
+        Returns
+        -------
+        str
+            contract address of token.
+
+        """
+        self.refresh()
+        try:
+            return self._symbol_index[symbol]
+        except KeyError:
+            raise Exception('"{}" not a known token for GMX v2!'.format(symbol))
+
+    def get_decimals(self, address: str):
+        """
+        Get the decimals of a token from its address
+
+        Parameters
+        ----------
+        address : str
+            contract address of token.
+
+        Returns
+        -------
+        int
+            number of decimals of the token.
+
+        """
+        return self.get_tokens()[address]['decimals']
+
+    def refresh(self, force: bool = False):
+        """
+        Revalidate the token list if it is older than ttl
+
+        Parameters
+        ----------
+        force : bool, optional
+            pass True to revalidate regardless of age. The default is False.
+
+        """
+        if not force and time.time() - self._fetched_at < self.ttl:
+            return
+
+        # Concurrent callers share one revalidation request
+        single_flight.do(
+            ("token_registry", self.chain, self.cache_filepath),
+            lambda: self._revalidate(force)
+        )
+
+    def _revalidate(self, force: bool):
+        with self._lock:
+            # another thread may have refreshed while we waited for the lock
+            if not force and time.time() - self._fetched_at < self.ttl:
+                return
+
+            headers = {}
+            if self._etag is not None and self._tokens:
+                headers['If-None-Match'] = self._etag
+
+            try:
+                response = requests.get(TOKENS_URL[self.chain], headers=headers)
+            except requests.RequestException as e:
+                if not self._tokens:
+                    raise
+                self.log.warning(
+                    "Using cached token list, request failed: {}".format(e)
+                )
+                return
+
+            if response.status_code == 304:
+                self._fetched_at = time.time()
+            elif response.status_code == 200:
+                self._set_tokens(
+                    response.json()['tokens'],
+                    response.headers.get('ETag'),
+                    time.time()
+                )
+            elif not self._tokens:
+                raise Exception(
+                    "Error fetching tokens: {}".format(response.status_code)
+                )
+            else:
+                self.log.warning(
+                    "Using cached token list, request failed: {}".format(
+                        response.status_code
+                    )
+                )
+                return
+
+            self._save_cache_file()
+
+    def _set_tokens(self, token_infos: list, etag: str, fetched_at: float):
+        tokens = {}
+        symbol_index = {}
+        for token_info in token_infos:
+            tokens[token_info['address']] = token_info
+
+            # keep the first match, as a linear search over the list would
+            symbol_index.setdefault(token_info['symbol'], token_info['address'])
+
+        self._tokens = tokens
+        self._symbol_index = symbol_index
+        self._etag = etag
+        self._fetched_at = fetched_at
+
+    def _load_cache_file(self):
+        # An unreadable or malformed cache is treated as missing
+        try:
+            with open(self.cache_filepath) as f:
+                cached = json.load(f)
+
+            # the tokens are only replaced once every entry is indexed
+            self._set_tokens(
+                list(cached['tokens'].values()),
+                cached['etag'],
+                float(cached['fetched_at'])
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    def _save_cache_file(self):
+        temporary_filepath = self.cache_filepath + ".tmp"
+        try:
+            with open(temporary_filepath, 'w') as f:
+                json.dump(
+                    {
+                        "etag": self._etag,
+                        "fetched_at": self._fetched_at,
+                        "tokens": self._tokens
+                    },
+                    f
+                )
+            os.replace(temporary_filepath, self.cache_filepath)
+        except OSError as e:
+            self.log.warning("Could not save token cache: {}".format(e))
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_token_registry(chain: str):
+    """
+    Get the process-wide token registry for a chain
+
+    Parameters
+    ----------
+    chain : str
+        arbitrum or avalanche.
+
+    Returns
+    -------
+    TokenRegistry
+        token registry of the chain.
+
+    """
+    with _registries_lock:
+        if chain not in _registries:
+            _registries[chain] = TokenRegistry(chain)
+
+        return _registries[chain]
@@ -0,0 +1,27 @@
+import pytest
+
+from eth_abi import encode
+from web3 import Web3
+
+# Contract with a single view function, its calls are encoded and decoded
+# like real ones without a node
+VALUE_ABI = [
+    {
+        "inputs": [{"name": "key", "type": "uint256"}],
+        "name": "value",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+CONTRACT_ADDRESS = "0x" + "11" * 20
+
+
+def encode_value(value: int):
+    return encode(["uint256"], [value])
+
+
+@pytest.fixture
+def contract():
+    return Web3().eth.contract(address=CONTRACT_ADDRESS, abi=VALUE_ABI)
@@ -0,0 +1,94 @@
+import asyncio
+import types
+
+import pytest
+
+from conftest import encode_value
+from gmx_python_sdk.scripts.v2.rpc import async_rpc
+from gmx_python_sdk.scripts.v2.rpc.async_rpc import AsyncSessionPool
+from gmx_python_sdk.scripts.v2.rpc.http_provider import RPC_REQUEST_TIMEOUT
+
+pytest.importorskip("aiohttp")
+
+
+def test_semaphore_per_concurrency():
+    pool = AsyncSessionPool()
+
+    async def get_semaphores():
+        return (
+            pool.get_semaphore(2),
+            pool.get_semaphore(4),
+            pool.get_semaphore(2)
+        )
+
+    first, second, third = asyncio.run(get_semaphores())
+    assert first is third
+    assert first is not second
+    assert second._value == 4
+
+
+def test_closed_loops_are_dropped():
+    pool = AsyncSessionPool()
+
+    async def get_semaphore():
+        pool.get_semaphore(2)
+        return len(pool._semaphores)
+
+    for _ in range(3):
+        assert asyncio.run(get_semaphore()) == 1
+
+
+def test_session_has_request_timeout():
+    pool = AsyncSessionPool()
+
+    async def get_session():
+        session = pool.get_session()
+        assert pool.get_session() is session
+        timeout = session.timeout
+        await pool.close()
+        return timeout, session.closed
+
+    timeout, closed = asyncio.run(get_session())
+    assert timeout.total == RPC_REQUEST_TIMEOUT
+    assert closed
+    assert pool._sessions == {}
+
+
+def test_only_throttled_calls_are_resent(contract, monkeypatch):
+    throttled = {1}
+    batches = []
+
+    async def post_json(rpc, payloads, concurrency):
+        if isinstance(payloads, dict):
+            return (await post_json(rpc, [payloads], concurrency))[0]
+
+        batches.append(len(payloads))
+        output = []
+        for payload in payloads:
+            key = int(payload["params"][0]["data"][-64:], 16)
+            if key in throttled:
+                throttled.remove(key)
+                error = {"code": -32005, "message": "slow down"}
+                output.append({"id": payload["id"], "error": error})
+            else:
+                result = "0x" + encode_value(key * 10).hex()
+                output.append({"id": payload["id"], "result": result})
+
+        return output
+
+    monkeypatch.setattr(async_rpc, "post_json", post_json)
+    calls = [contract.functions.value(key) for key in range(3)]
+    batch = [
+        (index, call, call._encode_transaction_data())
+        for index, call in enumerate(calls)
+    ]
+    config = types.SimpleNamespace(rpc="http://async", async_concurrency=4)
+
+    outputs = asyncio.run(
+        async_rpc._execute_json_rpc_batch(batch, config, "latest")
+    )
+
+    assert [int.from_bytes(output, "big") for output in outputs] == [
+        0, 10, 20
+    ]
+    assert batches == [3, 1]
@@ -0,0 +1,130 @@
+import pytest
+
+from conftest import encode_value
+from gmx_python_sdk.scripts.v2.rpc import batch_rpc
+from gmx_python_sdk.scripts.v2.rpc.call_cache import CallCache
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, output=None):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = str(output)
+        self._output = output
+
+    def json(self):
+        return self._output
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception("HTTP {}".format(self.status_code))
+
+
+class FakeSession:
+    """
+    Node answering each eth_call with its key times ten, refusing batches
+    larger than max_batch with a 413, or only answering the first
+    max_batch requests when partial is set
+    """
+
+    def __init__(
+        self, max_batch: int, partial: bool = False, errors=(),
+        throttled=()
+    ):
+        self.max_batch = max_batch
+        self.partial = partial
+        self.errors = set(errors)
+        self.throttled = set(throttled)
+        self.batches = []
+
+    def post(self, url, json):
+        self.batches.append(len(json))
+        if len(json) > self.max_batch and not self.partial:
+            return FakeResponse(413, "request entity too large")
+
+        output = []
+        for payload in json[:self.max_batch]:
+            key = int(payload["params"][0]["data"][-64:], 16)
+            if key in self.throttled:
+                # throttled once, answered when resent
+                self.throttled.remove(key)
+                output.append(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": payload["id"],
+                        "error": {"code": 429, "message": "slow down"}
+                    }
+                )
+                continue
+            if key in self.errors:
+                output.append(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": payload["id"],
+                        "error": {"code": 3, "message": "execution reverted"}
+                    }
+                )
+                continue
+
+            output.append(
+                {
+                    "jsonrpc": "2.0",
+                    "id": payload["id"],
+                    "result": "0x" + encode_value(key * 10).hex()
+                }
+            )
+
+        return FakeResponse(200, output)
+
+
+@pytest.fixture(autouse=True)
+def empty_call_cache(monkeypatch):
+    monkeypatch.setattr(batch_rpc, "call_cache", CallCache())
+
+
+def test_batch_size_halves_on_413(contract):
+    session = FakeSession(max_batch=2)
+    calls = [contract.functions.value(key) for key in range(5)]
+
+    results = batch_rpc.execute_batch_rpc(
+        calls, "http://batch-413", batch_size=8, session=session
+    )
+
+    assert results == [0, 10, 20, 30, 40]
+    assert session.batches[:3] == [5, 4, 2]
+    assert max(session.batches[3:]) <= 2
+
+
+def test_batch_size_halves_on_partial_response(contract):
+    session = FakeSession(max_batch=3, partial=True)
+    calls = [contract.functions.value(key) for key in range(6)]
+
+    results = batch_rpc.execute_batch_rpc(
+        calls, "http://batch-partial", batch_size=6, session=session
+    )
+
+    assert results == [0, 10, 20, 30, 40, 50]
+    assert session.batches == [6, 3, 3]
+
+
+def test_failed_call_decodes_to_none(contract):
+    session = FakeSession(max_batch=10, errors={1})
+    calls = [contract.functions.value(key) for key in range(3)]
+
+    results = batch_rpc.execute_batch_rpc(
+        calls, "http://batch-error", session=session
+    )
+
+    assert results == [0, None, 20]
+
+
+def test_only_throttled_calls_are_resent(contract):
+    session = FakeSession(max_batch=10, errors={0}, throttled={2, 3})
+    calls = [contract.functions.value(key) for key in range(5)]
+
+    results = batch_rpc.execute_batch_rpc(
+        calls, "http://batch-throttled", session=session
+    )
+
+    assert results == [None, 10, 20, 30, 40]
+    assert session.batches == [5, 2]
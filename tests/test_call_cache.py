@@ -0,0 +1,73 @@
+from gmx_python_sdk.scripts.v2.rpc import call_cache as call_cache_module
+from gmx_python_sdk.scripts.v2.rpc.call_cache import CallCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_key():
+    assert CallCache.make_key("arbitrum", "0xAB", "0xCD", "0x10") == (
+        "arbitrum", "0xab", "0xcd", 16
+    )
+    assert CallCache.make_key("arbitrum", "0xab", "0xcd", "latest")[3] == (
+        "latest"
+    )
+    assert CallCache.make_key("arbitrum", "0xab", "0xcd", "pending") is None
+
+
+def test_latest_reads_expire(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(call_cache_module.time, "monotonic", clock)
+    cache = CallCache(latest_ttl=2.0)
+    latest = cache.make_key("arbitrum", "0xab", "0xcd", "latest")
+    pinned = cache.make_key("arbitrum", "0xab", "0xcd", 100)
+
+    cache.put(latest, "0x01")
+    cache.put(pinned, "0x02")
+    clock.now = 1.0
+    assert cache.get(latest) == "0x01"
+
+    clock.now = 3.0
+    assert cache.get(latest) is None
+    assert cache.get(pinned) == "0x02"
+    assert cache.stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_least_recently_used_is_evicted():
+    cache = CallCache(max_size=2)
+    keys = [
+        cache.make_key("arbitrum", "0xab", "0xcd", block)
+        for block in (1, 2, 3)
+    ]
+
+    cache.put(keys[0], "0x01")
+    cache.put(keys[1], "0x02")
+    assert cache.get(keys[0]) == "0x01"
+    cache.put(keys[2], "0x03")
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "0x01"
+    assert cache.get(keys[2]) == "0x03"
+
+
+def test_configure_shrinks_and_disables():
+    cache = CallCache(max_size=4)
+    keys = [
+        cache.make_key("arbitrum", "0xab", "0xcd", block)
+        for block in (1, 2, 3)
+    ]
+    for key in keys:
+        cache.put(key, "0x01")
+
+    cache.configure(max_size=1)
+    assert cache.stats()["size"] == 1
+    assert cache.get(keys[2]) == "0x01"
+
+    cache.configure(max_size=0)
+    cache.put(keys[0], "0x01")
+    assert cache.get(keys[0]) is None
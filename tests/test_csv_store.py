@@ -0,0 +1,82 @@
+import multiprocessing
+
+from gmx_python_sdk.scripts.v2.storage.csv_store import CSVStore
+
+
+def test_append_and_read(tmp_path):
+    store = CSVStore("prices.csv", str(tmp_path))
+    store.append({"ETH": 1.0, "timestamp": "a"})
+    store.append({"ETH": 2.0, "timestamp": "b"})
+
+    assert store.segments() == [str(tmp_path / "prices.csv")]
+    assert store.read()["ETH"].tolist() == [1.0, 2.0]
+    assert store.last_row() == {"ETH": "2.0", "timestamp": "b"}
+
+
+def test_new_column_starts_segment(tmp_path):
+    store = CSVStore("prices.csv", str(tmp_path))
+    store.append({"ETH": 1.0})
+    store.append({"ETH": 2.0, "BTC": 3.0})
+
+    assert len(store.segments()) == 2
+    frame = store.read(columns=["ETH", "BTC"])
+    assert frame["ETH"].tolist() == [1.0, 2.0]
+    assert frame["BTC"].isna().tolist() == [True, False]
+
+
+def test_full_segment_rotates(tmp_path):
+    store = CSVStore("prices.csv", str(tmp_path), max_segment_bytes=50)
+    for value in range(20):
+        store.append({"ETH": value})
+
+    assert len(store.segments()) > 1
+    assert [int(row["ETH"]) for row in store.iter_rows()] == list(range(20))
+
+
+def test_pruned_leading_segments_are_skipped(tmp_path):
+    store = CSVStore("prices.csv", str(tmp_path))
+    store.append({"ETH": 1.0})
+    store.append({"ETH": 2.0, "BTC": 3.0})
+    (tmp_path / "prices.csv").unlink()
+
+    store = CSVStore("prices.csv", str(tmp_path))
+    store.append({"ETH": 4.0, "BTC": 5.0})
+    assert store.segment_indices() == [1]
+    assert store.read()["ETH"].tolist() == [2.0, 4.0]
+
+
+def test_writers_sharing_a_new_segment(tmp_path):
+    CSVStore("prices.csv", str(tmp_path)).append({"ETH": 0})
+
+    # Each writer brings a new column, so each starts a segment
+    claimed = []
+    for column in ("BTC", "SOL"):
+        store = CSVStore("prices.csv", str(tmp_path))
+        store._sync()
+        claimed.append(
+            store._write_segment(1, ["ETH", column], [{"ETH": 1, column: 1}])
+        )
+
+    assert claimed == [True, False]
+
+
+def _append_rows(directory, column):
+    store = CSVStore("prices.csv", directory)
+    for value in range(50):
+        store.append({"ETH": value, column: value})
+
+
+def test_concurrent_writers_lose_no_rows(tmp_path):
+    processes = [
+        multiprocessing.Process(
+            target=_append_rows,
+            args=(str(tmp_path), column)
+        )
+        for column in ("BTC", "SOL", "ARB", "LINK")
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert len(list(CSVStore("prices.csv", str(tmp_path)).iter_rows())) == 200
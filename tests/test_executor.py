@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.rpc.executor import SharedExecutor
+
+
+class ConcurrencyCounter:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, item):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        with self._lock:
+            self.running -= 1
+
+        return item * 2
+
+
+def test_map_keeps_order_and_caps_url():
+    executor = SharedExecutor(max_workers=16)
+    counter = ConcurrencyCounter()
+
+    assert executor.map(counter, range(40), "a", 4) == [
+        item * 2 for item in range(40)
+    ]
+    assert counter.max_running <= 4
+    stats = executor.stats()
+    assert stats["completed"] == 40
+    assert stats["queued"] == stats["active"] == 0
+    assert 0 < stats["workers"] <= 16
+    assert stats["endpoints"] == {}
+
+    executor.shutdown()
+
+
+def test_pool_of_urls_shares_a_slot_per_url():
+    executor = SharedExecutor(max_workers=16)
+    counter = ConcurrencyCounter()
+
+    executor.map(counter, range(40), ("a", "b"), 2)
+    assert 2 < counter.max_running <= 4
+
+    executor.shutdown()
+
+
+def test_pool_is_capped_as_a_whole():
+    executor = SharedExecutor(max_workers=16)
+    counter = ConcurrencyCounter()
+    release = threading.Event()
+
+    def call(item):
+        counter(item)
+        release.wait()
+
+    thread = threading.Thread(
+        target=executor.map, args=(call, range(10), ("a", "b"), 2)
+    )
+    thread.start()
+    time.sleep(0.1)
+
+    # Whichever url the pool sends them to, 4 calls hold the pool's slots
+    assert executor.stats()["endpoints"] == {("a", "b"): 4}
+
+    release.set()
+    thread.join()
+    assert executor.stats()["endpoints"] == {}
+
+    executor.shutdown()
+
+
+def test_limit_is_shared_across_configs():
+    executor = SharedExecutor(max_workers=16)
+    counter = ConcurrencyCounter()
+
+    # Two configs with different concurrency for the same url
+    threads = [
+        threading.Thread(
+            target=executor.map,
+            args=(counter, range(30), "a", concurrency)
+        )
+        for concurrency in (3, 2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.max_running <= 3
+
+    executor.shutdown()
+
+
+def test_failure_cancels_pending_calls():
+    executor = SharedExecutor(max_workers=2)
+
+    def call(item):
+        if item == 0:
+            raise ValueError("failed")
+        time.sleep(0.01)
+
+    with pytest.raises(ValueError):
+        executor.map(call, range(20), "a", 2)
+
+    executor.shutdown()
+    stats = executor.stats()
+    assert stats["queued"] == 0
+    assert stats["endpoints"] == {}
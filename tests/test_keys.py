@@ -0,0 +1,75 @@
+import pytest
+
+from gmx_python_sdk.scripts.v2 import keys
+from gmx_python_sdk.scripts.v2.gmx_utils import (
+    create_hash, create_hash_string
+)
+
+MARKET = "0x70d95587d40A2caf56bd97485aB3Eec10Bee6336"
+LONG_TOKEN = "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"
+SHORT_TOKEN = "0xaf88d065e77c8cC2239327C5EDb3A432268e5831"
+
+ADDRESS_ADDRESS = ["bytes32", "address", "address"]
+ADDRESS_BOOL = ["bytes32", "address", "bool"]
+
+
+@pytest.mark.parametrize("name, string", sorted(keys._KEY_STRINGS.items()))
+def test_constants_match_create_hash_string(name, string):
+    assert getattr(keys, name) == create_hash_string(string)
+
+
+def test_market_keys_match_create_hash():
+    market_keys = keys.get_market_keys(
+        [(MARKET, LONG_TOKEN, SHORT_TOKEN)]
+    )[MARKET]
+
+    expected = {
+        "long_pool_amount": (
+            ADDRESS_ADDRESS, [keys.POOL_AMOUNT, MARKET, LONG_TOKEN]
+        ),
+        "short_pool_amount": (
+            ADDRESS_ADDRESS, [keys.POOL_AMOUNT, MARKET, SHORT_TOKEN]
+        ),
+        "long_claimable_fee_amount": (
+            ADDRESS_ADDRESS, [keys.CLAIMABLE_FEE_AMOUNT, MARKET, LONG_TOKEN]
+        ),
+        "short_claimable_fee_amount": (
+            ADDRESS_ADDRESS, [keys.CLAIMABLE_FEE_AMOUNT, MARKET, SHORT_TOKEN]
+        )
+    }
+    for side, is_long in (("long", True), ("short", False)):
+        for stat in (
+            "reserve_factor", "open_interest_reserve_factor",
+            "max_open_interest"
+        ):
+            expected["{}_{}".format(side, stat)] = (
+                ADDRESS_BOOL, [getattr(keys, stat.upper()), MARKET, is_long]
+            )
+
+    assert set(market_keys) == set(expected)
+    for field, (types, values) in expected.items():
+        assert market_keys[field] == create_hash(types, values), field
+
+
+def test_key_functions_match_create_hash():
+    assert keys.pool_amount_key(MARKET, LONG_TOKEN) == create_hash(
+        ADDRESS_ADDRESS, [keys.POOL_AMOUNT, MARKET, LONG_TOKEN]
+    )
+    assert keys.reserve_factor_key(MARKET, False) == create_hash(
+        ADDRESS_BOOL, [keys.RESERVE_FACTOR, MARKET, False]
+    )
+    assert keys.open_interest_key(MARKET, SHORT_TOKEN, True) == create_hash(
+        ["bytes32", "address", "address", "bool"],
+        [keys.OPEN_INTEREST, MARKET, SHORT_TOKEN, True]
+    )
+    assert keys.min_collateral_factor_key(MARKET) == create_hash(
+        ["bytes32", "address"], [keys.MIN_COLLATERAL_FACTOR_KEY, MARKET]
+    )
+    assert keys.pool_amount_key(MARKET.lower(), LONG_TOKEN) == (
+        keys.pool_amount_key(MARKET, LONG_TOKEN)
+    )
+
+
+def test_invalid_address_is_rejected():
+    with pytest.raises(ValueError):
+        keys.pool_amount_key("0x1234", LONG_TOKEN)
@@ -0,0 +1,78 @@
+from gmx_python_sdk.scripts.v2.get.get_markets import (
+    MarketIndexes, MarketInfo, Markets
+)
+from gmx_python_sdk.scripts.v2.gmx_utils import (
+    find_dictionary_by_key_value, find_key_by_key_value
+)
+
+
+def get_market(symbol: str, index: str, long: str, short: str):
+    return {
+        "market_symbol": symbol,
+        "index_token_address": index,
+        "long_token_address": long,
+        "short_token_address": short
+    }
+
+
+INFO = {
+    "0xETH": get_market("ETH", "0xWETH", "0xWETH", "0xUSDC"),
+    "0xETH2": get_market("ETH2", "0xWETH", "0xWETH", "0xWETH"),
+    "0xSWAP": get_market("SWAP USDC-USDT", "0x0", "0xUSDC", "0xUSDT"),
+    "0xDOGE": get_market("DOGE", "0xDOGE", "0xWETH", "0xUSDC")
+}
+
+
+def get_markets():
+    markets = Markets.__new__(Markets)
+    indexes = MarketIndexes(INFO)
+    markets.info = MarketInfo(indexes.info, indexes)
+    markets._swap_markets_filtered = False
+
+    return markets
+
+
+def test_lookups_match_a_scan():
+    markets = get_markets()
+
+    assert markets.get_market_key_by_symbol("ETH2") == "0xETH2"
+    assert markets.get_market_key_by_index_token("0xWETH") == "0xETH"
+    assert markets.get_market_key_by_symbol("BTC") is None
+    assert markets.get_market_keys_by_token_pair("0xWETH", "0xUSDC") == [
+        "0xETH", "0xDOGE"
+    ]
+    assert markets.is_swap_market("0xSWAP")
+    assert list(markets.non_swap_info) == ["0xETH", "0xETH2", "0xDOGE"]
+
+
+def test_lookups_skip_removed_markets():
+    markets = get_markets()
+    del markets.info["0xETH"]
+
+    assert markets.get_market_key_by_index_token("0xWETH") == "0xETH2"
+    assert markets.get_market_keys_by_token_pair("0xWETH", "0xUSDC") == [
+        "0xDOGE"
+    ]
+
+    markets.filter_swap_markets()
+    assert "0xSWAP" not in markets.info
+    assert "0xSWAP" in INFO
+
+
+def test_unindexed_fields_are_scanned():
+    markets = get_markets()
+
+    assert markets.info.find_key("short_token_address", "0xUSDT") == (
+        "0xSWAP"
+    )
+
+
+def test_find_helpers_work_with_and_without_indexes():
+    for info in (get_markets().info, dict(INFO)):
+        assert find_key_by_key_value(info, "market_symbol", "DOGE") == (
+            "0xDOGE"
+        )
+        assert find_key_by_key_value(info, "market_symbol", "BTC") is None
+        assert find_dictionary_by_key_value(
+            info, "index_token_address", "0xDOGE"
+        ) is INFO["0xDOGE"]
@@ -0,0 +1,150 @@
+import types
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.get import get_market_info
+from gmx_python_sdk.scripts.v2.get.get_market_info import GetMarketInfo
+
+CONFIG = types.SimpleNamespace(chain="arbitrum")
+
+MARKET_KEYS = ["0xMARKET{}".format(index) for index in range(5)]
+
+PRICES = {
+    "0xINDEX": {"minPriceFull": "10", "maxPriceFull": "12"},
+    "0xLONG": {"minPriceFull": "20", "maxPriceFull": "22"},
+    "0xSHORT": {"minPriceFull": "1", "maxPriceFull": "1"}
+}
+
+
+def get_raw_market_info(market_key: str):
+    per_side = ((1, 2), (3, 4))
+    return (
+        (market_key, "0xINDEX", "0xLONG", "0xSHORT"),
+        100,
+        200,
+        (per_side, per_side),
+        (True, 5, 6, per_side, per_side),
+        (7, 8, 9),
+        False
+    )
+
+
+class FakeChain:
+    """
+    Reader answering getMarketInfoList pages and getMarketInfo calls,
+    reverting the pages starting at an index in reverted_pages
+    """
+
+    def __init__(self, reverted_pages=()):
+        self.reverted_pages = set(reverted_pages)
+        self.list_calls = []
+        self.market_calls = []
+
+        self.functions = self
+
+    def getMarketInfoList(self, datastore, prices, start, end):
+        return ("list", start, end, len(prices))
+
+    def getMarketInfo(self, datastore, prices, market_key):
+        return ("market", market_key)
+
+    def execute(self, calls, config):
+        outputs = []
+        for call in calls:
+            if call[0] == "market":
+                self.market_calls.append(call[1])
+                outputs.append(get_raw_market_info(call[1]))
+                continue
+
+            _, start, end, price_count = call
+            assert end - start == price_count
+            self.list_calls.append((start, end))
+            if start in self.reverted_pages:
+                outputs.append(None)
+            else:
+                outputs.append(
+                    [
+                        get_raw_market_info(market_key)
+                        for market_key in MARKET_KEYS[start:end]
+                    ]
+                )
+
+        return outputs
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    chain = FakeChain()
+    index_tokens = ["0xINDEX", "0xINDEX", "0xUNPRICED", "0xINDEX", "0xINDEX"]
+    registry = types.SimpleNamespace(
+        raw_markets=[
+            (market_key, index_token, "0xLONG", "0xSHORT")
+            for market_key, index_token in zip(MARKET_KEYS, index_tokens)
+        ],
+        info={
+            market_key: {
+                "index_token_address": index_token,
+                "long_token_address": "0xLONG",
+                "short_token_address": "0xSHORT"
+            }
+            for market_key, index_token in zip(MARKET_KEYS, index_tokens)
+        }
+    )
+    monkeypatch.setattr(
+        get_market_info, "get_reader_contract", lambda config: chain
+    )
+    monkeypatch.setattr(
+        get_market_info, "get_market_registry", lambda chain: registry
+    )
+    monkeypatch.setattr(get_market_info, "execute_threading", chain.execute)
+
+    return chain
+
+
+def get_fetcher(page_size: int = 25):
+    markets = types.SimpleNamespace(info=dict.fromkeys(MARKET_KEYS))
+    return GetMarketInfo(CONFIG, markets, page_size)
+
+
+def test_unpriced_markets_end_a_page(chain):
+    pages, calls = get_fetcher().build_calls(PRICES)
+
+    assert [(start, len(page)) for start, page in pages] == [(0, 2), (3, 2)]
+    assert pages[0][1][0] == (
+        "0xMARKET0", ((10, 12), (20, 22), (1, 1))
+    )
+    assert calls == [("list", 0, 2, 2), ("list", 3, 5, 2)]
+
+
+def test_pages_are_capped_at_page_size(chain):
+    pages, _ = get_fetcher(page_size=1).build_calls(PRICES)
+
+    assert [start for start, _ in pages] == [0, 1, 3, 4]
+
+
+def test_market_info_is_decoded_by_key(chain):
+    fetcher = get_fetcher()
+    pages, calls = fetcher.build_calls(PRICES)
+    market_info = fetcher.decode_outputs(pages, chain.execute(calls, CONFIG))
+
+    assert list(market_info) == [
+        "0xMARKET0", "0xMARKET1", "0xMARKET3", "0xMARKET4"
+    ]
+    assert market_info["0xMARKET3"]["market_address"] == "0xMARKET3"
+    assert market_info["0xMARKET3"]["borrowingFactorPerSecondForShorts"] == (
+        200
+    )
+    assert chain.market_calls == []
+
+
+def test_reverted_page_falls_back_to_get_market_info(chain):
+    chain.reverted_pages = {3}
+    fetcher = get_fetcher()
+    pages, calls = fetcher.build_calls(PRICES)
+
+    market_info = fetcher.decode_outputs(
+        pages, chain.execute(calls, CONFIG), ["0xMARKET1", "0xMARKET4"]
+    )
+
+    assert list(market_info) == ["0xMARKET1", "0xMARKET4"]
+    assert chain.market_calls == ["0xMARKET3", "0xMARKET4"]
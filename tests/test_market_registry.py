@@ -0,0 +1,122 @@
+import types
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.get import get_markets
+from gmx_python_sdk.scripts.v2.get.get_markets import MarketRegistry
+
+CONFIG = types.SimpleNamespace(chain="arbitrum")
+
+TOKENS = {
+    "0xINDEX": {"symbol": "ETH", "decimals": 18},
+    "0xLONG": {"symbol": "WETH", "decimals": 18},
+    "0xSHORT": {"symbol": "USDC", "decimals": 6}
+}
+
+
+class FakeChain:
+    """
+    Datastore and reader of a chain with count markets, answering
+    getMarkets pages from the on-chain list
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.count_calls = 0
+        self.pages = []
+
+        self.functions = self
+
+    def getAddressCount(self, key):
+        return types.SimpleNamespace(call=self._get_count)
+
+    def getMarkets(self, datastore, start, end):
+        return (start, end)
+
+    def execute(self, calls, config):
+        self.pages += calls
+        return [
+            [
+                ("0xMARKET{}".format(index), "0xINDEX", "0xLONG", "0xSHORT")
+                for index in range(start, min(end, self.count))
+            ]
+            for start, end in calls
+        ]
+
+    def _get_count(self):
+        self.count_calls += 1
+        return self.count
+
+
+class FakeOraclePrices:
+    priced = {"0xINDEX"}
+
+    def __init__(self, chain):
+        pass
+
+    def get_recent_prices(self):
+        return dict.fromkeys(self.priced)
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    chain = FakeChain(120)
+    monkeypatch.setattr(
+        get_markets, "get_datastore_contract", lambda config: chain
+    )
+    monkeypatch.setattr(
+        get_markets, "get_reader_contract", lambda config: chain
+    )
+    monkeypatch.setattr(get_markets, "execute_threading", chain.execute)
+    monkeypatch.setattr(
+        get_markets, "get_tokens_address_dict", lambda chain: TOKENS
+    )
+    monkeypatch.setattr(get_markets, "OraclePrices", FakeOraclePrices)
+
+    return chain
+
+
+def test_markets_are_read_in_pages(chain):
+    registry = MarketRegistry("arbitrum")
+
+    info = registry.get_markets(CONFIG)
+
+    assert chain.pages == [(0, 50), (50, 100), (100, 120)]
+    assert list(info)[:2] == ["0xMARKET0", "0xMARKET1"]
+    assert len(info) == 120
+    assert info["0xMARKET0"]["market_symbol"] == "ETH"
+
+
+def test_refresh_only_reads_new_markets(chain):
+    registry = MarketRegistry("arbitrum")
+    first = registry.get_markets(CONFIG)["0xMARKET0"]
+
+    chain.count = 125
+    chain.pages = []
+    info = registry.get_markets(CONFIG, force_refresh=True)
+
+    assert chain.pages == [(120, 125)]
+    assert len(info) == 125
+    assert info["0xMARKET0"] is first
+
+
+def test_count_is_checked_once_per_interval(chain):
+    registry = MarketRegistry("arbitrum", refresh_interval=60)
+
+    registry.get_markets(CONFIG)
+    registry.get_markets(CONFIG)
+    assert chain.count_calls == 1
+
+    registry.get_markets(CONFIG, force_refresh=True)
+    assert chain.count_calls == 2
+
+
+def test_unpriced_markets_are_retried(chain, monkeypatch):
+    monkeypatch.setattr(FakeOraclePrices, "priced", set())
+    registry = MarketRegistry("arbitrum")
+    assert registry.get_markets(CONFIG) == {}
+
+    monkeypatch.setattr(FakeOraclePrices, "priced", {"0xINDEX"})
+    chain.pages = []
+    assert len(registry.get_markets(CONFIG, force_refresh=True)) == 120
+    assert chain.pages == []
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import types
+
+import numpy as np
+import pytest
+
+from gmx_python_sdk.scripts.v2.get.get import AsyncGetData, GetData
+from gmx_python_sdk.scripts.v2.get.get_market_snapshot import (
+    MarketSnapshot, check_snapshot, compute_available_liquidity,
+    compute_borrow_apr, compute_claimable_fees, compute_gm_prices,
+    compute_open_interest, compute_pool_tvl
+)
+from gmx_python_sdk.scripts.v2.get.get_pool_tvl import GetPoolTVL
+
+CONFIG = types.SimpleNamespace(chain="arbitrum")
+
+WETH = {"decimals": 18}
+USDC = {"decimals": 6}
+
+MARKETS = {
+    "0xETH": {
+        "market_symbol": "ETH",
+        "long_token_address": "0xWETH",
+        "short_token_address": "0xUSDC",
+        "long_token_metadata": WETH,
+        "short_token_metadata": USDC
+    },
+    "0xETH2": {
+        "market_symbol": "ETH2",
+        "long_token_address": "0xWETH",
+        "short_token_address": "0xWETH",
+        "long_token_metadata": WETH,
+        "short_token_metadata": WETH
+    }
+}
+
+ORACLE_PRICES = {
+    "0xWETH": {
+        "minPriceFull": str(3000 * 10 ** 12),
+        "maxPriceFull": str(3002 * 10 ** 12)
+    }
+}
+
+
+def get_snapshot(inputs=None):
+    if inputs is None:
+        snapshot = MarketSnapshot(CONFIG)
+    else:
+        snapshot = MarketSnapshot(CONFIG, inputs=inputs)
+
+    snapshot.block_number = 100
+    snapshot.markets = types.SimpleNamespace(
+        info=MARKETS, non_swap_info=MARKETS
+    )
+    snapshot.oracle_prices = ORACLE_PRICES
+
+    for market_key, scale in (("0xETH", 1), ("0xETH2", 3)):
+        snapshot.open_interest[market_key] = {
+            "long_oi_with_pnl": 5 * scale * 10 ** 36,
+            "long_pnl": 10 ** 35,
+            "short_oi_with_pnl": 4 * scale * 10 ** 36,
+            "short_pnl": -(10 ** 35)
+        }
+        snapshot.pool_amounts[market_key] = {
+            "long": 7 * scale * 10 ** 20,
+            "short": 9 * scale * 10 ** 12
+        }
+        snapshot.reserve_factors[market_key] = {
+            "long_reserve_factor": 8 * 10 ** 29,
+            "long_open_interest_reserve_factor": 7 * 10 ** 29,
+            "short_reserve_factor": 6 * 10 ** 29,
+            "short_open_interest_reserve_factor": 9 * 10 ** 29
+        }
+        snapshot.claimable_fees[market_key] = {
+            "long": 2 * scale * 10 ** 18,
+            "short": 5 * scale * 10 ** 6
+        }
+        snapshot.gm_prices[market_key] = {
+            "price": (15 * scale * 10 ** 29, 0, 0)
+        }
+        snapshot.market_info[market_key] = {
+            "borrowingFactorPerSecondForLongs": 2 * scale * 10 ** 20,
+            "borrowingFactorPerSecondForShorts": 3 * scale * 10 ** 20
+        }
+
+    return snapshot
+
+
+def get_token_price(long_decimal_factor: int):
+    # median of the oracle min and max, as the baseline fetchers read it
+    oracle_precision = 10 ** (30 - long_decimal_factor)
+    return np.median(
+        [
+            float(ORACLE_PRICES["0xWETH"]["maxPriceFull"]) / oracle_precision,
+            float(ORACLE_PRICES["0xWETH"]["minPriceFull"]) / oracle_precision
+        ]
+    )
+
+
+def test_open_interest_matches_baseline():
+    snapshot = get_snapshot()
+    output = compute_open_interest(snapshot)
+
+    for market_key, market in MARKETS.items():
+        raw_output = snapshot.open_interest[market_key]
+        symbol = market["market_symbol"]
+        assert output["long"][symbol] == pytest.approx(
+            (raw_output["long_oi_with_pnl"] - raw_output["long_pnl"])
+            / 10 ** 30
+        )
+        assert output["short"][symbol] == pytest.approx(
+            (raw_output["short_oi_with_pnl"] - raw_output["short_pnl"])
+            / 10 ** 30
+        )
+
+
+def test_available_liquidity_matches_baseline():
+    snapshot = get_snapshot()
+    open_interest = compute_open_interest(snapshot)
+    output = compute_available_liquidity(snapshot, open_interest)
+
+    for market_key, market in MARKETS.items():
+        symbol = market["market_symbol"]
+        pool_amounts = snapshot.pool_amounts[market_key]
+        reserve_factors = snapshot.reserve_factors[market_key]
+        long_decimal_factor = market["long_token_metadata"]["decimals"]
+        long_precision = 10 ** (30 + long_decimal_factor)
+        short_precision = 10 ** (
+            30 + market["short_token_metadata"]["decimals"]
+        )
+        token_price = get_token_price(long_decimal_factor)
+
+        long_reserve_factor = reserve_factors["long_reserve_factor"]
+        if (
+            reserve_factors["long_open_interest_reserve_factor"]
+            < long_reserve_factor
+        ):
+            long_reserve_factor = (
+                reserve_factors["long_open_interest_reserve_factor"]
+            )
+        long_pool_amount = pool_amounts["long"]
+        if "2" in symbol:
+            long_pool_amount = long_pool_amount / 2
+        long_liquidity = (
+            long_pool_amount * long_reserve_factor / long_precision
+            * token_price - float(open_interest["long"][symbol])
+        )
+
+        short_reserve_factor = reserve_factors["short_reserve_factor"]
+        if (
+            reserve_factors["short_open_interest_reserve_factor"]
+            < short_reserve_factor
+        ):
+            short_reserve_factor = (
+                reserve_factors["short_open_interest_reserve_factor"]
+            )
+        short_liquidity = (
+            pool_amounts["short"] * short_reserve_factor / short_precision
+            - float(open_interest["short"][symbol])
+        )
+        if "2" in symbol:
+            short_liquidity = (
+                pool_amounts["short"] / 2 * short_reserve_factor
+                / short_precision * token_price
+                - float(open_interest["short"][symbol])
+            )
+
+        assert output["long"][symbol] == pytest.approx(long_liquidity)
+        assert output["short"][symbol] == pytest.approx(short_liquidity)
+
+
+def test_claimable_fees_match_baseline():
+    snapshot = get_snapshot()
+
+    total_fees = 0
+    for market_key, market in MARKETS.items():
+        long_decimal_factor = market["long_token_metadata"]["decimals"]
+        claimable_fees = snapshot.claimable_fees[market_key]
+        long_claimable_usd = (
+            claimable_fees["long"] / 10 ** (long_decimal_factor - 1)
+        ) * get_token_price(long_decimal_factor)
+        short_claimable_usd = claimable_fees["short"] / 10 ** 6
+        if "2" in market["market_symbol"]:
+            short_claimable_usd = 0
+        total_fees += long_claimable_usd + short_claimable_usd
+
+    assert compute_claimable_fees(snapshot)["total_fees"] == pytest.approx(
+        total_fees
+    )
+
+
+def test_gm_prices_borrow_apr_and_pool_tvl_match_baseline():
+    snapshot = get_snapshot()
+
+    assert compute_gm_prices(snapshot) == {
+        "ETH": pytest.approx(1.5), "ETH2": pytest.approx(4.5)
+    }
+
+    borrow_apr = compute_borrow_apr(snapshot)
+    assert borrow_apr["long"]["ETH"] == pytest.approx(
+        2 * 10 ** 20 / 10 ** 28 * 3600
+    )
+    assert borrow_apr["short"]["ETH2"] == pytest.approx(
+        9 * 10 ** 20 / 10 ** 28 * 3600
+    )
+
+    pool_tvl = compute_pool_tvl(snapshot)
+    assert pool_tvl["total_tvl"]["ETH"] == pytest.approx(
+        7 * 10 ** 20 / 10 ** 18 * get_token_price(18)
+        + 9 * 10 ** 12 / 10 ** 6
+    )
+    assert pool_tvl["short_token"]["ETH"] == "0xUSDC"
+
+
+def test_reverted_market_is_left_out_and_logged(caplog):
+    snapshot = get_snapshot()
+    snapshot.open_interest["0xETH2"]["long_pnl"] = None
+
+    with caplog.at_level(logging.WARNING):
+        output = compute_open_interest(snapshot)
+
+    assert list(output["long"]) == ["ETH"]
+    assert "Leaving ETH2 out of open_interest" in caplog.text
+
+
+def test_check_snapshot_names_missing_inputs():
+    snapshot = get_snapshot(inputs=("open_interest",))
+
+    check_snapshot(snapshot, "open_interest")
+    with pytest.raises(Exception, match="pool_amounts"):
+        check_snapshot(snapshot, "available_liquidity")
+
+    snapshot.block_number = None
+    with pytest.raises(Exception, match="not been collected"):
+        check_snapshot(snapshot, "open_interest")
+
+
+def test_check_snapshot_rejects_other_pnl_factor():
+    snapshot = get_snapshot(inputs=("gm_prices",))
+
+    check_snapshot(snapshot, "gm_prices", snapshot.pnl_factor_type)
+    with pytest.raises(Exception, match="pnl factor"):
+        check_snapshot(snapshot, "gm_prices", b"\x00" * 32)
+
+
+def test_passed_snapshot_is_never_replaced():
+    snapshot = get_snapshot(inputs=("open_interest",))
+
+    fetcher = GetData.__new__(GetData)
+    fetcher.config = CONFIG
+    fetcher.snapshot = snapshot
+    fetcher._snapshot_passed = True
+    assert fetcher._get_snapshot("open_interest") is snapshot
+    with pytest.raises(Exception, match="market_info"):
+        fetcher._get_snapshot("borrow_apr")
+
+    async_fetcher = AsyncGetData(CONFIG, snapshot)
+    with pytest.raises(Exception, match="market_info"):
+        asyncio.run(async_fetcher._get_snapshot("borrow_apr"))
+
+    with pytest.raises(Exception, match="pool_amounts"):
+        GetPoolTVL(CONFIG, snapshot).get_pool_balances()
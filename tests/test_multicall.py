@@ -0,0 +1,102 @@
+import logging
+
+import pytest
+
+from conftest import encode_value
+from gmx_python_sdk.scripts.v2.get import get_market_snapshot
+from gmx_python_sdk.scripts.v2.rpc import multicall
+from gmx_python_sdk.scripts.v2.rpc.call_cache import CallCache
+
+
+class FakeMulticall:
+    """
+    Multicall3 answering each call with its key times ten, reverting the
+    keys in reverted and rejecting batches larger than max_batch
+    """
+
+    def __init__(self, reverted=(), max_batch=None):
+        self.reverted = set(reverted)
+        self.max_batch = max_batch
+        self.batches = []
+
+        self.functions = self
+
+    def aggregate3(self, calls):
+        self._calls = calls
+        return self
+
+    def call(self):
+        calls = self._calls
+        if self.max_batch is not None and len(calls) > self.max_batch:
+            raise ValueError("batch too large")
+
+        self.batches.append(len(calls))
+        results = []
+        for _, _, call_data in calls:
+            key = int(call_data[-64:], 16)
+            if key in self.reverted:
+                results.append((False, b""))
+            else:
+                results.append((True, encode_value(key * 10)))
+
+        return results
+
+
+@pytest.fixture
+def fake_multicall(monkeypatch):
+    def install(**kwargs):
+        fake = FakeMulticall(**kwargs)
+        monkeypatch.setattr(
+            multicall, "get_multicall_contract", lambda web3_obj: fake
+        )
+        return fake
+
+    monkeypatch.setattr(multicall, "call_cache", CallCache())
+
+    return install
+
+
+def test_results_keep_call_order(contract, fake_multicall):
+    fake = fake_multicall()
+    calls = [contract.functions.value(key) for key in (5, 1, 4, 2, 3)]
+
+    assert multicall.execute_multicall(calls, batch_size=2) == [
+        50, 10, 40, 20, 30
+    ]
+    assert fake.batches == [2, 2, 1]
+
+
+def test_reverted_call_decodes_to_none(contract, fake_multicall):
+    fake_multicall(reverted={2})
+    calls = [contract.functions.value(key) for key in (1, 2, 3)]
+
+    assert multicall.execute_multicall(calls) == [10, None, 30]
+
+
+def test_rejected_batch_is_split(contract, fake_multicall):
+    fake = fake_multicall(max_batch=2)
+    calls = [contract.functions.value(key) for key in range(5)]
+
+    assert multicall.execute_multicall(calls) == [0, 10, 20, 30, 40]
+    assert sum(fake.batches) == 5
+    assert max(fake.batches) <= 2
+
+
+def test_repeated_calls_are_served_from_cache(contract, fake_multicall):
+    fake = fake_multicall()
+    calls = [contract.functions.value(key) for key in (1, 2)]
+
+    multicall.execute_multicall(calls, chain="arbitrum")
+    assert multicall.execute_multicall(calls, chain="arbitrum") == [10, 20]
+    assert fake.batches == [2]
+
+
+def test_reverted_market_is_logged(caplog):
+    market = {"market_symbol": "ETH"}
+
+    with caplog.at_level(logging.WARNING):
+        assert not get_market_snapshot._is_complete(
+            {"key": {"price": None}}, "key", "gm_prices", market
+        )
+
+    assert "Leaving ETH out of gm_prices" in caplog.text
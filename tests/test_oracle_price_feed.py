@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.get import oracle_price_feed
+from gmx_python_sdk.scripts.v2.get.get_oracle_prices import OraclePriceCache
+from gmx_python_sdk.scripts.v2.get.oracle_price_feed import OraclePriceFeed
+
+
+class FakeResponse:
+    def __init__(self, output: dict):
+        self.content = json.dumps(output).encode()
+        self._output = output
+        self.json_calls = 0
+
+    def json(self):
+        self.json_calls += 1
+        return self._output
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self):
+        self.response = None
+
+    def get(self, url):
+        return self.response
+
+    def close(self):
+        pass
+
+
+def get_output(min_price: int, max_price: int):
+    return {
+        "signedPrices": [
+            {
+                "tokenAddress": "0xETH",
+                "minPriceFull": str(min_price),
+                "maxPriceFull": str(max_price)
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    monkeypatch.setattr(
+        oracle_price_feed, "oracle_price_cache", OraclePriceCache()
+    )
+    feed = OraclePriceFeed("arbitrum")
+    feed._session = FakeSession()
+
+    return feed
+
+
+def test_unchanged_payload_is_not_republished(feed):
+    published = []
+    feed.subscribe(published.append)
+
+    feed._session.response = FakeResponse(get_output(10, 12))
+    table = feed.poll()
+    assert table.get_price("0xETH") == (10, 12)
+    assert table.get_median_price("0xETH") == 11
+
+    repeated = FakeResponse(get_output(10, 12))
+    feed._session.response = repeated
+    assert feed.poll() is table
+    assert repeated.json_calls == 0
+    assert published == [table]
+
+    feed._session.response = FakeResponse(get_output(11, 13))
+    changed = feed.poll()
+    assert changed.get_price("0xETH") == (11, 13)
+    assert published == [table, changed]
+
+
+def test_poll_primes_the_price_cache(feed):
+    feed._session.response = FakeResponse(get_output(10, 12))
+    feed.poll()
+
+    prices = oracle_price_feed.oracle_price_cache.peek("arbitrum")
+    assert prices["0xETH"]["minPriceFull"] == "10"
+
+
+def test_failing_subscriber_does_not_stop_others(feed):
+    published = []
+
+    def fail(table):
+        raise Exception("subscriber failed")
+
+    feed.subscribe(fail)
+    feed.subscribe(published.append)
+    feed._session.response = FakeResponse(get_output(10, 12))
+    feed.poll()
+
+    assert len(published) == 1
@@ -0,0 +1,69 @@
+from gmx_python_sdk.scripts.v2.get import get_oracle_prices
+from gmx_python_sdk.scripts.v2.get.get_oracle_prices import (
+    OraclePriceCache, OraclePrices
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+def test_prices_are_reused_until_max_age(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(get_oracle_prices, "time", clock)
+    cache = OraclePriceCache()
+    fetch = Fetcher()
+
+    assert cache.get("arbitrum", fetch, max_age=5) == {"calls": 1}
+    clock.now = 5.0
+    assert cache.get("arbitrum", fetch, max_age=5) == {"calls": 1}
+    assert cache.get("arbitrum", fetch, max_age=1) == {"calls": 2}
+
+    clock.now = 11.0
+    assert cache.peek("arbitrum", max_age=5) is None
+    assert cache.get("arbitrum", fetch, max_age=5) == {"calls": 3}
+    assert cache.get("arbitrum", fetch, force_refresh=True) == {"calls": 4}
+
+
+def test_chains_are_cached_separately():
+    cache = OraclePriceCache()
+    fetch = Fetcher()
+
+    cache.get("arbitrum", fetch)
+    cache.get("avalanche", fetch)
+    assert cache.peek("arbitrum") == {"calls": 1}
+    assert cache.peek("avalanche") == {"calls": 2}
+
+    cache.clear()
+    assert cache.peek("arbitrum") is None
+
+
+def test_oracle_prices_share_the_process_cache(monkeypatch):
+    monkeypatch.setattr(
+        get_oracle_prices, "oracle_price_cache", OraclePriceCache()
+    )
+    fetch = Fetcher()
+    monkeypatch.setattr(
+        OraclePrices, "_fetch_prices", lambda self: fetch()
+    )
+
+    first = OraclePrices("arbitrum").get_recent_prices()
+    second = OraclePrices("arbitrum").get_recent_prices()
+    assert first is second
+    assert fetch.calls == 1
+
+    OraclePrices("arbitrum").get_recent_prices(force_refresh=True)
+    assert fetch.calls == 2
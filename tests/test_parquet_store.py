@@ -0,0 +1,132 @@
+import os
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from gmx_python_sdk.scripts.v2.storage.parquet_store import (
+    ParquetStore, flatten_stats, get_market
+)
+
+pytest.importorskip("pyarrow")
+
+START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def test_flatten_stats():
+    assert flatten_stats(
+        {"long": {"ETH": 1.0}, "short": {"ETH": 2.0}, "parameter": "oi"}
+    ) == {"long.ETH": 1.0, "short.ETH": 2.0}
+
+
+def test_get_market_keeps_dotted_symbols():
+    assert get_market("long.ETH") == "ETH"
+    assert get_market("long.BTC.b") == "BTC.b"
+    assert get_market("BTC.b") == "BTC.b"
+    assert get_market("ETH") == "ETH"
+
+
+def test_read_filters_markets_and_time(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    for minute in range(3):
+        store.append(
+            "arbitrum",
+            "open_interest",
+            {
+                "long": {"ETH": float(minute), "BTC.b": 1.0},
+                "short": {"ETH": 2.0, "BTC.b": 3.0},
+                "parameter": "open_interest"
+            },
+            START + timedelta(minutes=minute)
+        )
+
+    frame = store.read(
+        "arbitrum",
+        "open_interest",
+        start=START + timedelta(minutes=1),
+        markets=["BTC.b"]
+    )
+    assert list(frame.columns) == ["timestamp", "long.BTC.b", "short.BTC.b"]
+    assert len(frame) == 2
+
+    store.compact("arbitrum", "open_interest", "2024-06-01")
+    assert len(store.read("arbitrum", "open_interest")) == 3
+
+
+def test_missing_and_numpy_values_keep_float_columns(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    for minute, value in enumerate([1.5, None, np.int64(3), np.float32(4)]):
+        store.append(
+            "arbitrum",
+            "gm_prices",
+            {"ETH": value, "parameter": "gm_prices"},
+            START + timedelta(minutes=minute)
+        )
+
+    frame = store.read("arbitrum", "gm_prices", markets=["ETH"])
+    assert frame["ETH"].tolist()[0] == 1.5
+    assert np.isnan(frame["ETH"].tolist()[1])
+    assert frame["ETH"].tolist()[2:] == [3.0, 4.0]
+
+
+def test_read_with_non_utc_range(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    utc_plus_3 = timezone(timedelta(hours=3))
+    for hour in (22, 23):
+        store.append(
+            "arbitrum",
+            "gm_prices",
+            {"ETH": float(hour), "parameter": "gm_prices"},
+            datetime(2024, 5, 31, hour, tzinfo=timezone.utc)
+        )
+
+    # 01:30 on June 1st in UTC+3 is 22:30 on May 31st in UTC
+    frame = store.read(
+        "arbitrum",
+        "gm_prices",
+        start=datetime(2024, 6, 1, 1, 30, tzinfo=utc_plus_3)
+    )
+    assert list(frame["ETH"]) == [23.0]
+
+
+def test_naive_timestamps_are_utc(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    store.append(
+        "arbitrum",
+        "gm_prices",
+        {"ETH": 1.0, "parameter": "gm_prices"},
+        datetime(2024, 5, 31, 23, 30)
+    )
+
+    assert store.dates("arbitrum", "gm_prices") == ["2024-05-31"]
+    frame = store.read(
+        "arbitrum", "gm_prices", end=datetime(2024, 5, 31, 23, 45)
+    )
+    assert len(frame) == 1
+
+
+def test_finished_days_are_compacted_on_rollover(tmp_path):
+    store = ParquetStore(str(tmp_path))
+    for minute in range(3):
+        store.append(
+            "arbitrum",
+            "gm_prices",
+            {"ETH": float(minute), "parameter": "gm_prices"},
+            START + timedelta(minutes=minute)
+        )
+    partition_path = store.partition_path(
+        "arbitrum", "gm_prices", "2024-06-01"
+    )
+    assert len(os.listdir(partition_path)) == 3
+
+    store.append(
+        "arbitrum",
+        "gm_prices",
+        {"ETH": 3.0, "parameter": "gm_prices"},
+        START + timedelta(days=1)
+    )
+    assert len(os.listdir(partition_path)) == 1
+    assert list(store.read("arbitrum", "gm_prices")["ETH"]) == [
+        0.0, 1.0, 2.0, 3.0
+    ]
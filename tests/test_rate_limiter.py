@@ -0,0 +1,138 @@
+import pytest
+
+from gmx_python_sdk.scripts.v2.rpc.rate_limiter import (
+    EndpointLimiter, RateLimited, check_http_status, check_rpc_response,
+    get_rate_limited_ids, is_rate_limit_error
+)
+
+
+def make_limiter(max_rate=10, burst=2, max_retries=3):
+    return EndpointLimiter(
+        max_rate=max_rate,
+        burst=burst,
+        max_retries=max_retries,
+        backoff=0.001,
+        max_backoff=0.002
+    )
+
+
+def test_burst_then_wait_for_refill():
+    limiter = make_limiter()
+
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_throttle_halves_rate_and_success_recovers_it():
+    limiter = make_limiter(max_rate=8)
+
+    limiter.on_throttle()
+    assert limiter.rate == 4
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 8
+
+
+def test_retry_after_blocks_requests():
+    limiter = make_limiter(burst=10)
+
+    limiter.on_throttle(retry_after=0.5)
+    assert limiter._reserve() == pytest.approx(0.5, abs=0.05)
+
+
+def test_call_retries_throttled_requests():
+    limiter = make_limiter(max_rate=1000, burst=10)
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited("throttled")
+        return "output"
+
+    assert limiter.call(send) == "output"
+    assert len(attempts) == 3
+    assert limiter.rate < 1000
+
+
+def test_call_gives_up_after_max_retries():
+    limiter = make_limiter(max_rate=1000, burst=10, max_retries=2)
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise ConnectionError("unreachable")
+
+    with pytest.raises(ConnectionError):
+        limiter.call(send, retry_errors=(ConnectionError,))
+    assert len(attempts) == 3
+
+
+def test_other_errors_are_not_retried():
+    limiter = make_limiter(max_rate=1000, burst=10)
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call(send)
+    assert len(attempts) == 1
+
+
+def test_backoff_delay_is_capped():
+    limiter = make_limiter()
+
+    for attempt in range(10):
+        assert 0 <= limiter.backoff_delay(attempt) <= limiter.max_backoff
+
+
+def test_check_http_status():
+    check_http_status(200)
+    with pytest.raises(RateLimited) as error:
+        check_http_status(429, {"Retry-After": "2"})
+    assert error.value.retry_after == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        {"code": 429, "message": "slow down"},
+        {"code": -32005, "message": "request limit reached"},
+        {"code": -32000, "message": "Rate limit exceeded"},
+        "Too Many Requests"
+    ]
+)
+def test_rate_limit_errors(error):
+    assert is_rate_limit_error(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        {"code": -32000, "message": "gas limit exceeded"},
+        {"code": -32000, "message": "daily quota of archive calls"},
+        {"code": 3, "message": "execution reverted: rate limit"},
+        "execution reverted: too many requests",
+        None
+    ]
+)
+def test_deterministic_errors_are_not_rate_limits(error):
+    assert not is_rate_limit_error(error)
+
+
+def test_batch_is_only_throttled_when_every_request_is():
+    throttled = {"id": 0, "error": {"code": 429, "message": "slow down"}}
+    answered = {"id": 1, "result": "0x"}
+
+    check_rpc_response([throttled, answered])
+    check_rpc_response([])
+    with pytest.raises(RateLimited):
+        check_rpc_response([throttled, dict(throttled, id=1)])
+    with pytest.raises(RateLimited):
+        check_rpc_response(throttled)
+
+    assert get_rate_limited_ids({0: throttled, 1: answered}) == [0]
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.storage import rollup
+from gmx_python_sdk.scripts.v2.storage.csv_store import CSVStore
+from gmx_python_sdk.scripts.v2.storage.rollup import (
+    Bucket, StatRollup, get_rollup_filename, get_stat_filenames
+)
+
+# A UTC midnight
+DAY = 1_700_006_400
+FILENAME = "arbitrum_gm_prices.csv"
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    stores = {}
+
+    def get_csv_store(filename):
+        if filename not in stores:
+            stores[filename] = CSVStore(
+                filename,
+                str(tmp_path),
+                max_segment_bytes=2000
+            )
+        return stores[filename]
+
+    monkeypatch.setattr(rollup, "get_csv_store", get_csv_store)
+
+    return get_csv_store
+
+
+def append_prices(store, start, seconds, step=10):
+    for timestamp in range(start, start + seconds, step):
+        store.append(
+            {
+                "ETH": (timestamp - start) // step,
+                "BTC": 2.0,
+                "block_number": timestamp,
+                "timestamp": str(datetime.fromtimestamp(timestamp))
+            }
+        )
+
+
+def test_filenames():
+    assert "arbitrum_long_open_interest_data.csv" in get_stat_filenames(
+        "arbitrum"
+    )
+    assert get_rollup_filename(FILENAME, "1h") == "arbitrum_gm_prices_1h.csv"
+
+
+def test_bucket_aggregates():
+    bucket = Bucket(DAY)
+    for value in (3, 5, 1, 4, "", "0xaddress"):
+        bucket.add({"ETH": value, "block_number": 1})
+
+    row = bucket.to_row()
+    assert row["timestamp"] == "2023-11-15 00:00:00+00:00"
+    assert row["count"] == 6
+    assert [row["ETH." + name] for name in rollup.AGGREGATES] == [
+        3, 5, 1, 4, 3.25
+    ]
+    assert "block_number.open" not in row
+
+
+def test_run_rolls_up_closed_buckets(stores):
+    append_prices(stores(FILENAME), DAY, 2 * 3600)
+    stat_rollup = StatRollup(FILENAME, ["1m", "1h"])
+
+    # The last minute and hour are still open
+    assert stat_rollup.run(now=DAY + 2 * 3600 - 1) == {"1m": 119, "1h": 1}
+
+    hours = stores("arbitrum_gm_prices_1h.csv").read()
+    assert hours["count"].tolist() == [360]
+    assert hours["ETH.open"].tolist() == [0]
+    assert hours["ETH.close"].tolist() == [359]
+    assert hours["ETH.mean"].tolist() == [179.5]
+    assert hours["BTC.high"].tolist() == [2.0]
+
+
+def test_run_resumes_after_last_bucket(stores):
+    store = stores(FILENAME)
+    append_prices(store, DAY, 3600)
+    stat_rollup = StatRollup(FILENAME, ["1h"])
+    assert stat_rollup.run(now=DAY + 3600) == {"1h": 1}
+    assert stat_rollup.run(now=DAY + 3600) == {"1h": 0}
+
+    append_prices(store, DAY + 3600, 3600)
+    assert stat_rollup.run(now=DAY + 7200) == {"1h": 1}
+
+    hours = stores("arbitrum_gm_prices_1h.csv").read()
+    assert hours["count"].tolist() == [360, 360]
+
+
+def test_prune_keeps_active_and_unrolled_segments(stores):
+    store = stores(FILENAME)
+    append_prices(store, DAY, 3 * 3600)
+    segments = store.segments()
+    assert len(segments) > 2
+
+    stat_rollup = StatRollup(FILENAME, ["1h"])
+    # Nothing rolled up yet
+    assert stat_rollup.prune(0, now=DAY + 10 ** 6) == []
+
+    stat_rollup.run(now=DAY + 3 * 3600)
+    deleted = stat_rollup.prune(3600, now=DAY + 3 * 3600)
+
+    assert deleted
+    assert segments[-1] not in deleted
+    remaining = store.read()
+    # Every row within the retention window is kept
+    assert remaining["block_number"].min() <= DAY + 2 * 3600
+    assert stores("arbitrum_gm_prices_1h.csv").read()["count"].sum() == 1080
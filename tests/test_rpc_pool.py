@@ -0,0 +1,180 @@
+import time
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.rpc.rate_limiter import RateLimited
+from gmx_python_sdk.scripts.v2.rpc.rpc_pool import (
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, EndpointHealth,
+    RPCPool, get_rpc_urls
+)
+
+
+def eject(pool, url):
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        pool.record_failure(url)
+
+
+def make_due_for_probe(pool, url):
+    pool.health[url].open_until = time.monotonic() - 1
+
+
+def test_get_rpc_urls():
+    assert get_rpc_urls("a") == ("a",)
+    assert get_rpc_urls(["a", "b"]) == ("a", "b")
+
+
+def test_pool_needs_urls():
+    with pytest.raises(Exception):
+        RPCPool(())
+
+
+def test_select_prefers_lowest_latency():
+    pool = RPCPool(("a", "b"))
+    pool.record_success("a", 0.5)
+    pool.record_success("b", 0.1)
+
+    assert pool.select() == "b"
+    assert pool.select(exclude=("b",)) == "a"
+    assert pool.select(exclude=("a", "b")) is None
+
+
+def test_errors_penalise_score():
+    pool = RPCPool(("a", "b"))
+    pool.record_success("a", 0.1)
+    pool.record_success("b", 0.15)
+    pool.record_failure("a")
+
+    assert pool.select() == "b"
+
+
+def test_call_fails_over_to_next_endpoint():
+    pool = RPCPool(("pool-failover-a", "pool-failover-b"))
+
+    def send(url):
+        if url == "pool-failover-a":
+            raise ConnectionError("unreachable")
+        return url
+
+    assert pool.call(send, (ConnectionError,)) == "pool-failover-b"
+    assert pool.health["pool-failover-a"].consecutive_failures == 1
+    assert pool.health["pool-failover-a"].error_rate > 0
+
+
+def test_throttled_endpoint_fails_over():
+    pool = RPCPool(("pool-throttle-a", "pool-throttle-b"))
+
+    def send(url):
+        if url == "pool-throttle-a":
+            raise RateLimited("throttled")
+        return url
+
+    assert pool.call(send) == "pool-throttle-b"
+
+
+def test_other_errors_do_not_fail_over():
+    pool = RPCPool(("pool-error-a", "pool-error-b"))
+    sent = []
+
+    def send(url):
+        sent.append(url)
+        raise ValueError("execution reverted")
+
+    with pytest.raises(ValueError):
+        pool.call(send, (ConnectionError,))
+    assert sent == ["pool-error-a"]
+    assert not pool.health["pool-error-a"].consecutive_failures
+
+
+def test_consecutive_failures_eject_endpoint():
+    pool = RPCPool(("a", "b"))
+    eject(pool, "a")
+
+    assert pool.health["a"].is_open
+    assert pool.stats()["a"]["ejected"]
+    assert pool.select() == "b"
+
+
+def test_every_endpoint_ejected_selects_soonest_probe():
+    pool = RPCPool(("a", "b"))
+    eject(pool, "a")
+    eject(pool, "b")
+    pool.health["a"].open_until += 10
+
+    assert pool.select() == "b"
+
+
+def test_probe_is_let_through_once():
+    pool = RPCPool(("a", "b"))
+    pool.record_success("b", 1.0)
+    eject(pool, "a")
+    make_due_for_probe(pool, "a")
+
+    assert pool.select() == "a"
+    assert pool.health["a"].probing
+    # Only one probe at a time
+    assert pool.select() == "b"
+
+
+def test_successful_probe_closes_circuit():
+    pool = RPCPool(("a", "b"))
+    eject(pool, "a")
+    make_due_for_probe(pool, "a")
+
+    assert pool.select() == "a"
+    pool.record_success("a", 0.1)
+
+    health = pool.health["a"]
+    assert not health.is_open
+    assert not health.probing
+    assert health.reset_timeout == CIRCUIT_RESET_TIMEOUT
+
+
+def test_failed_probe_doubles_reset_timeout():
+    pool = RPCPool(("a", "b"))
+    eject(pool, "a")
+    make_due_for_probe(pool, "a")
+
+    assert pool.select() == "a"
+    pool.record_failure("a")
+
+    health = pool.health["a"]
+    assert health.is_open
+    assert not health.probing
+    assert health.reset_timeout == 2 * CIRCUIT_RESET_TIMEOUT
+    assert not health.is_available(time.monotonic())
+
+
+def test_latency_percentile_needs_samples():
+    health = EndpointHealth("a")
+    for latency in range(5):
+        health.record_success(latency)
+    assert health.latency_percentile(95) is None
+
+    for latency in range(5, 100):
+        health.record_success(latency)
+    assert health.latency_percentile(50) == 49
+
+
+def test_fast_hedged_read_does_not_leave_probe_pending():
+    pool = RPCPool(("a", "b"))
+    eject(pool, "b")
+    make_due_for_probe(pool, "b")
+
+    assert pool.call_hedged(lambda url: url) == "a"
+
+    health = pool.health["b"]
+    assert not health.probing
+    assert health.is_available(time.monotonic() + 1e6)
+    assert pool.hedge_stats()["fired"] == 0
+
+
+def test_slow_hedged_read_is_answered_by_hedge():
+    pool = RPCPool(("a", "b"))
+
+    def send(url):
+        if url == "a":
+            time.sleep(1)
+        return url
+
+    assert pool.call_hedged(send) == "b"
+    assert pool.hedge_stats() == {"fired": 1, "won": 1}
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gmx_python_sdk.scripts.v2.rpc.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    single_flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "output"
+
+    outputs = []
+    threads = [
+        threading.Thread(
+            target=lambda: outputs.append(single_flight.do("key", call))
+        )
+        for _ in range(4)
+    ]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outputs == ["output"] * 4
+    assert len(calls) == 1
+    assert single_flight.stats() == {"calls": 4, "saved": 3, "in_flight": 0}
+
+
+def test_exception_is_shared_and_not_kept():
+    single_flight = SingleFlight()
+
+    def call():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", call)
+
+    assert single_flight.do("key", lambda: 1) == 1
+
+
+def test_async_calls_share_one_call():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "output"
+
+    async def main():
+        return await asyncio.gather(
+            *[single_flight.do_async("key", call) for _ in range(4)]
+        )
+
+    assert asyncio.run(main()) == ["output"] * 4
+    assert len(calls) == 1
+    assert single_flight.stats()["in_flight"] == 0
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    single_flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.1)
+        return "output"
+
+    async def main():
+        leader = asyncio.ensure_future(single_flight.do_async("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(
+            single_flight.do_async("key", call)
+        )
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        return await follower
+
+    assert asyncio.run(main()) == "output"
+    assert single_flight.stats()["saved"] == 1
+
+
+def test_timed_out_leader_does_not_fail_followers():
+    single_flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.1)
+        return "output"
+
+    async def main():
+        leader = asyncio.wait_for(
+            single_flight.do_async("key", call),
+            timeout=0.02
+        )
+        follower = single_flight.do_async("key", call)
+        return await asyncio.gather(
+            leader, follower, return_exceptions=True
+        )
+
+    leader_result, follower_result = asyncio.run(main())
+    assert isinstance(leader_result, asyncio.TimeoutError)
+    assert follower_result == "output"
@@ -0,0 +1,55 @@
+from gmx_python_sdk.scripts.v2.storage.sqlite_store import (
+    SQLiteStore, get_stat_rows
+)
+
+
+def test_get_stat_rows():
+    assert get_stat_rows(
+        {
+            "long": {"ETH": 1.0},
+            "short": {"ETH": 2 ** 70},
+            "BTC": 3,
+            "parameter": "open_interest",
+            "block_number": 10
+        }
+    ) == [("ETH", "long", 1.0), ("ETH", "short", float(2 ** 70)),
+          ("BTC", "", 3)]
+
+
+def test_append_and_query(tmp_path):
+    store = SQLiteStore(str(tmp_path / "stats.db"))
+    for second in range(5):
+        store.append(
+            "arbitrum",
+            "open_interest",
+            {
+                "long": {"ETH": float(second), "BTC": 1.0},
+                "short": {"ETH": 2.0, "BTC": 3.0},
+                "parameter": "open_interest",
+                "block_number": second
+            },
+            float(second)
+        )
+
+    rows = store.query(
+        "arbitrum",
+        "open_interest",
+        markets=["ETH"],
+        start=1,
+        end=4,
+        side="long"
+    )
+    assert rows == [
+        (float(second), "ETH", "long", float(second), second)
+        for second in (1, 2, 3)
+    ]
+
+    frame = store.read("arbitrum", "open_interest")
+    assert len(frame) == 20
+    assert store.query("avalanche", "open_interest") == []
+
+    journal_mode = store.get_connection().execute(
+        "PRAGMA journal_mode"
+    ).fetchone()[0]
+    assert journal_mode == "wal"
+    store.close()
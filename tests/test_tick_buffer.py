@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from gmx_python_sdk.scripts.v2.storage.tick_buffer import (
+    OracleTickBuffer, get_price_array, join_price, split_price
+)
+
+ETH = "0xeth"
+BTC = "0xbtc"
+
+
+def test_split_and_join_price():
+    price = 3 * 10 ** 33 + 7
+    assert join_price(*split_price(price)) == price
+
+
+def test_record_and_read(tmp_path):
+    ticks = OracleTickBuffer(str(tmp_path / "ticks.bin"), capacity=16)
+    ticks.record({ETH: (10 ** 33, 2 * 10 ** 33), BTC: (5, 6)}, 100.0)
+    ticks.record(
+        {ETH: {"minPriceFull": "3", "maxPriceFull": "4"}},
+        101.0
+    )
+
+    assert ticks.write_index == 3
+    assert ticks.tokens == [ETH, BTC]
+
+    eth = ticks.read(token_address=ETH)
+    assert eth["timestamp"].tolist() == [100.0, 101.0]
+    assert join_price(eth["max_price_hi"][0], eth["max_price_lo"][0]) == (
+        2 * 10 ** 33
+    )
+    assert get_price_array(eth, "min")[1] == 3.0
+
+    assert len(ticks.read(start=101.0)) == 1
+    assert len(ticks.read(end=101.0)) == 2
+    assert len(ticks.read(token_address="0xunknown")) == 0
+
+
+def test_oldest_ticks_are_overwritten(tmp_path):
+    ticks = OracleTickBuffer(str(tmp_path / "ticks.bin"), capacity=4)
+    for second in range(6):
+        ticks.record({ETH: (second, second)}, float(second))
+
+    views = ticks.views()
+    assert len(views) == 2
+    assert np.concatenate(views)["timestamp"].tolist() == [2, 3, 4, 5]
+    assert ticks.read()["timestamp"].tolist() == [2, 3, 4, 5]
+
+
+def test_retention_window(tmp_path):
+    ticks = OracleTickBuffer(
+        str(tmp_path / "ticks.bin"),
+        capacity=16,
+        retention=2
+    )
+    for second in range(6):
+        ticks.record({ETH: (second, second)}, float(second))
+
+    assert ticks.read()["timestamp"].tolist() == [3, 4, 5]
+
+    ticks.set_retention(None)
+    assert len(ticks.read()) == 6
+
+
+def test_readonly_reader_sees_writes(tmp_path):
+    filepath = str(tmp_path / "ticks.bin")
+    writer = OracleTickBuffer(filepath, capacity=16)
+    reader = OracleTickBuffer(filepath, readonly=True)
+
+    writer.record({ETH: (1, 2)}, 1.0)
+    writer.record({BTC: (3, 4)}, 2.0)
+
+    assert reader.capacity == 16
+    assert reader.tokens == [ETH, BTC]
+    assert len(reader.read(token_address=BTC)) == 1
+
+
+def test_readonly_reader_needs_buffer(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        OracleTickBuffer(str(tmp_path / "missing.bin"), readonly=True)
+
+
+def test_rejects_other_files(tmp_path):
+    filepath = tmp_path / "other.bin"
+    filepath.write_bytes(b"\0" * 256)
+
+    with pytest.raises(Exception):
+        OracleTickBuffer(str(filepath))
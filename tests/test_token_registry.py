@@ -0,0 +1,106 @@
+import json
+
+import pytest
+import requests
+
+from gmx_python_sdk.scripts.v2 import token_registry
+from gmx_python_sdk.scripts.v2.token_registry import TokenRegistry
+
+TOKENS = [
+    {"address": "0xWETH", "symbol": "ETH", "decimals": 18},
+    {"address": "0xUSDC", "symbol": "USDC", "decimals": 6},
+    {"address": "0xUSDCe", "symbol": "USDC", "decimals": 6}
+]
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, tokens=None, etag=None):
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+        self._tokens = tokens
+
+    def json(self):
+        return {"tokens": self._tokens}
+
+
+class FakeApi:
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, headers=None):
+        self.requests.append(headers)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def api(monkeypatch):
+    def install(*responses):
+        api = FakeApi(responses)
+        monkeypatch.setattr(token_registry.requests, "get", api)
+        return api
+
+    return install
+
+
+def test_tokens_are_indexed(tmp_path, api):
+    api(FakeResponse(200, TOKENS, '"v1"'))
+    registry = TokenRegistry("arbitrum", cache_dir=str(tmp_path))
+
+    assert registry.get_address_by_symbol("USDC") == "0xUSDC"
+    assert registry.get_decimals("0xWETH") == 18
+    with pytest.raises(Exception, match="not a known token"):
+        registry.get_address_by_symbol("BTC")
+
+
+def test_not_modified_keeps_the_cached_list(tmp_path, api):
+    fake_api = api(
+        FakeResponse(200, TOKENS, '"v1"'),
+        FakeResponse(304)
+    )
+    TokenRegistry("arbitrum", cache_dir=str(tmp_path)).get_tokens()
+
+    registry = TokenRegistry("arbitrum", ttl=0, cache_dir=str(tmp_path))
+    assert registry.get_decimals("0xUSDC") == 6
+    assert fake_api.requests[1] == {"If-None-Match": '"v1"'}
+    assert fake_api.responses == []
+
+
+def test_offline_falls_back_to_the_cache_file(tmp_path, api):
+    api(
+        FakeResponse(200, TOKENS, '"v1"'),
+        requests.ConnectionError("offline"),
+        FakeResponse(500)
+    )
+    TokenRegistry("arbitrum", cache_dir=str(tmp_path)).get_tokens()
+
+    registry = TokenRegistry("arbitrum", ttl=0, cache_dir=str(tmp_path))
+    assert registry.get_address_by_symbol("ETH") == "0xWETH"
+    assert registry.get_address_by_symbol("ETH") == "0xWETH"
+
+
+def test_offline_without_cache_raises(tmp_path, api):
+    api(requests.ConnectionError("offline"))
+
+    with pytest.raises(requests.ConnectionError):
+        TokenRegistry("arbitrum", cache_dir=str(tmp_path)).get_tokens()
+
+
+@pytest.mark.parametrize(
+    "cached",
+    [
+        {"tokens": {}},
+        {"etag": None, "fetched_at": 0, "tokens": []},
+        {"etag": None, "fetched_at": 0, "tokens": {"0xWETH": {}}},
+        []
+    ]
+)
+def test_malformed_cache_file_is_ignored(tmp_path, api, cached):
+    (tmp_path / "arbitrum_tokens_cache.json").write_text(json.dumps(cached))
+    api(FakeResponse(200, TOKENS, '"v1"'))
+
+    registry = TokenRegistry("arbitrum", cache_dir=str(tmp_path))
+    assert registry.get_decimals("0xWETH") == 18